@@ -0,0 +1,65 @@
+"""Add import_jobs table for background training-data imports
+
+Revision ID: 003_import_jobs
+Revises: 002_triggers
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '003_import_jobs'
+down_revision = '002_triggers'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('import_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('bot_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=True, server_default='pending'),
+    sa.Column('progress', sa.Integer(), nullable=True, server_default='0'),
+    sa.Column('filename', sa.String(length=255), nullable=True),
+    sa.Column('file_path', sa.String(length=500), nullable=True),
+    sa.Column('file_size', sa.BigInteger(), nullable=True),
+    sa.Column('options', postgresql.JSON(astext_type=sa.Text()), nullable=True),
+    sa.Column('rows_parsed', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('rows_classified', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('rows_inserted', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('error_count', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('errors', postgresql.JSON(astext_type=sa.Text()), nullable=True),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['bot_id'], ['bots.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_import_jobs_id'), 'import_jobs', ['id'], unique=False)
+    op.create_index('ix_import_jobs_bot_id_created_at', 'import_jobs', ['bot_id', 'created_at'], unique=False)
+
+    # Same updated_at behaviour as training_jobs
+    op.execute("""
+        CREATE TRIGGER import_jobs_updated_at_trigger
+        BEFORE UPDATE ON import_jobs
+        FOR EACH ROW
+        EXECUTE FUNCTION update_training_jobs_updated_at();
+    """)
+
+    op.execute("COMMENT ON TABLE import_jobs IS 'Background imports of training data files with progress'")
+    op.execute("COMMENT ON COLUMN import_jobs.status IS 'Job status: pending, running, completed, failed, cancelled'")
+    op.execute("COMMENT ON COLUMN import_jobs.progress IS 'Share of the file read so far (0-100)'")
+    op.execute("COMMENT ON COLUMN import_jobs.file_path IS 'Uploaded file spooled to disk until the job finishes'")
+    op.execute("COMMENT ON COLUMN import_jobs.errors IS 'First per-line parse errors (JSONL)'")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS import_jobs_updated_at_trigger ON import_jobs")
+    op.drop_index('ix_import_jobs_bot_id_created_at', table_name='import_jobs')
+    op.drop_index(op.f('ix_import_jobs_id'), table_name='import_jobs')
+    op.drop_table('import_jobs')
@@ -0,0 +1,43 @@
+"""Add intent_rules table for per-bot rule-based intent classification
+
+Revision ID: 004_intent_rules
+Revises: 003_import_jobs
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '004_intent_rules'
+down_revision = '003_import_jobs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('intent_rules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('bot_id', sa.Integer(), nullable=False),
+    sa.Column('pattern', sa.Text(), nullable=False),
+    sa.Column('intent', sa.String(length=100), nullable=False),
+    sa.Column('priority', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('is_active', sa.Boolean(), nullable=False, server_default=sa.text('true')),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['bot_id'], ['bots.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_intent_rules_id'), 'intent_rules', ['id'], unique=False)
+    op.create_index('ix_intent_rules_bot_id_priority', 'intent_rules', ['bot_id', 'priority', 'id'], unique=False)
+
+    op.execute("COMMENT ON TABLE intent_rules IS 'Per-bot regex rules checked before the built-in intent rules'")
+    op.execute("COMMENT ON COLUMN intent_rules.pattern IS 'Case-insensitive regular expression (or a|b|c keyword list)'")
+    op.execute("COMMENT ON COLUMN intent_rules.priority IS 'Lower values are checked first; ties by id'")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_intent_rules_bot_id_priority', table_name='intent_rules')
+    op.drop_index(op.f('ix_intent_rules_id'), table_name='intent_rules')
+    op.drop_table('intent_rules')
@@ -0,0 +1,74 @@
+"""Add normalized text hash to training_data and make examples unique per bot and intent
+
+Revision ID: 005_training_data_dedup
+Revises: 004_intent_rules
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '005_training_data_dedup'
+down_revision = '004_intent_rules'
+branch_labels = None
+depends_on = None
+
+TEXT_HASH_SQL = (
+    "md5("
+    "btrim(regexp_replace(lower(normalize(user_message, NFC)), '\\s+', ' ', 'g'))"
+    " || chr(31) || "
+    "btrim(regexp_replace(lower(normalize(bot_response, NFC)), '\\s+', ' ', 'g'))"
+    ")"
+)
+
+# Ids scanned per backfill batch (one transaction each)
+DEDUP_BATCH_SIZE = 10000
+
+
+def upgrade() -> None:
+    op.add_column('training_data', sa.Column(
+        'text_hash', sa.String(length=32), sa.Computed(TEXT_HASH_SQL, persisted=True), nullable=True
+    ))
+    op.add_column('import_jobs', sa.Column('rows_skipped', sa.Integer(), nullable=False, server_default='0'))
+
+    # One-off backfill outside the migration transaction: duplicates (rows with an
+    # older row of the same bot, intent and text) are deleted by id range, each
+    # batch committed on its own, then the unique index is built without
+    # blocking writes. The helper index serves the duplicate lookups.
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        connection.execute(sa.text("""
+            CREATE INDEX CONCURRENTLY ix_training_data_dedup_backfill
+            ON training_data (bot_id, (COALESCE(intent, '')), text_hash, id)
+        """))
+
+        batch_start = connection.execute(sa.text("SELECT COALESCE(min(id), 0) FROM training_data")).scalar()
+        while batch_start <= connection.execute(sa.text("SELECT COALESCE(max(id), 0) FROM training_data")).scalar():
+            connection.execute(sa.text("""
+                DELETE FROM training_data t
+                WHERE t.id >= :batch_start AND t.id < :batch_end
+                  AND EXISTS (
+                      SELECT 1 FROM training_data o
+                      WHERE o.bot_id = t.bot_id
+                        AND COALESCE(o.intent, '') = COALESCE(t.intent, '')
+                        AND o.text_hash = t.text_hash
+                        AND o.id < t.id
+                  )
+            """), {"batch_start": batch_start, "batch_end": batch_start + DEDUP_BATCH_SIZE})
+            batch_start += DEDUP_BATCH_SIZE
+
+        connection.execute(sa.text("""
+            CREATE UNIQUE INDEX CONCURRENTLY ux_training_data_bot_intent_text_hash
+            ON training_data (bot_id, (COALESCE(intent, '')), text_hash)
+        """))
+        connection.execute(sa.text("DROP INDEX CONCURRENTLY ix_training_data_dedup_backfill"))
+
+    op.execute("COMMENT ON COLUMN training_data.text_hash IS 'md5 of the NFC, lowercased, whitespace-collapsed user_message and bot_response'")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ux_training_data_bot_intent_text_hash")
+    op.drop_column('import_jobs', 'rows_skipped')
+    op.drop_column('training_data', 'text_hash')
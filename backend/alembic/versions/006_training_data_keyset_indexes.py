@@ -0,0 +1,28 @@
+"""Add composite indexes for keyset pagination of training_data
+
+Revision ID: 006_training_data_keyset_indexes
+Revises: 005_training_data_dedup
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '006_training_data_keyset_indexes'
+down_revision = '005_training_data_dedup'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Serve ORDER BY <column>, id LIMIT n for one bot, scanned forward (asc) or backward (desc).
+    # user_message / bot_response are not indexed: long texts can exceed the btree row size limit.
+    op.create_index('ix_training_data_bot_id_created_at_id', 'training_data', ['bot_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_training_data_bot_id_intent_id', 'training_data', ['bot_id', 'intent', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_training_data_bot_id_intent_id', table_name='training_data')
+    op.drop_index('ix_training_data_bot_id_created_at_id', table_name='training_data')
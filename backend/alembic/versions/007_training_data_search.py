@@ -0,0 +1,59 @@
+"""Add accent-insensitive trigram search columns and indexes to training_data
+
+Revision ID: 007_training_data_search
+Revises: 006_training_data_keyset_indexes
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '007_training_data_search'
+down_revision = '006_training_data_keyset_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+
+    # unaccent() is only STABLE (it depends on search_path); with the dictionary
+    # pinned it is safe to declare IMMUTABLE, as generated columns require
+    op.execute("""
+        CREATE OR REPLACE FUNCTION f_unaccent(text)
+        RETURNS text AS $$
+            SELECT public.unaccent('public.unaccent'::regdictionary, $1)
+        $$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT;
+    """)
+
+    op.add_column('training_data', sa.Column(
+        'user_message_search', sa.Text(),
+        sa.Computed('lower(f_unaccent(user_message))', persisted=True), nullable=True
+    ))
+    op.add_column('training_data', sa.Column(
+        'bot_response_search', sa.Text(),
+        sa.Computed('lower(f_unaccent(bot_response))', persisted=True), nullable=True
+    ))
+
+    op.execute("""
+        CREATE INDEX ix_training_data_user_message_search_trgm
+        ON training_data USING gin (user_message_search gin_trgm_ops)
+    """)
+    op.execute("""
+        CREATE INDEX ix_training_data_bot_response_search_trgm
+        ON training_data USING gin (bot_response_search gin_trgm_ops)
+    """)
+
+    op.execute("COMMENT ON COLUMN training_data.user_message_search IS 'Lowercased user_message without diacritics (trigram search)'")
+    op.execute("COMMENT ON COLUMN training_data.bot_response_search IS 'Lowercased bot_response without diacritics (trigram search)'")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_training_data_bot_response_search_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_training_data_user_message_search_trgm")
+    op.drop_column('training_data', 'bot_response_search')
+    op.drop_column('training_data', 'user_message_search')
+    op.execute("DROP FUNCTION IF EXISTS f_unaccent(text)")
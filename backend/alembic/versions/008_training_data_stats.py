@@ -0,0 +1,172 @@
+"""Add per-bot training data statistics maintained by triggers
+
+Revision ID: 008_training_data_stats
+Revises: 007_training_data_search
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '008_training_data_stats'
+down_revision = '007_training_data_search'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'bot_dataset_stats',
+        sa.Column('bot_id', sa.Integer(), nullable=False),
+        sa.Column('example_count', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('intent_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['bot_id'], ['bots.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('bot_id')
+    )
+
+    # Examples without an intent are counted under ''
+    op.create_table(
+        'bot_intent_counts',
+        sa.Column('bot_id', sa.Integer(), nullable=False),
+        sa.Column('intent', sa.String(length=100), nullable=False),
+        sa.Column('example_count', sa.BigInteger(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['bot_id'], ['bots.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('bot_id', 'intent')
+    )
+
+    # Apply a per (bot, intent) delta, then refresh the totals of the touched bots
+    # from their intent counts. Bots deleted in the same statement (cascade) are skipped.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION apply_training_data_stats(bot_ids INTEGER[], intents TEXT[], deltas BIGINT[])
+        RETURNS VOID AS $$
+        BEGIN
+            INSERT INTO bot_intent_counts (bot_id, intent, example_count)
+            SELECT d.bot_id, d.intent, d.delta
+            FROM unnest(bot_ids, intents, deltas) AS d(bot_id, intent, delta)
+            JOIN bots b ON b.id = d.bot_id
+            ORDER BY d.bot_id, d.intent
+            ON CONFLICT (bot_id, intent)
+            DO UPDATE SET example_count = bot_intent_counts.example_count + EXCLUDED.example_count;
+
+            DELETE FROM bot_intent_counts c
+            USING unnest(bot_ids, intents) AS d(bot_id, intent)
+            WHERE c.bot_id = d.bot_id AND c.intent = d.intent AND c.example_count <= 0;
+
+            INSERT INTO bot_dataset_stats (bot_id, example_count, intent_count, updated_at)
+            SELECT b.id,
+                   COALESCE(sum(c.example_count), 0),
+                   count(*) FILTER (WHERE c.intent <> ''),
+                   now()
+            FROM bots b
+            LEFT JOIN bot_intent_counts c ON c.bot_id = b.id
+            WHERE b.id = ANY(bot_ids)
+            GROUP BY b.id
+            ORDER BY b.id
+            ON CONFLICT (bot_id)
+            DO UPDATE SET example_count = EXCLUDED.example_count,
+                          intent_count = EXCLUDED.intent_count,
+                          updated_at = EXCLUDED.updated_at;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    # Statement-level: one delta per statement, however many rows it touched
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_training_data_stats()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            bot_ids INTEGER[];
+            intents TEXT[];
+            deltas BIGINT[];
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                SELECT array_agg(bot_id), array_agg(intent), array_agg(delta)
+                INTO bot_ids, intents, deltas
+                FROM (
+                    SELECT bot_id, COALESCE(intent, '') AS intent, count(*) AS delta
+                    FROM new_rows GROUP BY 1, 2
+                ) d;
+            ELSIF TG_OP = 'DELETE' THEN
+                SELECT array_agg(bot_id), array_agg(intent), array_agg(delta)
+                INTO bot_ids, intents, deltas
+                FROM (
+                    SELECT bot_id, COALESCE(intent, '') AS intent, -count(*) AS delta
+                    FROM old_rows GROUP BY 1, 2
+                ) d;
+            ELSE
+                SELECT array_agg(bot_id), array_agg(intent), array_agg(delta)
+                INTO bot_ids, intents, deltas
+                FROM (
+                    SELECT bot_id, intent, sum(delta) AS delta
+                    FROM (
+                        SELECT bot_id, COALESCE(intent, '') AS intent, 1 AS delta FROM new_rows
+                        UNION ALL
+                        SELECT bot_id, COALESCE(intent, '') AS intent, -1 AS delta FROM old_rows
+                    ) changes
+                    GROUP BY 1, 2
+                    HAVING sum(delta) <> 0
+                ) d;
+            END IF;
+
+            IF bot_ids IS NOT NULL THEN
+                PERFORM apply_training_data_stats(bot_ids, intents, deltas);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    # Transition tables need one trigger per event
+    op.execute("""
+        CREATE TRIGGER training_data_stats_insert
+        AFTER INSERT ON training_data
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION update_training_data_stats();
+    """)
+    op.execute("""
+        CREATE TRIGGER training_data_stats_update
+        AFTER UPDATE ON training_data
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION update_training_data_stats();
+    """)
+    op.execute("""
+        CREATE TRIGGER training_data_stats_delete
+        AFTER DELETE ON training_data
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION update_training_data_stats();
+    """)
+
+    # Backfill from existing data
+    op.execute("""
+        INSERT INTO bot_intent_counts (bot_id, intent, example_count)
+        SELECT bot_id, COALESCE(intent, ''), count(*)
+        FROM training_data
+        GROUP BY 1, 2
+    """)
+    op.execute("""
+        INSERT INTO bot_dataset_stats (bot_id, example_count, intent_count)
+        SELECT b.id, COALESCE(sum(c.example_count), 0), count(*) FILTER (WHERE c.intent <> '')
+        FROM bots b
+        LEFT JOIN bot_intent_counts c ON c.bot_id = b.id
+        GROUP BY b.id
+    """)
+
+    op.execute("COMMENT ON TABLE bot_dataset_stats IS 'Training data totals per bot (auto-updated by trigger)'")
+    op.execute("COMMENT ON TABLE bot_intent_counts IS 'Training examples per bot and intent, empty intent for unlabeled (auto-updated by trigger)'")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS training_data_stats_delete ON training_data")
+    op.execute("DROP TRIGGER IF EXISTS training_data_stats_update ON training_data")
+    op.execute("DROP TRIGGER IF EXISTS training_data_stats_insert ON training_data")
+    op.execute("DROP FUNCTION IF EXISTS update_training_data_stats()")
+    op.execute("DROP FUNCTION IF EXISTS apply_training_data_stats(INTEGER[], TEXT[], BIGINT[])")
+
+    op.drop_table('bot_intent_counts')
+    op.drop_table('bot_dataset_stats')
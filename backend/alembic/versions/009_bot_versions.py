@@ -0,0 +1,146 @@
+"""Add per-bot version counters bumped by triggers (ETags)
+
+Revision ID: 009_bot_versions
+Revises: 008_training_data_stats
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '009_bot_versions'
+down_revision = '008_training_data_stats'
+branch_labels = None
+depends_on = None
+
+# (table, version kind, SQL mapping its transition table rows to bot ids)
+VERSIONED_TABLES = [
+    ('training_data', 'data', 'SELECT bot_id FROM {rows}'),
+    ('conversations', 'conversations', 'SELECT bot_id FROM {rows}'),
+    ('training_jobs', 'jobs', 'SELECT bot_id FROM {rows}'),
+    ('import_jobs', 'jobs', 'SELECT bot_id FROM {rows}'),
+    ('training_logs', 'jobs',
+     'SELECT j.bot_id FROM {rows} r JOIN training_jobs j ON j.id = r.training_job_id'),
+]
+
+
+def _trigger_function(table: str, kind: str, bot_ids_sql: str) -> str:
+    return f"""
+        CREATE OR REPLACE FUNCTION bump_{table}_version()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                PERFORM bump_bot_versions(ARRAY({bot_ids_sql.format(rows='new_rows')}), '{kind}');
+            ELSIF TG_OP = 'DELETE' THEN
+                PERFORM bump_bot_versions(ARRAY({bot_ids_sql.format(rows='old_rows')}), '{kind}');
+            ELSE
+                PERFORM bump_bot_versions(ARRAY(
+                    {bot_ids_sql.format(rows='new_rows')}
+                    UNION
+                    {bot_ids_sql.format(rows='old_rows')}
+                ), '{kind}');
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """
+
+
+def upgrade() -> None:
+    op.create_table(
+        'bot_versions',
+        sa.Column('bot_id', sa.Integer(), nullable=False),
+        sa.Column('bot_version', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('data_version', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('conversation_version', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('job_version', sa.BigInteger(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['bot_id'], ['bots.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('bot_id')
+    )
+    # Bot list ETag looks up the user's bots
+    op.create_index('ix_bots_user_id', 'bots', ['user_id'], unique=False)
+
+    # One increment per bot per statement; bots deleted in the same statement are skipped
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_bot_versions(bot_ids INTEGER[], kind TEXT)
+        RETURNS VOID AS $$
+        BEGIN
+            INSERT INTO bot_versions (bot_id, bot_version, data_version, conversation_version, job_version)
+            SELECT b.id,
+                   (kind = 'bot')::int,
+                   (kind = 'data')::int,
+                   (kind = 'conversations')::int,
+                   (kind = 'jobs')::int
+            FROM bots b
+            WHERE b.id = ANY(bot_ids)
+            ORDER BY b.id
+            ON CONFLICT (bot_id) DO UPDATE SET
+                bot_version = bot_versions.bot_version + EXCLUDED.bot_version,
+                data_version = bot_versions.data_version + EXCLUDED.data_version,
+                conversation_version = bot_versions.conversation_version + EXCLUDED.conversation_version,
+                job_version = bot_versions.job_version + EXCLUDED.job_version;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    # Bot rows change rarely: row-level
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_bot_row_version()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            PERFORM bump_bot_versions(ARRAY[NEW.id], 'bot');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER bots_version
+        AFTER INSERT OR UPDATE ON bots
+        FOR EACH ROW
+        EXECUTE FUNCTION bump_bot_row_version();
+    """)
+
+    # Child tables: statement-level with transition tables (one trigger per event)
+    for table, kind, bot_ids_sql in VERSIONED_TABLES:
+        op.execute(_trigger_function(table, kind, bot_ids_sql))
+        op.execute(f"""
+            CREATE TRIGGER {table}_version_insert
+            AFTER INSERT ON {table}
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION bump_{table}_version();
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {table}_version_update
+            AFTER UPDATE ON {table}
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION bump_{table}_version();
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {table}_version_delete
+            AFTER DELETE ON {table}
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION bump_{table}_version();
+        """)
+
+    op.execute("INSERT INTO bot_versions (bot_id) SELECT id FROM bots")
+
+    op.execute("COMMENT ON TABLE bot_versions IS 'Per-bot change counters used for ETags (auto-updated by triggers)'")
+
+
+def downgrade() -> None:
+    for table, _, _ in reversed(VERSIONED_TABLES):
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_version_delete ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_version_update ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_version_insert ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS bump_{table}_version()")
+    op.execute("DROP TRIGGER IF EXISTS bots_version ON bots")
+    op.execute("DROP FUNCTION IF EXISTS bump_bot_row_version()")
+    op.execute("DROP FUNCTION IF EXISTS bump_bot_versions(INTEGER[], TEXT)")
+
+    op.drop_index('ix_bots_user_id', table_name='bots')
+    op.drop_table('bot_versions')
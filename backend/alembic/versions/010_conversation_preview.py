@@ -0,0 +1,87 @@
+"""Keep first user message and last activity on conversations
+
+Revision ID: 010_conversation_preview
+Revises: 009_bot_versions
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '010_conversation_preview'
+down_revision = '009_bot_versions'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('conversations', sa.Column('first_user_message', sa.Text(), nullable=True))
+    op.add_column('conversations', sa.Column('last_message_at', sa.DateTime(timezone=True), nullable=True))
+
+    # The message count trigger (002) now also maintains the history preview columns
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_conversation_message_count()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            UPDATE conversations
+            SET message_count = message_count + 1,
+                last_message_at = GREATEST(last_message_at, NEW.timestamp),
+                first_user_message = CASE
+                    WHEN first_user_message IS NULL AND NEW.sender = 'user' THEN NEW.message
+                    ELSE first_user_message
+                END
+            WHERE id = NEW.conversation_id;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    # Backfill existing conversations in two passes over conversation_messages
+    op.execute("""
+        UPDATE conversations c
+        SET first_user_message = f.message
+        FROM (
+            SELECT DISTINCT ON (conversation_id) conversation_id, message
+            FROM conversation_messages
+            WHERE sender = 'user'
+            ORDER BY conversation_id, timestamp, id
+        ) f
+        WHERE f.conversation_id = c.id
+    """)
+    op.execute("""
+        UPDATE conversations c
+        SET last_message_at = m.last_message_at
+        FROM (
+            SELECT conversation_id, max(timestamp) AS last_message_at
+            FROM conversation_messages
+            GROUP BY conversation_id
+        ) m
+        WHERE m.conversation_id = c.id
+    """)
+
+    # Keyset pages of a bot's history (newest first) and created_at range filters
+    op.create_index('ix_conversations_bot_id_created_at_id', 'conversations', ['bot_id', 'created_at', 'id'], unique=False)
+
+    op.execute("COMMENT ON COLUMN conversations.first_user_message IS 'First user message, shown as history preview (auto-updated by trigger)'")
+    op.execute("COMMENT ON COLUMN conversations.last_message_at IS 'Timestamp of the latest message (auto-updated by trigger)'")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_conversations_bot_id_created_at_id', table_name='conversations')
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_conversation_message_count()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            UPDATE conversations
+            SET message_count = message_count + 1
+            WHERE id = NEW.conversation_id;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    op.drop_column('conversations', 'last_message_at')
+    op.drop_column('conversations', 'first_user_message')
@@ -0,0 +1,30 @@
+"""Index conversation messages for keyset pagination
+
+Revision ID: 011_conversation_messages_keyset
+Revises: 010_conversation_preview
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '011_conversation_messages_keyset'
+down_revision = '010_conversation_preview'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Pages of one conversation (newest or oldest first) are range scans of this index
+    op.create_index(
+        'ix_conversation_messages_conversation_id_id',
+        'conversation_messages',
+        ['conversation_id', 'id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_conversation_messages_conversation_id_id', table_name='conversation_messages')
@@ -0,0 +1,218 @@
+"""Partition conversation_messages by month with retention
+
+Revision ID: 012_conversation_messages_partitions
+Revises: 011_conversation_messages_keyset
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '012_conversation_messages_partitions'
+down_revision = '011_conversation_messages_keyset'
+branch_labels = None
+depends_on = None
+
+# Months created ahead of the current one during the migration
+MONTHS_AHEAD = 3
+
+MESSAGE_COLUMNS = "id, conversation_id, sender, message, intent, confidence, timestamp, extra_data"
+
+
+def _create_indexes_and_trigger() -> None:
+    op.create_index('ix_conversation_messages_id', 'conversation_messages', ['id'], unique=False)
+    op.create_index(
+        'ix_conversation_messages_conversation_id_id',
+        'conversation_messages',
+        ['conversation_id', 'id'],
+        unique=False
+    )
+    op.execute("""
+        CREATE TRIGGER trigger_update_message_count
+        AFTER INSERT ON conversation_messages
+        FOR EACH ROW
+        EXECUTE FUNCTION update_conversation_message_count();
+    """)
+    op.execute("COMMENT ON COLUMN conversation_messages.sender IS 'Either user or bot'")
+    op.execute("COMMENT ON COLUMN conversation_messages.intent IS 'Detected intent for user messages'")
+    op.execute("COMMENT ON COLUMN conversation_messages.confidence IS 'Confidence score for intent classification'")
+    op.execute("COMMENT ON COLUMN conversation_messages.extra_data IS 'Additional data: entities, context, etc.'")
+
+
+def _detach_old_table(name: str) -> None:
+    """Rename conversation_messages out of the way, freeing its index and trigger names"""
+    op.execute(f"ALTER TABLE conversation_messages RENAME TO {name}")
+    op.execute(f"DROP TRIGGER IF EXISTS trigger_update_message_count ON {name}")
+    op.execute("DROP INDEX IF EXISTS ix_conversation_messages_conversation_id_id")
+    op.execute("DROP INDEX IF EXISTS ix_conversation_messages_id")
+    op.execute(f"ALTER TABLE {name} DROP CONSTRAINT conversation_messages_pkey")
+
+
+def upgrade() -> None:
+    # Partitions are named conversation_messages_YYYY_MM and cover one UTC month.
+    # A new month is filled and attached separately, which also moves rows that
+    # landed in the default partition while the month did not exist yet.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION create_conversation_message_partitions(
+            months_ahead INTEGER,
+            from_time TIMESTAMPTZ DEFAULT now()
+        )
+        RETURNS INTEGER AS $$
+        DECLARE
+            month_start TIMESTAMP := date_trunc('month', LEAST(from_time, now()) AT TIME ZONE 'UTC');
+            last_month TIMESTAMP := date_trunc('month', now() AT TIME ZONE 'UTC')
+                                    + make_interval(months => months_ahead);
+            lower_bound TIMESTAMPTZ;
+            upper_bound TIMESTAMPTZ;
+            partition_name TEXT;
+            created INTEGER := 0;
+        BEGIN
+            PERFORM pg_advisory_xact_lock(hashtext('conversation_messages_partitions'));
+
+            WHILE month_start <= last_month LOOP
+                partition_name := 'conversation_messages_' || to_char(month_start, 'YYYY_MM');
+                lower_bound := month_start AT TIME ZONE 'UTC';
+                upper_bound := (month_start + interval '1 month') AT TIME ZONE 'UTC';
+
+                IF to_regclass(partition_name) IS NULL THEN
+                    EXECUTE format(
+                        'CREATE TABLE %I (LIKE conversation_messages INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+                        partition_name
+                    );
+                    EXECUTE format(
+                        'WITH moved AS (
+                            DELETE FROM conversation_messages_default
+                            WHERE timestamp >= %L AND timestamp < %L
+                            RETURNING *
+                        )
+                        INSERT INTO %I SELECT * FROM moved',
+                        lower_bound, upper_bound, partition_name
+                    );
+                    EXECUTE format(
+                        'ALTER TABLE conversation_messages ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                        partition_name, lower_bound, upper_bound
+                    );
+                    created := created + 1;
+                END IF;
+
+                month_start := month_start + interval '1 month';
+            END LOOP;
+
+            RETURN created;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    # Retention: whole months older than keep_months are dropped (or detached to
+    # be archived), never deleted row by row
+    op.execute("""
+        CREATE OR REPLACE FUNCTION drop_conversation_message_partitions(
+            keep_months INTEGER,
+            detach_only BOOLEAN DEFAULT FALSE
+        )
+        RETURNS SETOF TEXT AS $$
+        DECLARE
+            cutoff TIMESTAMP := date_trunc('month', now() AT TIME ZONE 'UTC')
+                                - make_interval(months => keep_months);
+            partition_name TEXT;
+        BEGIN
+            PERFORM pg_advisory_xact_lock(hashtext('conversation_messages_partitions'));
+
+            FOR partition_name IN
+                SELECT c.relname
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = 'conversation_messages'::regclass
+                  AND c.relname ~ '^conversation_messages_[0-9]{4}_[0-9]{2}$'
+                  AND to_date(right(c.relname, 7), 'YYYY_MM') < cutoff
+                ORDER BY c.relname
+            LOOP
+                IF detach_only THEN
+                    EXECUTE format('ALTER TABLE conversation_messages DETACH PARTITION %I', partition_name);
+                ELSE
+                    EXECUTE format('DROP TABLE %I', partition_name);
+                END IF;
+                RETURN NEXT partition_name;
+            END LOOP;
+
+            -- Cached message pages of every bot may include removed months
+            IF FOUND THEN
+                PERFORM bump_bot_versions(ARRAY(SELECT id FROM bots), 'conversations');
+            END IF;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    _detach_old_table('conversation_messages_unpartitioned')
+
+    # The partition key must be part of the primary key; ids keep their sequence
+    op.execute("""
+        CREATE TABLE conversation_messages (
+            id INTEGER NOT NULL DEFAULT nextval('conversation_messages_id_seq'),
+            conversation_id INTEGER NOT NULL REFERENCES conversations (id) ON DELETE CASCADE,
+            sender VARCHAR(10) NOT NULL,
+            message TEXT NOT NULL,
+            intent VARCHAR(100),
+            confidence FLOAT,
+            timestamp TIMESTAMPTZ NOT NULL DEFAULT now(),
+            extra_data JSON,
+            PRIMARY KEY (id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+    op.execute("ALTER SEQUENCE conversation_messages_id_seq OWNED BY conversation_messages.id")
+    op.execute("CREATE TABLE conversation_messages_default PARTITION OF conversation_messages DEFAULT")
+
+    # Months from the oldest message up to MONTHS_AHEAD, then copy (before the
+    # message count trigger exists, so counts are not incremented again)
+    op.execute("""
+        UPDATE conversation_messages_unpartitioned m
+        SET timestamp = COALESCE(c.created_at, now())
+        FROM conversations c
+        WHERE m.timestamp IS NULL AND c.id = m.conversation_id
+    """)
+    op.execute(f"""
+        SELECT create_conversation_message_partitions(
+            {MONTHS_AHEAD},
+            COALESCE((SELECT min(timestamp) FROM conversation_messages_unpartitioned), now())
+        )
+    """)
+    op.execute(f"""
+        INSERT INTO conversation_messages ({MESSAGE_COLUMNS})
+        SELECT {MESSAGE_COLUMNS} FROM conversation_messages_unpartitioned
+    """)
+    op.execute("DROP TABLE conversation_messages_unpartitioned")
+
+    _create_indexes_and_trigger()
+    op.execute("COMMENT ON TABLE conversation_messages IS 'Stores all messages (user and bot) in conversations, partitioned by month'")
+
+
+def downgrade() -> None:
+    _detach_old_table('conversation_messages_partitioned')
+
+    op.create_table('conversation_messages',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('conversation_messages_id_seq')"), nullable=False),
+    sa.Column('conversation_id', sa.Integer(), nullable=False),
+    sa.Column('sender', sa.String(length=10), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.Column('intent', sa.String(length=100), nullable=True),
+    sa.Column('confidence', sa.Float(), nullable=True),
+    sa.Column('timestamp', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('extra_data', sa.JSON(), nullable=True),
+    sa.ForeignKeyConstraint(['conversation_id'], ['conversations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("ALTER SEQUENCE conversation_messages_id_seq OWNED BY conversation_messages.id")
+    op.execute(f"""
+        INSERT INTO conversation_messages ({MESSAGE_COLUMNS})
+        SELECT {MESSAGE_COLUMNS} FROM conversation_messages_partitioned
+    """)
+    # Drops every attached partition; detached (archived) months are left alone
+    op.execute("DROP TABLE conversation_messages_partitioned")
+
+    _create_indexes_and_trigger()
+    op.execute("COMMENT ON TABLE conversation_messages IS 'Stores all messages (user and bot) in conversations'")
+
+    op.execute("DROP FUNCTION IF EXISTS drop_conversation_message_partitions(INTEGER, BOOLEAN)")
+    op.execute("DROP FUNCTION IF EXISTS create_conversation_message_partitions(INTEGER, TIMESTAMPTZ)")
@@ -0,0 +1,71 @@
+"""Soft-delete bots and purge their data in background jobs
+
+Revision ID: 013_bot_purge_jobs
+Revises: 012_conversation_messages_partitions
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '013_bot_purge_jobs'
+down_revision = '012_conversation_messages_partitions'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('bots', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+
+    # bot_id has no foreign key: the job outlives the bot row it purges
+    op.create_table('bot_purge_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('bot_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), server_default='pending', nullable=False),
+    sa.Column('progress', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('current_table', sa.String(length=50), nullable=True),
+    sa.Column('rows_total', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('rows_deleted', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_bot_purge_jobs_id'), 'bot_purge_jobs', ['id'], unique=False)
+    op.create_index('ix_bot_purge_jobs_status', 'bot_purge_jobs', ['status'], unique=False)
+
+    # Batches select children by bot / parent id
+    op.create_index('ix_training_jobs_bot_id', 'training_jobs', ['bot_id'], unique=False)
+    op.create_index('ix_training_logs_training_job_id', 'training_logs', ['training_job_id'], unique=False)
+
+    # Same updated_at behaviour as training_jobs
+    op.execute("""
+        CREATE TRIGGER bot_purge_jobs_updated_at_trigger
+        BEFORE UPDATE ON bot_purge_jobs
+        FOR EACH ROW
+        EXECUTE FUNCTION update_training_jobs_updated_at();
+    """)
+
+    op.execute("COMMENT ON COLUMN bots.deleted_at IS 'Set when the bot is deleted; its data is removed by a bot_purge_jobs job'")
+    op.execute("COMMENT ON TABLE bot_purge_jobs IS 'Background removal of a deleted bot''s data in bounded batches'")
+    op.execute("COMMENT ON COLUMN bot_purge_jobs.status IS 'Job status: pending, running, completed, failed'")
+    op.execute("COMMENT ON COLUMN bot_purge_jobs.current_table IS 'Table being purged, then model_dir and bots'")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS bot_purge_jobs_updated_at_trigger ON bot_purge_jobs")
+
+    op.drop_index('ix_training_logs_training_job_id', table_name='training_logs')
+    op.drop_index('ix_training_jobs_bot_id', table_name='training_jobs')
+
+    op.drop_index('ix_bot_purge_jobs_status', table_name='bot_purge_jobs')
+    op.drop_index(op.f('ix_bot_purge_jobs_id'), table_name='bot_purge_jobs')
+    op.drop_table('bot_purge_jobs')
+
+    op.drop_column('bots', 'deleted_at')
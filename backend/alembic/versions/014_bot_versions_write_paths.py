@@ -0,0 +1,95 @@
+"""Keep bot version bumps off the chat and training log write paths
+
+Revision ID: 014_bot_versions_write_paths
+Revises: 013_bot_purge_jobs
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '014_bot_versions_write_paths'
+down_revision = '013_bot_purge_jobs'
+branch_labels = None
+depends_on = None
+
+
+def _create_statement_trigger(table: str, event: str, referencing: str) -> None:
+    op.execute(f"""
+        CREATE TRIGGER {table}_version_{event.lower()}
+        AFTER {event} ON {table}
+        REFERENCING {referencing}
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION bump_{table}_version();
+    """)
+
+
+def upgrade() -> None:
+    # Every chat message updates its conversation (message count trigger); bumping the
+    # bot's single bot_versions row there serialized all sessions of a bot. Message
+    # activity is now part of the conversation ETags instead (max(last_message_at)).
+    op.execute("DROP TRIGGER IF EXISTS conversations_version_update ON conversations")
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_conversation_row_version()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            PERFORM bump_bot_versions(ARRAY[OLD.bot_id, NEW.bot_id], 'conversations');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER conversations_version_update
+        AFTER UPDATE ON conversations
+        FOR EACH ROW
+        WHEN (OLD.ended_at IS DISTINCT FROM NEW.ended_at
+              OR OLD.bot_id IS DISTINCT FROM NEW.bot_id
+              OR OLD.session_id IS DISTINCT FROM NEW.session_id)
+        EXECUTE FUNCTION bump_conversation_row_version();
+    """)
+    # History ETag: latest activity of a bot's conversations
+    op.create_index('ix_conversations_bot_id_last_message_at', 'conversations', ['bot_id', 'last_message_at'], unique=False)
+
+    # One bump per log line; job status/progress updates already bump job_version and
+    # log endpoints add the job's latest log id to their ETag
+    op.execute("DROP TRIGGER IF EXISTS training_logs_version_delete ON training_logs")
+    op.execute("DROP TRIGGER IF EXISTS training_logs_version_update ON training_logs")
+    op.execute("DROP TRIGGER IF EXISTS training_logs_version_insert ON training_logs")
+    op.execute("DROP FUNCTION IF EXISTS bump_training_logs_version()")
+
+
+def downgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_training_logs_version()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                PERFORM bump_bot_versions(ARRAY(
+                    SELECT j.bot_id FROM new_rows r JOIN training_jobs j ON j.id = r.training_job_id
+                ), 'jobs');
+            ELSIF TG_OP = 'DELETE' THEN
+                PERFORM bump_bot_versions(ARRAY(
+                    SELECT j.bot_id FROM old_rows r JOIN training_jobs j ON j.id = r.training_job_id
+                ), 'jobs');
+            ELSE
+                PERFORM bump_bot_versions(ARRAY(
+                    SELECT j.bot_id FROM new_rows r JOIN training_jobs j ON j.id = r.training_job_id
+                    UNION
+                    SELECT j.bot_id FROM old_rows r JOIN training_jobs j ON j.id = r.training_job_id
+                ), 'jobs');
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    _create_statement_trigger('training_logs', 'INSERT', 'NEW TABLE AS new_rows')
+    _create_statement_trigger('training_logs', 'UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows')
+    _create_statement_trigger('training_logs', 'DELETE', 'OLD TABLE AS old_rows')
+
+    op.drop_index('ix_conversations_bot_id_last_message_at', table_name='conversations')
+
+    op.execute("DROP TRIGGER IF EXISTS conversations_version_update ON conversations")
+    op.execute("DROP FUNCTION IF EXISTS bump_conversation_row_version()")
+    _create_statement_trigger('conversations', 'UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows')
@@ -2,23 +2,35 @@
 Bot management API endpoints
 """
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
 
 from app.database import get_db
-from app.models import User, Bot
-from app.schemas import Bot as BotSchema, BotCreate, BotUpdate
+from app.models import User, Bot, BotPurgeJob, TrainingJob, ImportJob
+from app.schemas import Bot as BotSchema, BotCreate, BotUpdate, BotPurgeJobResponse
 from app.auth import get_current_user
+from app.api.training_jobs import get_database_url, terminate_bot_training
+from app.services.bot_purge import run_bot_purge
+from app.services.etags import get_bot_version, get_user_bots_version, make_etag, etag_headers, not_modified
 
 router = APIRouter(prefix="/bots", tags=["Bots"])
 
 @router.get("/", response_model=List[BotSchema])
 def get_user_bots(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all bots for current user"""
-    bots = db.query(Bot).filter(Bot.user_id == current_user.id).all()
+    """Get all bots for current user (304 if unchanged since If-None-Match)"""
+    etag = make_etag(request, current_user.id, get_user_bots_version(db, current_user.id))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    
+    bots = db.query(Bot).filter(Bot.user_id == current_user.id, Bot.deleted_at.is_(None)).all()
+    response.headers.update(etag_headers(etag))
     return bots
 
 @router.post("/", response_model=BotSchema, status_code=status.HTTP_201_CREATED)
@@ -42,18 +54,27 @@ def create_bot(
 @router.get("/{bot_id}", response_model=BotSchema)
 def get_bot(
     bot_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get bot by ID"""
+    """Get bot by ID (304 if unchanged since If-None-Match)"""
     bot = db.query(Bot).filter(
         Bot.id == bot_id,
-        Bot.user_id == current_user.id
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
     ).first()
     
     if not bot:
         raise HTTPException(status_code=404, detail="Bot not found")
     
+    etag = make_etag(request, get_bot_version(db, bot_id, "bot"))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    
+    response.headers.update(etag_headers(etag))
     return bot
 
 @router.put("/{bot_id}", response_model=BotSchema)
@@ -66,7 +87,8 @@ def update_bot(
     """Update bot"""
     bot = db.query(Bot).filter(
         Bot.id == bot_id,
-        Bot.user_id == current_user.id
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
     ).first()
     
     if not bot:
@@ -84,21 +106,64 @@ def update_bot(
     db.refresh(bot)
     return bot
 
-@router.delete("/{bot_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{bot_id}", response_model=BotPurgeJobResponse, status_code=status.HTTP_202_ACCEPTED)
 def delete_bot(
     bot_id: int,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Delete bot"""
+    """
+    Delete bot
+    
+    The bot disappears right away; its data and model directory are removed
+    by a background purge job. Poll GET /bots/purge-jobs/{job_id} for progress.
+    """
     bot = db.query(Bot).filter(
         Bot.id == bot_id,
-        Bot.user_id == current_user.id
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
     ).first()
     
     if not bot:
         raise HTTPException(status_code=404, detail="Bot not found")
     
-    db.delete(bot)
+    bot.deleted_at = func.now()
+    # Training in this worker is stopped now; elsewhere at its next progress update
+    active_job_ids = [job_id for (job_id,) in db.query(TrainingJob.id).filter(
+        TrainingJob.bot_id == bot_id,
+        TrainingJob.status.in_(('pending', 'running'))
+    ).all()]
+    terminate_bot_training(active_job_ids)
+    # Import jobs stop at their next cancellation check
+    for job_model in (TrainingJob, ImportJob):
+        db.query(job_model).filter(
+            job_model.bot_id == bot_id,
+            job_model.status.in_(('pending', 'running'))
+        ).update({job_model.status: 'cancelled'}, synchronize_session=False)
+    
+    job = BotPurgeJob(bot_id=bot_id, user_id=current_user.id)
+    db.add(job)
     db.commit()
-    return None
+    db.refresh(job)
+    
+    background_tasks.add_task(run_bot_purge, job.id, get_database_url())
+    return job
+
+
+@router.get("/purge-jobs/{job_id}", response_model=BotPurgeJobResponse)
+def get_purge_job(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get status and progress of a bot purge job"""
+    job = db.query(BotPurgeJob).filter(
+        BotPurgeJob.id == job_id,
+        BotPurgeJob.user_id == current_user.id
+    ).first()
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Purge job not found")
+    
+    return job
@@ -30,7 +30,7 @@ def train_bot_background(bot_id: int, db: Session):
         return
     
     # Get bot
-    bot = db.query(Bot).filter(Bot.id == bot_id).first()
+    bot = db.query(Bot).filter(Bot.id == bot_id, Bot.deleted_at.is_(None)).first()
     if not bot:
         return
     
@@ -102,7 +102,8 @@ def train_bot(
     # Verify bot ownership
     bot = db.query(Bot).filter(
         Bot.id == bot_id,
-        Bot.user_id == current_user.id
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
     ).first()
     
     if not bot:
@@ -146,7 +147,8 @@ def get_training_sessions(
     # Verify bot ownership
     bot = db.query(Bot).filter(
         Bot.id == bot_id,
-        Bot.user_id == current_user.id
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
     ).first()
     
     if not bot:
@@ -171,7 +173,8 @@ async def chat_with_bot(
     # Verify bot ownership
     bot = db.query(Bot).filter(
         Bot.id == bot_id,
-        Bot.user_id == current_user.id
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
     ).first()
     
     if not bot:
@@ -283,7 +286,8 @@ def get_conversations(
     # Verify bot ownership
     bot = db.query(Bot).filter(
         Bot.id == bot_id,
-        Bot.user_id == current_user.id
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
     ).first()
     
     if not bot:
@@ -1,11 +1,15 @@
 """
 Conversation management API endpoints
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 from datetime import datetime
+import os
 import uuid
+import json
+import base64
 
 from app.database import get_db
 from app.models import User, Bot, Conversation, ConversationMessage
@@ -17,9 +21,74 @@ from app.schemas import (
     ConversationMessage as ConversationMessageSchema
 )
 from app.auth import get_current_user
+from app.services.bot_purge import CONVERSATION_MESSAGE_KEYS, delete_in_batches
+from app.utils.responses import json_response, rows_response
+from app.services.etags import get_bot_version, get_conversations_activity, make_etag, etag_headers, not_modified
 
 router = APIRouter(prefix="/conversations", tags=["Conversations"])
 
+# Messages per page of a conversation
+MESSAGES_PAGE_SIZE = int(os.getenv("CONVERSATION_MESSAGES_PAGE_SIZE", "50"))
+MESSAGES_MAX_PAGE_SIZE = int(os.getenv("CONVERSATION_MESSAGES_MAX_PAGE_SIZE", "500"))
+
+# Columns of the ConversationMessage response schema
+MESSAGE_COLUMNS = (
+    ConversationMessage.id,
+    ConversationMessage.conversation_id,
+    ConversationMessage.sender,
+    ConversationMessage.message,
+    ConversationMessage.intent,
+    ConversationMessage.confidence,
+    ConversationMessage.timestamp,
+    ConversationMessage.extra_data
+)
+
+
+def _messages_page(db: Session, conversation: Conversation, limit: int, cursor: Optional[int], newest_first: bool):
+    """
+    One keyset page of messages, ordered by id
+    
+    Returns:
+        (rows, next_cursor) - next_cursor is the id to continue after, None on the last page
+    """
+    query = db.query(*MESSAGE_COLUMNS).filter(ConversationMessage.conversation_id == conversation.id)
+    if conversation.created_at is not None:
+        # Messages are never older than their conversation: skips earlier monthly partitions
+        query = query.filter(ConversationMessage.timestamp >= conversation.created_at)
+    if cursor is not None:
+        query = query.filter(ConversationMessage.id < cursor if newest_first else ConversationMessage.id > cursor)
+    query = query.order_by(ConversationMessage.id.desc() if newest_first else ConversationMessage.id.asc())
+    
+    rows = query.limit(limit + 1).all()
+    if len(rows) > limit:
+        return rows[:limit], str(rows[limit - 1].id)
+    return rows, None
+
+
+def _conversation_detail(request: Request, db: Session, conversation: Conversation):
+    """Conversation metadata and its latest messages (oldest first), with an ETag"""
+    etag = make_etag(
+        request,
+        get_bot_version(db, conversation.bot_id, "conversations"),
+        conversation.message_count,
+        conversation.last_message_at
+    )
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    
+    rows, next_cursor = _messages_page(db, conversation, MESSAGES_PAGE_SIZE, None, newest_first=True)
+    return json_response({
+        "id": conversation.id,
+        "bot_id": conversation.bot_id,
+        "session_id": conversation.session_id,
+        "message_count": conversation.message_count,
+        "created_at": conversation.created_at,
+        "ended_at": conversation.ended_at,
+        "messages": [row._asdict() for row in reversed(rows)],
+        "next_cursor": next_cursor
+    }, headers=etag_headers(etag))
+
 
 @router.post("/start", response_model=ConversationSchema)
 async def start_conversation(
@@ -31,7 +100,8 @@ async def start_conversation(
     # Verify bot ownership
     bot = db.query(Bot).filter(
         Bot.id == bot_id,
-        Bot.user_id == current_user.id
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
     ).first()
     
     if not bot:
@@ -57,10 +127,11 @@ async def start_conversation(
 @router.get("/{conversation_id}", response_model=ConversationWithMessages)
 async def get_conversation(
     conversation_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get conversation with all messages"""
+    """Get conversation metadata with its latest page of messages"""
     conversation = db.query(Conversation).filter(
         Conversation.id == conversation_id
     ).first()
@@ -71,22 +142,24 @@ async def get_conversation(
     # Verify bot ownership
     bot = db.query(Bot).filter(
         Bot.id == conversation.bot_id,
-        Bot.user_id == current_user.id
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
     ).first()
     
     if not bot:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    return conversation
+    return _conversation_detail(request, db, conversation)
 
 
 @router.get("/session/{session_id}", response_model=ConversationWithMessages)
 async def get_conversation_by_session(
     session_id: str,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get conversation by session ID"""
+    """Get conversation by session ID, with its latest page of messages"""
     conversation = db.query(Conversation).filter(
         Conversation.session_id == session_id
     ).first()
@@ -97,13 +170,80 @@ async def get_conversation_by_session(
     # Verify bot ownership
     bot = db.query(Bot).filter(
         Bot.id == conversation.bot_id,
-        Bot.user_id == current_user.id
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
     ).first()
     
     if not bot:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    return conversation
+    return _conversation_detail(request, db, conversation)
+
+
+@router.get("/{conversation_id}/messages", response_model=List[ConversationMessageSchema])
+async def get_conversation_messages(
+    conversation_id: int,
+    request: Request,
+    limit: int = MESSAGES_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    order: str = "desc",
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get one page of a conversation's messages
+    
+    Args:
+        limit: Page size (at most MESSAGES_MAX_PAGE_SIZE)
+        cursor: X-Next-Cursor of the previous page (or next_cursor of the
+            conversation detail, with order=desc, to load older messages)
+        order: desc for newest first, asc for oldest first
+    """
+    conversation = db.query(Conversation).filter(
+        Conversation.id == conversation_id
+    ).first()
+    
+    if not conversation:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    
+    # Verify bot ownership
+    bot = db.query(Bot).filter(
+        Bot.id == conversation.bot_id,
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
+    ).first()
+    
+    if not bot:
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be asc or desc")
+    if cursor is not None and not cursor.isdigit():
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    etag = make_etag(
+        request,
+        get_bot_version(db, conversation.bot_id, "conversations"),
+        conversation.message_count,
+        conversation.last_message_at
+    )
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    
+    limit = max(1, min(limit, MESSAGES_MAX_PAGE_SIZE))
+    rows, next_cursor = _messages_page(
+        db,
+        conversation,
+        limit,
+        int(cursor) if cursor is not None else None,
+        newest_first=order == "desc"
+    )
+    
+    headers = etag_headers(etag)
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return rows_response(rows, headers=headers)
 
 
 @router.post("/{conversation_id}/end")
@@ -123,7 +263,8 @@ async def end_conversation(
     # Verify bot ownership
     bot = db.query(Bot).filter(
         Bot.id == conversation.bot_id,
-        Bot.user_id == current_user.id
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
     ).first()
     
     if not bot:
@@ -140,50 +281,93 @@ async def end_conversation(
     }
 
 
+def _encode_cursor(created_at: datetime, conversation_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), conversation_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(cursor: str):
+    try:
+        created_at, conversation_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(conversation_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/bot/{bot_id}/history", response_model=List[ConversationHistory])
 async def get_bot_conversation_history(
     bot_id: int,
-    limit: int = Query(default=20, le=100),
-    offset: int = Query(default=0, ge=0),
+    request: Request,
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    started_from: Optional[datetime] = None,
+    started_to: Optional[datetime] = None,
+    active_since: Optional[datetime] = None,
+    ongoing: Optional[bool] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get conversation history for a bot"""
+    """
+    Get conversation history for a bot, newest first
+    
+    One query over conversations (the preview and last activity are kept on
+    the row by a trigger). Pages are keyset based: pass the X-Next-Cursor
+    response header back as cursor, with the same filters.
+    
+    Args:
+        started_from / started_to: Conversation start time range
+        active_since: Only conversations with a message at or after this time
+        ongoing: True for conversations not ended yet, False for ended ones
+    """
     # Verify bot ownership
     bot = db.query(Bot).filter(
         Bot.id == bot_id,
-        Bot.user_id == current_user.id
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
     ).first()
     
     if not bot:
         raise HTTPException(status_code=404, detail="Bot not found")
     
-    # Get conversations
-    conversations = db.query(Conversation).filter(
-        Conversation.bot_id == bot_id
-    ).order_by(
-        Conversation.created_at.desc()
-    ).limit(limit).offset(offset).all()
-    
-    # Build history response
-    history = []
-    for conv in conversations:
-        # Get first user message as preview
-        first_msg = db.query(ConversationMessage).filter(
-            ConversationMessage.conversation_id == conv.id,
-            ConversationMessage.sender == 'user'
-        ).first()
-        
-        history.append(ConversationHistory(
-            conversation_id=conv.id,
-            session_id=conv.session_id,
-            message_count=conv.message_count,
-            started_at=conv.created_at,
-            ended_at=conv.ended_at,
-            preview=first_msg.message if first_msg else None
-        ))
-    
-    return history
+    etag = make_etag(request, get_bot_version(db, bot_id, "conversations"), get_conversations_activity(db, bot_id))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    
+    query = db.query(
+        Conversation.id.label("conversation_id"),
+        Conversation.session_id,
+        Conversation.message_count,
+        Conversation.created_at.label("started_at"),
+        Conversation.ended_at,
+        Conversation.first_user_message.label("preview"),
+        Conversation.last_message_at
+    ).filter(Conversation.bot_id == bot_id)
+    
+    if started_from:
+        query = query.filter(Conversation.created_at >= started_from)
+    if started_to:
+        query = query.filter(Conversation.created_at < started_to)
+    if active_since:
+        query = query.filter(Conversation.last_message_at >= active_since)
+    if ongoing is not None:
+        query = query.filter(Conversation.ended_at.is_(None) if ongoing else Conversation.ended_at.isnot(None))
+    if cursor:
+        created_at, conversation_id = _decode_cursor(cursor)
+        query = query.filter(tuple_(Conversation.created_at, Conversation.id) < tuple_(created_at, conversation_id))
+    
+    conversations = query.order_by(
+        Conversation.created_at.desc(),
+        Conversation.id.desc()
+    ).limit(limit + 1).all()
+    
+    headers = etag_headers(etag)
+    if len(conversations) > limit:
+        conversations = conversations[:limit]
+        last = conversations[-1]
+        headers["X-Next-Cursor"] = _encode_cursor(last.started_at, last.conversation_id)
+    
+    return rows_response(conversations, headers=headers)
 
 
 @router.delete("/{conversation_id}")
@@ -203,13 +387,25 @@ async def delete_conversation(
     # Verify bot ownership
     bot = db.query(Bot).filter(
         Bot.id == conversation.bot_id,
-        Bot.user_id == current_user.id
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
     ).first()
     
     if not bot:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    # Delete conversation (cascade will delete messages)
+    # Messages go first in bounded transactions, then the conversation row
+    batches = delete_in_batches(
+        lambda sql, params: db.connection().exec_driver_sql(sql, params).rowcount,
+        db.commit,
+        "conversation_messages",
+        CONVERSATION_MESSAGE_KEYS,
+        "id, timestamp",
+        {"conversation_id": conversation_id}
+    )
+    for _ in batches:
+        pass
+    
     db.delete(conversation)
     db.commit()
     
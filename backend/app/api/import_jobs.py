@@ -0,0 +1,362 @@
+"""
+Import Jobs API - import large training data files in the background with progress
+"""
+import os
+import uuid
+import shutil
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, UploadFile, File, Request, Response
+from sqlalchemy import text
+
+from app.database import get_db
+from app.auth import get_current_user
+from app.models import User
+from app.schemas import ImportJobResponse
+from app.api.training_jobs import get_database_url
+from app.services.bulk_ingest import copy_training_data
+from app.services.etags import get_bot_version, make_etag, etag_headers, not_modified
+from app.utils.data_parsers import TrainingDataParser
+from app.utils.intent_classifier import HybridIntentClassifier
+
+router = APIRouter(tags=["import-jobs"])
+
+# Uploads are spooled here until their job finishes (shared volume, so any worker can pick them up)
+IMPORT_UPLOAD_DIR = os.getenv("IMPORT_UPLOAD_DIR", "/app/models/.imports")
+
+# Per-line parse errors kept on the job (the count is always complete)
+MAX_STORED_ERRORS = 100
+
+IMPORT_JOB_COLUMNS = """
+    id, bot_id, status, progress, filename, file_size, options,
+    rows_parsed, rows_classified, rows_inserted, rows_skipped, error_count, errors, error_message,
+    started_at, completed_at, created_at, updated_at
+"""
+
+
+def run_import_job(job_id: int, bot_id: int, db_connection_string: str):
+    """
+    Background task to parse, classify and insert an uploaded file
+
+    Progress is committed on its own connection while the rows go into one
+    transaction on a second connection, so a failed or cancelled import
+    leaves no partial data.
+    """
+    conn = None
+    data_conn = None
+    file_path = None
+    try:
+        # Import psycopg2 for direct DB connection in background task
+        import psycopg2
+        from psycopg2.extras import RealDictCursor, Json
+
+        conn = psycopg2.connect(db_connection_string)
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+
+        cursor.execute(
+            "SELECT status, filename, file_path, file_size, options FROM import_jobs WHERE id = %s",
+            (job_id,)
+        )
+        job = cursor.fetchone()
+        if not job or job['status'] != 'pending':
+            return
+        file_path = job['file_path']
+        options = job['options'] or {}
+
+        cursor.execute(
+            "UPDATE import_jobs SET status = 'running', progress = 0, started_at = NOW() WHERE id = %s",
+            (job_id,)
+        )
+        conn.commit()
+
+        def job_cancelled():
+            cursor.execute("SELECT status FROM import_jobs WHERE id = %s", (job_id,))
+            row = cursor.fetchone()
+            conn.commit()
+            return row is None or row['status'] == 'cancelled'
+
+        classifier = None
+        if options.get("use_intelligent_classification"):
+            try:
+                cursor.execute(
+                    """
+                    SELECT pattern, intent FROM intent_rules
+                    WHERE bot_id = %s AND is_active
+                    ORDER BY priority, id
+                    """,
+                    (bot_id,)
+                )
+                custom_rules = [(row['pattern'], row['intent']) for row in cursor.fetchall()]
+                conn.commit()
+                classifier = HybridIntentClassifier(os.getenv("RASA_SERVER_URL", "http://localhost:5005"))
+                classifier.initialize(bot_id, custom_rules=custom_rules)
+            except Exception as e:
+                print(f"[WARN] Import job {job_id}: intelligent classification unavailable: {e}")
+                classifier = None
+
+        data_conn = psycopg2.connect(db_connection_string)
+        data_cursor = data_conn.cursor()
+
+        rows_parsed = rows_classified = rows_inserted = rows_skipped = 0
+        errors = []
+        file_size = job['file_size'] or os.path.getsize(file_path) or 1
+
+        with open(file_path, "rb") as f:
+            for chunk in TrainingDataParser.iter_parse(job['filename'] or file_path, f, errors=errors):
+                if job_cancelled():
+                    data_conn.rollback()
+                    return
+
+                rows_parsed += len(chunk)
+
+                if classifier:
+                    unknown = [i for i, item in enumerate(chunk) if item.get('intent') in (None, '', 'unknown')]
+                    try:
+                        chunk = TrainingDataParser.enhance_with_intelligent_classification(
+                            chunk, bot_id, classifier=classifier
+                        )
+                        # Only rows that came back with a real intent
+                        rows_classified += sum(
+                            1 for i in unknown if chunk[i].get('intent') not in (None, '', 'unknown')
+                        )
+                    except Exception as e:
+                        print(f"[WARN] Import job {job_id}: classification failed: {e}")
+
+                inserted, skipped = copy_training_data(data_cursor, bot_id, (
+                    {
+                        "user_message": item["user"],
+                        "bot_response": item["bot"],
+                        "intent": item.get("intent")
+                    }
+                    for item in chunk
+                ))
+                rows_inserted += inserted
+                rows_skipped += skipped
+
+                # Read position of the raw file; the text decoder reads a little ahead
+                progress = min(99, int(f.tell() * 100 / file_size))
+                cursor.execute(
+                    """
+                    UPDATE import_jobs
+                    SET progress = %s, rows_parsed = %s, rows_classified = %s, rows_inserted = %s,
+                        rows_skipped = %s, error_count = %s
+                    WHERE id = %s
+                    """,
+                    (progress, rows_parsed, rows_classified, rows_inserted, rows_skipped, len(errors), job_id)
+                )
+                conn.commit()
+
+        if not rows_parsed:
+            data_conn.rollback()
+            raise Exception("No valid training data found in file")
+
+        # Commit the data only if the job was not cancelled in the meantime
+        cursor.execute("SELECT status FROM import_jobs WHERE id = %s FOR UPDATE", (job_id,))
+        row = cursor.fetchone()
+        if row is None or row['status'] == 'cancelled':
+            data_conn.rollback()
+            conn.commit()
+            return
+
+        data_conn.commit()
+        cursor.execute(
+            """
+            UPDATE import_jobs
+            SET status = 'completed', progress = 100, rows_parsed = %s, rows_classified = %s,
+                rows_inserted = %s, rows_skipped = %s, error_count = %s, errors = %s, completed_at = NOW()
+            WHERE id = %s
+            """,
+            (rows_parsed, rows_classified, rows_inserted, rows_skipped, len(errors),
+             Json(errors[:MAX_STORED_ERRORS]), job_id)
+        )
+        conn.commit()
+
+    except Exception as e:
+        print(f"[ERROR] Import job {job_id} failed: {e}")
+        if data_conn:
+            data_conn.rollback()
+        if conn:
+            conn.rollback()
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                UPDATE import_jobs
+                SET status = 'failed', error_message = %s, completed_at = NOW()
+                WHERE id = %s AND status <> 'cancelled'
+                """,
+                (str(e), job_id)
+            )
+            conn.commit()
+
+    finally:
+        if file_path and os.path.exists(file_path):
+            os.remove(file_path)
+        if data_conn:
+            data_conn.close()
+        if conn:
+            conn.close()
+
+
+@router.post("/bots/{bot_id}/training/import", response_model=ImportJobResponse)
+def start_import(
+    bot_id: int,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    use_intelligent_classification: bool = False,
+    current_user: User = Depends(get_current_user),
+    db = Depends(get_db)
+):
+    """
+    Import a training data file as a background job
+
+    The file is stored on disk and the job id is returned right away; poll
+    GET /import-jobs/{job_id} for progress.
+    Supported: JSON, JSONL, CSV, XLSX, YAML, TXT, Markdown
+    """
+    result = db.execute(
+        text("SELECT id FROM bots WHERE id = :bot_id AND user_id = :user_id AND deleted_at IS NULL"),
+        {"bot_id": bot_id, "user_id": current_user.id}
+    )
+    if not result.fetchone():
+        raise HTTPException(status_code=404, detail="Bot not found")
+
+    filename = os.path.basename(file.filename or "upload")
+    os.makedirs(IMPORT_UPLOAD_DIR, exist_ok=True)
+    file_path = os.path.join(IMPORT_UPLOAD_DIR, f"{uuid.uuid4().hex}_{filename}")
+    with open(file_path, "wb") as f:
+        shutil.copyfileobj(file.file, f, 1024 * 1024)
+    file_size = os.path.getsize(file_path)
+
+    try:
+        result = db.execute(
+            text(f"""
+                INSERT INTO import_jobs (bot_id, status, progress, filename, file_path, file_size, options)
+                VALUES (:bot_id, 'pending', 0, :filename, :file_path, :file_size, CAST(:options AS JSON))
+                RETURNING {IMPORT_JOB_COLUMNS}
+            """),
+            {
+                "bot_id": bot_id,
+                "filename": filename,
+                "file_path": file_path,
+                "file_size": file_size,
+                "options": f'{{"use_intelligent_classification": {"true" if use_intelligent_classification else "false"}}}'
+            }
+        )
+        job = result.fetchone()
+        db.commit()
+    except Exception:
+        os.remove(file_path)
+        raise
+
+    background_tasks.add_task(run_import_job, job.id, bot_id, get_database_url())
+
+    return ImportJobResponse(**dict(job._mapping))
+
+
+@router.get("/bots/{bot_id}/import-jobs", response_model=List[ImportJobResponse])
+def get_import_jobs(
+    bot_id: int,
+    request: Request,
+    response: Response,
+    limit: int = 10,
+    current_user: User = Depends(get_current_user),
+    db = Depends(get_db)
+):
+    """
+    Get import job history for a bot
+    """
+    result = db.execute(
+        text("SELECT id FROM bots WHERE id = :bot_id AND user_id = :user_id AND deleted_at IS NULL"),
+        {"bot_id": bot_id, "user_id": current_user.id}
+    )
+    if not result.fetchone():
+        raise HTTPException(status_code=404, detail="Bot not found")
+
+    etag = make_etag(request, get_bot_version(db, bot_id, "jobs"))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    result = db.execute(
+        text(f"""
+            SELECT {IMPORT_JOB_COLUMNS}
+            FROM import_jobs
+            WHERE bot_id = :bot_id
+            ORDER BY created_at DESC
+            LIMIT :limit
+        """),
+        {"bot_id": bot_id, "limit": limit}
+    )
+    response.headers.update(etag_headers(etag))
+    return [ImportJobResponse(**dict(job._mapping)) for job in result.fetchall()]
+
+
+@router.get("/import-jobs/{job_id}", response_model=ImportJobResponse)
+def get_import_job(
+    job_id: int,
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    db = Depends(get_db)
+):
+    """
+    Get status and progress of an import job
+    """
+    result = db.execute(
+        text(f"""
+            SELECT {', '.join('ij.' + column.strip() for column in IMPORT_JOB_COLUMNS.split(','))}
+            FROM import_jobs ij
+            JOIN bots b ON ij.bot_id = b.id
+            WHERE ij.id = :job_id AND b.user_id = :user_id AND b.deleted_at IS NULL
+        """),
+        {"job_id": job_id, "user_id": current_user.id}
+    )
+    job = result.fetchone()
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+
+    etag = make_etag(request, get_bot_version(db, job.bot_id, "jobs"))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    response.headers.update(etag_headers(etag))
+    return ImportJobResponse(**dict(job._mapping))
+
+
+@router.delete("/import-jobs/{job_id}/cancel")
+def cancel_import_job(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db = Depends(get_db)
+):
+    """
+    Cancel a pending or running import job (rows inserted so far are rolled back)
+    """
+    result = db.execute(
+        text("""
+            SELECT ij.id, ij.status
+            FROM import_jobs ij
+            JOIN bots b ON ij.bot_id = b.id
+            WHERE ij.id = :job_id AND b.user_id = :user_id AND b.deleted_at IS NULL
+            FOR UPDATE OF ij
+        """),
+        {"job_id": job_id, "user_id": current_user.id}
+    )
+    job = result.fetchone()
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+
+    if job.status not in ['pending', 'running']:
+        raise HTTPException(
+            status_code=400,
+            detail="Can only cancel pending or running jobs"
+        )
+
+    db.execute(
+        text("UPDATE import_jobs SET status = 'cancelled', completed_at = NOW() WHERE id = :job_id"),
+        {"job_id": job_id}
+    )
+    db.commit()
+
+    return {"message": "Import job cancelled successfully"}
@@ -0,0 +1,163 @@
+"""
+Intent rule API endpoints - per-bot rules for rule-based intent classification
+"""
+from typing import List, Tuple
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models import User, Bot, IntentRule
+from app.schemas import IntentRule as IntentRuleSchema, IntentRuleCreate, IntentRuleUpdate, IntentClassifyRequest
+from app.auth import get_current_user
+from app.utils.rule_classifier import RuleClassifier, default_classifier, validate_pattern
+
+router = APIRouter(prefix="/bots/{bot_id}/intent-rules", tags=["Intent Rules"])
+
+
+def load_intent_rules(db: Session, bot_id: int) -> List[Tuple[str, str]]:
+    """Active (pattern, intent) rules of a bot in the order they are checked"""
+    rows = db.query(IntentRule.pattern, IntentRule.intent).filter(
+        IntentRule.bot_id == bot_id,
+        IntentRule.is_active.is_(True)
+    ).order_by(IntentRule.priority, IntentRule.id).all()
+    return [(row.pattern, row.intent) for row in rows]
+
+
+def _get_bot(db: Session, bot_id: int, user_id: int) -> Bot:
+    bot = db.query(Bot).filter(
+        Bot.id == bot_id,
+        Bot.user_id == user_id,
+        Bot.deleted_at.is_(None)
+    ).first()
+
+    if not bot:
+        raise HTTPException(status_code=404, detail="Bot not found")
+
+    return bot
+
+
+def _check_pattern(pattern: str) -> None:
+    try:
+        validate_pattern(pattern)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/", response_model=List[IntentRuleSchema])
+def get_intent_rules(
+    bot_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get all intent rules for bot, in the order they are checked"""
+    _get_bot(db, bot_id, current_user.id)
+
+    return db.query(IntentRule).filter(
+        IntentRule.bot_id == bot_id
+    ).order_by(IntentRule.priority, IntentRule.id).all()
+
+
+@router.post("/", response_model=IntentRuleSchema)
+def create_intent_rule(
+    bot_id: int,
+    rule: IntentRuleCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Add intent rule"""
+    _get_bot(db, bot_id, current_user.id)
+    _check_pattern(rule.pattern)
+
+    db_rule = IntentRule(
+        bot_id=bot_id,
+        pattern=rule.pattern,
+        intent=rule.intent,
+        priority=rule.priority,
+        is_active=rule.is_active
+    )
+    db.add(db_rule)
+    db.commit()
+    db.refresh(db_rule)
+
+    return db_rule
+
+
+@router.put("/{rule_id}", response_model=IntentRuleSchema)
+def update_intent_rule(
+    bot_id: int,
+    rule_id: int,
+    rule_update: IntentRuleUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Update intent rule"""
+    _get_bot(db, bot_id, current_user.id)
+
+    db_rule = db.query(IntentRule).filter(
+        IntentRule.id == rule_id,
+        IntentRule.bot_id == bot_id
+    ).first()
+
+    if not db_rule:
+        raise HTTPException(status_code=404, detail="Intent rule not found")
+
+    if rule_update.pattern is not None:
+        _check_pattern(rule_update.pattern)
+        db_rule.pattern = rule_update.pattern
+    if rule_update.intent is not None:
+        db_rule.intent = rule_update.intent
+    if rule_update.priority is not None:
+        db_rule.priority = rule_update.priority
+    if rule_update.is_active is not None:
+        db_rule.is_active = rule_update.is_active
+
+    db.commit()
+    db.refresh(db_rule)
+
+    return db_rule
+
+
+@router.delete("/{rule_id}", status_code=204)
+def delete_intent_rule(
+    bot_id: int,
+    rule_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Delete intent rule"""
+    _get_bot(db, bot_id, current_user.id)
+
+    db_rule = db.query(IntentRule).filter(
+        IntentRule.id == rule_id,
+        IntentRule.bot_id == bot_id
+    ).first()
+
+    if not db_rule:
+        raise HTTPException(status_code=404, detail="Intent rule not found")
+
+    db.delete(db_rule)
+    db.commit()
+
+    return None
+
+
+@router.post("/classify", response_model=dict)
+def classify_messages(
+    bot_id: int,
+    request: IntentClassifyRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Classify messages with the bot's active rules followed by the built-in rules"""
+    _get_bot(db, bot_id, current_user.id)
+
+    custom_rules = load_intent_rules(db, bot_id)
+    classifier = RuleClassifier(custom_rules) + default_classifier if custom_rules else default_classifier
+    intents = classifier.classify_many(request.messages)
+
+    return {
+        "results": [
+            {"message": message, "intent": intent}
+            for message, intent in zip(request.messages, intents)
+        ]
+    }
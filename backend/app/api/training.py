@@ -1,32 +1,158 @@
 """
 Training data management API endpoints
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, and_, or_, tuple_, func, literal, exists
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
+import os
 import json
+import base64
+import orjson
+import logging
 
-from app.database import get_db
-from app.models import User, Bot, TrainingData
-from app.schemas import TrainingData as TrainingDataSchema, TrainingDataCreate
+from app.database import get_db, engine
+from app.models import User, Bot, TrainingData, BotDatasetStats, BotIntentCount
+from app.schemas import (
+    TrainingData as TrainingDataSchema, TrainingDataCreate, TrainingDataBulkCreate,
+    TrainingDataSearchResult, TrainingDataStats,
+    TrainingDataBulkDelete, TrainingDataRelabel, TrainingDataReplace
+)
 from app.auth import get_current_user
 from app.utils.data_parsers import TrainingDataParser
+from app.utils.intent_classifier import HybridIntentClassifier
+from app.services.bulk_ingest import bulk_insert_training_data
+from app.services.parse_preview import build_preview, read_preview_page, PREVIEW_SAMPLE_SIZE
+from app.api.intent_rules import load_intent_rules
+from app.utils.responses import rows_response
+from app.services.etags import get_bot_version, make_etag, etag_headers, not_modified
 
 router = APIRouter(prefix="/bots/{bot_id}/training", tags=["Training Data"])
 
+# Per-line parse errors returned in upload/parse responses (the count is always complete)
+MAX_REPORTED_ERRORS = 100
+
+# Rows per page of the training data listing
+TRAINING_DATA_PAGE_SIZE = int(os.getenv("TRAINING_DATA_PAGE_SIZE", "100"))
+TRAINING_DATA_MAX_PAGE_SIZE = int(os.getenv("TRAINING_DATA_MAX_PAGE_SIZE", "1000"))
+
+# Results of the ranked search endpoint
+SEARCH_RESULTS = int(os.getenv("TRAINING_SEARCH_RESULTS", "20"))
+SEARCH_MAX_RESULTS = int(os.getenv("TRAINING_SEARCH_MAX_RESULTS", "100"))
+
+# Rows fetched per round trip by the NDJSON export
+EXPORT_BATCH_SIZE = 1000
+
+# Columns of the TrainingData response schema (the *_search columns are not sent)
+TRAINING_DATA_COLUMNS = (
+    TrainingData.id,
+    TrainingData.bot_id,
+    TrainingData.user_message,
+    TrainingData.bot_response,
+    TrainingData.intent,
+    TrainingData.created_at
+)
+
+def _commit_unique(db: Session):
+    """Commit, turning a duplicate (same intent and normalized text) into 409"""
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail="This bot already has the same training example for this intent"
+        )
+
+def _fold(term: str):
+    """Fold a search term the same way as the *_search columns (lowercase, no diacritics)"""
+    return func.lower(func.f_unaccent(term))
+
+
+def _contains(db: Session, column, search_column, term: str):
+    """
+    Accent- and case-insensitive substring filter
+
+    On PostgreSQL it matches the folded *_search column, which the trigram
+    GIN index serves; elsewhere (e.g. SQLite in dev) it falls back to ILIKE.
+    """
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    if db.get_bind().dialect.name != "postgresql":
+        return column.ilike(f"%{escaped}%", escape="\\")
+    return search_column.like(literal("%") + _fold(escaped) + literal("%"), escape="\\")
+
+
+def _filter_conditions(db: Session, user_message: str = None, bot_response: str = None, intent: str = None) -> list:
+    """WHERE conditions of the listing filters (empty values are ignored)"""
+    conditions = []
+    if user_message:
+        conditions.append(_contains(db, TrainingData.user_message, TrainingData.user_message_search, user_message))
+    if bot_response:
+        conditions.append(_contains(db, TrainingData.bot_response, TrainingData.bot_response_search, bot_response))
+    if intent:
+        conditions.append(TrainingData.intent == intent)
+    return conditions
+
+
+def _encode_cursor(sort_by: str, value, row_id: int) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([sort_by, value, row_id], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(cursor: str, sort_by: str):
+    """Sort value and id of the last row of the previous page"""
+    try:
+        cursor_sort_by, value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if cursor_sort_by != sort_by or not isinstance(row_id, int):
+            raise ValueError
+        if sort_by == 'created_at' and value is not None:
+            value = datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor for this sort order")
+    return value, row_id
+
+
+def _after_cursor(sort_field, value, row_id: int, ascending: bool):
+    """
+    Rows after (value, id) in ORDER BY sort_field, id
+
+    NULLs sort last ascending and first descending (PostgreSQL's default),
+    so each direction can walk the (bot_id, column, id) index either way.
+    """
+    if ascending:
+        if value is None:
+            return and_(sort_field.is_(None), TrainingData.id > row_id)
+        return or_(tuple_(sort_field, TrainingData.id) > tuple_(value, row_id), sort_field.is_(None))
+    if value is None:
+        return or_(and_(sort_field.is_(None), TrainingData.id < row_id), sort_field.isnot(None))
+    return tuple_(sort_field, TrainingData.id) < tuple_(value, row_id)
+
+
 @router.get("/", response_model=List[TrainingDataSchema])
 def get_training_data(
     bot_id: int,
+    request: Request,
     user_message: str = None,
     bot_response: str = None,
     intent: str = None,
     sort_by: str = "created_at",
     sort_order: str = "desc",
+    limit: int = TRAINING_DATA_PAGE_SIZE,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Get all training data for a bot with server-side filtering and sorting
+    Get one page of training data for a bot with server-side filtering and sorting
+    
+    Pages are keyset based: the X-Next-Cursor response header holds the cursor
+    for the next page and is absent on the last page. Only the listed columns
+    are selected and rows are serialized directly with orjson.
     
     Args:
         bot_id: Bot ID
@@ -35,33 +161,31 @@ def get_training_data(
         intent: Filter by specific intent
         sort_by: Field to sort by (user_message, bot_response, intent, created_at)
         sort_order: Sort order (asc or desc)
+        limit: Page size (at most TRAINING_DATA_MAX_PAGE_SIZE)
+        cursor: X-Next-Cursor of the previous page, with the same filters and sort
     """
     # Verify bot ownership
     bot = db.query(Bot).filter(
         Bot.id == bot_id,
-        Bot.user_id == current_user.id
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
     ).first()
     
     if not bot:
         raise HTTPException(status_code=404, detail="Bot not found")
     
-    # Build query
-    query = db.query(TrainingData).filter(TrainingData.bot_id == bot_id)
-    
-    # Apply search filters
-    if user_message:
-        user_message_filter = f"%{user_message.lower()}%"
-        query = query.filter(TrainingData.user_message.ilike(user_message_filter))
+    etag = make_etag(request, get_bot_version(db, bot_id, "data"))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
     
-    if bot_response:
-        bot_response_filter = f"%{bot_response.lower()}%"
-        query = query.filter(TrainingData.bot_response.ilike(bot_response_filter))
+    # Build query
+    query = db.query(*TRAINING_DATA_COLUMNS).filter(TrainingData.bot_id == bot_id)
     
-    # Apply intent filter
-    if intent:
-        query = query.filter(TrainingData.intent == intent)
+    # Apply search and intent filters
+    query = query.filter(*_filter_conditions(db, user_message, bot_response, intent))
     
-    # Apply sorting
+    # Apply sorting, with id as tie-breaker so every row has a unique position
     valid_sort_fields = {
         'user_message': TrainingData.user_message,
         'bot_response': TrainingData.bot_response,
@@ -69,16 +193,164 @@ def get_training_data(
         'created_at': TrainingData.created_at
     }
     
-    sort_field = valid_sort_fields.get(sort_by, TrainingData.created_at)
+    if sort_by not in valid_sort_fields:
+        sort_by = 'created_at'
+    sort_field = valid_sort_fields[sort_by]
+    ascending = sort_order.lower() == 'asc'
     
-    if sort_order.lower() == 'asc':
-        query = query.order_by(sort_field.asc())
+    if cursor:
+        value, row_id = _decode_cursor(cursor, sort_by)
+        query = query.filter(_after_cursor(sort_field, value, row_id, ascending))
+    
+    if ascending:
+        query = query.order_by(sort_field.asc().nullslast(), TrainingData.id.asc())
     else:
-        query = query.order_by(sort_field.desc())
+        query = query.order_by(sort_field.desc().nullsfirst(), TrainingData.id.desc())
+    
+    limit = max(1, min(limit, TRAINING_DATA_MAX_PAGE_SIZE))
+    training_data = query.limit(limit + 1).all()
     
-    training_data = query.all()
+    headers = etag_headers(etag)
+    if len(training_data) > limit:
+        training_data = training_data[:limit]
+        last = training_data[-1]
+        headers["X-Next-Cursor"] = _encode_cursor(sort_by, getattr(last, sort_by), last.id)
     
-    return training_data
+    return rows_response(training_data, headers=headers)
+
+@router.get("/search", response_model=List[TrainingDataSearchResult])
+def search_training_data(
+    bot_id: int,
+    request: Request,
+    response: Response,
+    q: str,
+    intent: str = None,
+    limit: int = SEARCH_RESULTS,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Search a bot's training data, best matches first
+    
+    Matches user messages and bot responses that contain the query or share
+    most of its words (trigram word similarity), ignoring case and Vietnamese
+    diacritics: "gia bao nhieu" finds "Giá bao nhiêu?".
+    
+    Args:
+        q: Search text
+        intent: Only search this intent
+        limit: Number of results (at most SEARCH_MAX_RESULTS)
+    """
+    # Verify bot ownership
+    bot = db.query(Bot).filter(
+        Bot.id == bot_id,
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
+    ).first()
+    
+    if not bot:
+        raise HTTPException(status_code=404, detail="Bot not found")
+    
+    etag = make_etag(request, get_bot_version(db, bot_id, "data"))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    
+    q = q.strip()
+    if not q:
+        raise HTTPException(status_code=400, detail="Search text is required")
+    limit = max(1, min(limit, SEARCH_MAX_RESULTS))
+    
+    if db.get_bind().dialect.name == "postgresql":
+        folded = _fold(q)
+        score = func.greatest(
+            func.word_similarity(folded, TrainingData.user_message_search),
+            func.word_similarity(folded, TrainingData.bot_response_search)
+        )
+        query = db.query(TrainingData, score.label("score")).filter(
+            TrainingData.bot_id == bot_id,
+            or_(
+                _contains(db, TrainingData.user_message, TrainingData.user_message_search, q),
+                _contains(db, TrainingData.bot_response, TrainingData.bot_response_search, q),
+                folded.op("<%")(TrainingData.user_message_search),
+                folded.op("<%")(TrainingData.bot_response_search)
+            )
+        )
+        order = (score.desc(), TrainingData.id.desc())
+    else:
+        # Substring match only outside PostgreSQL
+        query = db.query(TrainingData, literal(1.0).label("score")).filter(
+            TrainingData.bot_id == bot_id,
+            or_(
+                _contains(db, TrainingData.user_message, None, q),
+                _contains(db, TrainingData.bot_response, None, q)
+            )
+        )
+        order = (TrainingData.id.desc(),)
+    
+    if intent:
+        query = query.filter(TrainingData.intent == intent)
+    
+    response.headers.update(etag_headers(etag))
+    return [
+        TrainingDataSearchResult(
+            id=row.id,
+            bot_id=row.bot_id,
+            user_message=row.user_message,
+            bot_response=row.bot_response,
+            intent=row.intent,
+            created_at=row.created_at,
+            score=round(float(row_score), 4)
+        )
+        for row, row_score in query.order_by(*order).limit(limit).all()
+    ]
+
+@router.get("/stats", response_model=TrainingDataStats)
+def get_training_data_stats(
+    bot_id: int,
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Example and per-intent counts of a bot's training data
+    
+    Read from the rollup tables kept by the training_data triggers, so the
+    cost does not grow with the number of examples.
+    """
+    # Verify bot ownership
+    bot = db.query(Bot).filter(
+        Bot.id == bot_id,
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
+    ).first()
+    
+    if not bot:
+        raise HTTPException(status_code=404, detail="Bot not found")
+    
+    etag = make_etag(request, get_bot_version(db, bot_id, "data"))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    
+    stats = db.query(BotDatasetStats).filter(BotDatasetStats.bot_id == bot_id).first()
+    counts = db.query(BotIntentCount.intent, BotIntentCount.example_count).filter(
+        BotIntentCount.bot_id == bot_id
+    ).order_by(BotIntentCount.example_count.desc(), BotIntentCount.intent).all()
+    
+    response.headers.update(etag_headers(etag))
+    return TrainingDataStats(
+        bot_id=bot_id,
+        example_count=stats.example_count if stats else 0,
+        intent_count=stats.intent_count if stats else 0,
+        unlabeled_count=sum(row.example_count for row in counts if row.intent == ''),
+        intents=[
+            {"intent": row.intent, "count": row.example_count}
+            for row in counts if row.intent != ''
+        ],
+        updated_at=stats.updated_at if stats else None
+    )
 
 @router.post("/", response_model=TrainingDataSchema)
 def add_training_data(
@@ -91,7 +363,8 @@ def add_training_data(
     # Verify bot ownership
     bot = db.query(Bot).filter(
         Bot.id == bot_id,
-        Bot.user_id == current_user.id
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
     ).first()
     
     if not bot:
@@ -105,11 +378,201 @@ def add_training_data(
         intent=training_data.intent
     )
     db.add(db_data)
-    db.commit()
+    _commit_unique(db)
     db.refresh(db_data)
     
     return db_data
 
+@router.post("/bulk", response_model=dict)
+def bulk_add_training_data(
+    bot_id: int,
+    payload: TrainingDataBulkCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Add many training data items in one request (loaded with COPY)"""
+    # Verify bot ownership
+    bot = db.query(Bot).filter(
+        Bot.id == bot_id,
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
+    ).first()
+    
+    if not bot:
+        raise HTTPException(status_code=404, detail="Bot not found")
+    
+    if not payload.data:
+        raise HTTPException(status_code=400, detail="No training data provided")
+    
+    try:
+        added_count, skipped_count = bulk_insert_training_data(
+            db,
+            bot_id,
+            (
+                {
+                    "user_message": item.user_message,
+                    "bot_response": item.bot_response,
+                    "intent": item.intent
+                }
+                for item in payload.data
+            )
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Error saving training data: {str(e)}")
+    
+    return {
+        "message": "Training data added successfully",
+        "count": added_count,
+        "skipped_count": skipped_count
+    }
+
+@router.post("/bulk-delete", response_model=dict)
+def bulk_delete_training_data(
+    bot_id: int,
+    payload: TrainingDataBulkDelete,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Delete many training data items with one DELETE statement
+    
+    Rows are selected by ids, by the listing filters, or by both (rows must
+    match all given conditions).
+    """
+    # Verify bot ownership
+    bot = db.query(Bot).filter(
+        Bot.id == bot_id,
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
+    ).first()
+    
+    if not bot:
+        raise HTTPException(status_code=404, detail="Bot not found")
+    
+    conditions = []
+    if payload.ids:
+        conditions.append(TrainingData.id.in_(payload.ids))
+    if payload.filters:
+        conditions += _filter_conditions(
+            db,
+            payload.filters.user_message,
+            payload.filters.bot_response,
+            payload.filters.intent
+        )
+    if not conditions:
+        raise HTTPException(status_code=400, detail="Provide ids or at least one filter")
+    
+    deleted_count = db.query(TrainingData).filter(
+        TrainingData.bot_id == bot_id,
+        *conditions
+    ).delete(synchronize_session=False)
+    db.commit()
+    
+    return {"deleted_count": deleted_count}
+
+@router.post("/relabel", response_model=dict)
+def relabel_training_data(
+    bot_id: int,
+    payload: TrainingDataRelabel,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Re-label or merge intents with one UPDATE statement
+    
+    Every example of from_intents (optionally only the given ids) gets
+    to_intent. Examples that would become duplicates of one already in
+    to_intent, or of each other, are deleted first and reported as
+    merged_count.
+    """
+    # Verify bot ownership
+    bot = db.query(Bot).filter(
+        Bot.id == bot_id,
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
+    ).first()
+    
+    if not bot:
+        raise HTTPException(status_code=404, detail="Bot not found")
+    
+    # Intents are compared like the unique index does: unlabeled as ''
+    target = payload.to_intent or ''
+    sources = {intent or '' for intent in payload.from_intents} - {target}
+    if not sources:
+        raise HTTPException(status_code=400, detail="from_intents must contain an intent other than to_intent")
+    
+    intent_key = func.coalesce(TrainingData.intent, '')
+    conditions = [TrainingData.bot_id == bot_id, intent_key.in_(sources)]
+    if payload.ids:
+        conditions.append(TrainingData.id.in_(payload.ids))
+    
+    other = aliased(TrainingData)
+    other_key = func.coalesce(other.intent, '')
+    # Among moved rows with the same text, the oldest is kept
+    older_moved = [other_key.in_(sources), other.id < TrainingData.id]
+    if payload.ids:
+        older_moved.append(other.id.in_(payload.ids))
+    duplicate = exists().where(
+        other.bot_id == bot_id,
+        other.text_hash == TrainingData.text_hash,
+        or_(other_key == target, and_(*older_moved))
+    )
+    
+    merged_count = db.query(TrainingData).filter(*conditions, duplicate).delete(synchronize_session=False)
+    updated_count = db.query(TrainingData).filter(*conditions).update(
+        {TrainingData.intent: payload.to_intent or None},
+        synchronize_session=False
+    )
+    _commit_unique(db)
+    
+    return {"updated_count": updated_count, "merged_count": merged_count}
+
+@router.post("/replace", response_model=dict)
+def replace_training_data_text(
+    bot_id: int,
+    payload: TrainingDataReplace,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Find and replace text in bot responses (or user messages) with one UPDATE
+    
+    Matching is case-sensitive. Returns 409 and changes nothing if a
+    replacement would make two examples of an intent identical.
+    """
+    # Verify bot ownership
+    bot = db.query(Bot).filter(
+        Bot.id == bot_id,
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
+    ).first()
+    
+    if not bot:
+        raise HTTPException(status_code=404, detail="Bot not found")
+    
+    if not payload.find:
+        raise HTTPException(status_code=400, detail="Text to find is required")
+    
+    column = getattr(TrainingData, payload.field)
+    query = db.query(TrainingData).filter(
+        TrainingData.bot_id == bot_id,
+        column.contains(payload.find, autoescape=True)
+    )
+    if payload.intent:
+        query = query.filter(TrainingData.intent == payload.intent)
+    if payload.ids:
+        query = query.filter(TrainingData.id.in_(payload.ids))
+    
+    updated_count = query.update(
+        {column: func.replace(column, payload.find, payload.replace)},
+        synchronize_session=False
+    )
+    _commit_unique(db)
+    
+    return {"updated_count": updated_count}
+
 @router.put("/{data_id}", response_model=TrainingDataSchema)
 def update_training_data(
     bot_id: int,
@@ -122,7 +585,8 @@ def update_training_data(
     # Verify bot ownership
     bot = db.query(Bot).filter(
         Bot.id == bot_id,
-        Bot.user_id == current_user.id
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
     ).first()
     
     if not bot:
@@ -141,13 +605,13 @@ def update_training_data(
     db_data.bot_response = training_data.bot_response
     db_data.intent = training_data.intent
     
-    db.commit()
+    _commit_unique(db)
     db.refresh(db_data)
     
     return db_data
 
 @router.post("/parse", response_model=dict)
-async def parse_training_file(
+def parse_training_file(
     bot_id: int,
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
@@ -156,47 +620,77 @@ async def parse_training_file(
     """
     Parse training data file and return preview without saving
     Supported: JSON, CSV, YAML, TXT, Markdown
+    
+    Returns stats for the whole file and a sample of rows; when there are
+    more rows, next_token pages through them via GET /parse/page.
     """
     # Verify bot ownership
     bot = db.query(Bot).filter(
         Bot.id == bot_id,
-        Bot.user_id == current_user.id
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
     ).first()
     
     if not bot:
         raise HTTPException(status_code=404, detail="Bot not found")
     
-    # Read file
+    # Parse the spooled upload incrementally, keeping only stats and a sample in memory
+    errors = []
     try:
-        content = await file.read()
-        content_str = content.decode('utf-8')
+        preview = build_preview(bot_id, file.filename, file.file, errors=errors)
     except UnicodeDecodeError:
         raise HTTPException(status_code=400, detail="File must be UTF-8 encoded")
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error reading file: {str(e)}")
-    
-    # Parse file using format-specific parser
-    try:
-        parsed_data = TrainingDataParser.parse(file.filename, content_str)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error parsing file: {str(e)}")
     
-    if not parsed_data:
+    if not preview["count"]:
         raise HTTPException(
             status_code=400,
-            detail="No valid training data found in file"
+            detail=_no_data_detail(errors)
         )
     
     return {
         "message": "File parsed successfully",
-        "count": len(parsed_data),
-        "data": parsed_data
+        **preview,
+        "error_count": len(errors),
+        "errors": errors[:MAX_REPORTED_ERRORS]
+    }
+
+@router.get("/parse/page", response_model=dict)
+def get_parse_preview_page(
+    bot_id: int,
+    token: str,
+    limit: int = PREVIEW_SAMPLE_SIZE,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Next rows of a parse preview, starting at the page token"""
+    # Verify bot ownership
+    bot = db.query(Bot).filter(
+        Bot.id == bot_id,
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
+    ).first()
+    
+    if not bot:
+        raise HTTPException(status_code=404, detail="Bot not found")
+    
+    try:
+        rows, next_token = read_preview_page(bot_id, token, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Preview expired, please parse the file again")
+    
+    return {
+        "data": rows,
+        "next_token": next_token
     }
 
 @router.post("/upload", response_model=dict)
-async def upload_training_file(
+def upload_training_file(
     bot_id: int,
     file: UploadFile = File(...),
     use_intelligent_classification: bool = False,
@@ -207,72 +701,142 @@ async def upload_training_file(
     Upload training data from multiple formats
     Supported: JSON, CSV, YAML, TXT, Markdown
     
+    The file is parsed in chunks and each chunk is loaded with COPY as soon as
+    it is produced, so memory use does not grow with the file size. All chunks
+    are committed in one transaction.
+    
     Args:
         use_intelligent_classification: If True, use Rasa NLU to classify unknown intents
     """
     # Verify bot ownership
     bot = db.query(Bot).filter(
         Bot.id == bot_id,
-        Bot.user_id == current_user.id
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
     ).first()
     
     if not bot:
         raise HTTPException(status_code=404, detail="Bot not found")
     
-    # Read file
+    classifier = None
+    if use_intelligent_classification:
+        try:
+            classifier = HybridIntentClassifier(os.getenv("RASA_SERVER_URL", "http://localhost:5005"))
+            classifier.initialize(bot_id, custom_rules=load_intent_rules(db, bot_id))
+        except Exception as e:
+            # Log error but continue with original data
+            logging.warning(f"Intelligent classification failed: {str(e)}")
+            classifier = None
+    
+    parsed_count = 0
+    added_count = 0
+    skipped_count = 0
+    errors = []
     try:
-        content = await file.read()
-        content_str = content.decode('utf-8')
+        for chunk in TrainingDataParser.iter_parse(file.filename, file.file, errors=errors):
+            # Enhance with intelligent classification if requested
+            if classifier:
+                try:
+                    chunk = TrainingDataParser.enhance_with_intelligent_classification(
+                        chunk,
+                        bot_id,
+                        classifier=classifier
+                    )
+                except Exception as e:
+                    logging.warning(f"Intelligent classification failed: {str(e)}")
+            
+            parsed_count += len(chunk)
+            inserted, skipped = bulk_insert_training_data(db, bot_id, (
+                {
+                    "user_message": item["user"],
+                    "bot_response": item["bot"],
+                    "intent": item.get("intent")
+                }
+                for item in chunk
+            ))
+            added_count += inserted
+            skipped_count += skipped
     except UnicodeDecodeError:
+        db.rollback()
         raise HTTPException(status_code=400, detail="File must be UTF-8 encoded")
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error reading file: {str(e)}")
-    
-    # Parse file using format-specific parser
-    try:
-        parsed_data = TrainingDataParser.parse(file.filename, content_str)
     except ValueError as e:
+        db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
+        db.rollback()
         raise HTTPException(status_code=400, detail=f"Error parsing file: {str(e)}")
     
-    if not parsed_data:
+    if not parsed_count:
+        db.rollback()
         raise HTTPException(
             status_code=400,
-            detail="No valid training data found in file"
-        )
-    
-    # Enhance with intelligent classification if requested
-    if use_intelligent_classification:
-        try:
-            parsed_data = TrainingDataParser.enhance_with_intelligent_classification(
-                parsed_data, 
-                bot_id
-            )
-        except Exception as e:
-            # Log error but continue with original data
-            import logging
-            logging.warning(f"Intelligent classification failed: {str(e)}")
-    
-    # Add training data
-    added_count = 0
-    for item in parsed_data:
-        db_data = TrainingData(
-            bot_id=bot_id,
-            user_message=item["user"],
-            bot_response=item["bot"],
-            intent=item.get("intent")
+            detail=_no_data_detail(errors)
         )
-        db.add(db_data)
-        added_count += 1
     
     db.commit()
     
     return {
         "message": "Training data uploaded successfully",
-        "count": added_count
+        "count": added_count,
+        "skipped_count": skipped_count,
+        "error_count": len(errors),
+        "errors": errors[:MAX_REPORTED_ERRORS]
     }
 
+@router.get("/export")
+def export_training_data(
+    bot_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Export all training data of a bot as NDJSON (JSON Lines)
+    
+    Rows are streamed from a server-side cursor in the upload format
+    ({"user", "bot", "intent"} per line), so the file can be re-imported as-is.
+    """
+    # Verify bot ownership
+    bot = db.query(Bot).filter(
+        Bot.id == bot_id,
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
+    ).first()
+    
+    if not bot:
+        raise HTTPException(status_code=404, detail="Bot not found")
+    
+    return StreamingResponse(
+        _iter_training_data_ndjson(bot_id),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="bot_{bot_id}_training_data.jsonl"'}
+    )
+
+def _iter_training_data_ndjson(bot_id: int):
+    """Yield NDJSON batches from a server-side cursor on its own connection"""
+    query = (
+        select(TrainingData.user_message, TrainingData.bot_response, TrainingData.intent)
+        .where(TrainingData.bot_id == bot_id)
+        .order_by(TrainingData.id)
+    )
+    
+    # Streaming outlives the request handler - don't tie the cursor to the request session
+    with engine.connect() as conn:
+        result = conn.execution_options(yield_per=EXPORT_BATCH_SIZE).execute(query)
+        for rows in result.partitions():
+            yield b"".join(
+                orjson.dumps({"user": row.user_message, "bot": row.bot_response, "intent": row.intent}) + b"\n"
+                for row in rows
+            )
+
+def _no_data_detail(errors: List[dict]) -> str:
+    if errors:
+        first = errors[0]
+        return (
+            f"No valid training data found in file "
+            f"({len(errors)} invalid lines, first at line {first['line']}: {first['error']})"
+        )
+    return "No valid training data found in file"
+
 @router.delete("/{data_id}", status_code=204)
 def delete_training_data(
     bot_id: int,
@@ -284,7 +848,8 @@ def delete_training_data(
     # Verify bot ownership
     bot = db.query(Bot).filter(
         Bot.id == bot_id,
-        Bot.user_id == current_user.id
+        Bot.user_id == current_user.id,
+        Bot.deleted_at.is_(None)
     ).first()
     
     if not bot:
@@ -0,0 +1,384 @@
+"""
+Maintenance CLI - fleet retraining, model warm-up, pruning, message partitions and bot purges
+
+Usage:
+    python -m app.cli retrain --all --parallel 4
+    python -m app.cli retrain --bot-id 3 --bot-id 7 --profile fast
+    python -m app.cli retrain --all --resume
+    python -m app.cli warmup --bot-id 3
+    python -m app.cli prune-models --keep 1 --dry-run
+    python -m app.cli partitions
+    python -m app.cli purge-bots --retry-failed
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, List
+
+from sqlalchemy import text
+
+from app.database import SessionLocal
+from app.api.training_jobs import create_training_job, get_database_url, run_rasa_training
+from app.services.bot_purge import resume_purge_jobs
+from app.services.message_partitions import RETENTION_MODE, run_message_partition_maintenance
+from app.services.rasa_service import RasaService
+from app.services.training_cache import TrainingCache
+from app.services.training_profiles import get_profile
+from app.services.training_resources import TRAINING_MAX_CONCURRENT
+
+MODELS_DIR = os.getenv("MODELS_DIR", "/app/models")
+DEFAULT_STATE_FILE = os.path.join(MODELS_DIR, ".fleet_retrain_state.json")
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{hours:d}:{minutes:02d}:{seconds:02d}"
+
+
+def _load_state(path: str) -> Dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"finished": {}, "jobs": {}}
+
+
+def _save_state(path: str, state: Dict) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _select_bots(db, args) -> List[int]:
+    """Bots to retrain: all bots with training data, or the given ids"""
+    query = """
+        SELECT b.id FROM bots b
+        WHERE b.deleted_at IS NULL
+          AND EXISTS (SELECT 1 FROM training_data td WHERE td.bot_id = b.id)
+    """
+    params = {}
+    if not args.all:
+        query += " AND b.id = ANY(:bot_ids)"
+        params["bot_ids"] = args.bot_id
+    if args.user_id:
+        query += " AND b.user_id = :user_id"
+        params["user_id"] = args.user_id
+    query += " ORDER BY b.id"
+
+    return [row.id for row in db.execute(text(query), params).fetchall()]
+
+
+def _job_status(db, job_id: int) -> str:
+    row = db.execute(
+        text("SELECT status FROM training_jobs WHERE id = :job_id"),
+        {"job_id": job_id}
+    ).fetchone()
+    db.commit()
+    return row.status if row else "missing"
+
+
+def _stop_jobs(db, job_ids: List[int]) -> None:
+    """Close jobs of an interrupted run: not started -> cancelled, in flight -> failed"""
+    if not job_ids:
+        return
+    db.rollback()
+    db.execute(
+        text("""
+            UPDATE training_jobs
+            SET status = CASE WHEN status = 'pending' THEN 'cancelled' ELSE 'failed' END,
+                error_message = 'Interrupted fleet retrain', completed_at = NOW()
+            WHERE id = ANY(:job_ids) AND status IN ('pending', 'running')
+        """),
+        {"job_ids": job_ids}
+    )
+    db.commit()
+
+
+def cmd_retrain(args) -> int:
+    """Retrain many bots through the training job pipeline with a bounded process pool"""
+    if not args.all and not args.bot_id:
+        print("Specify --all or at least one --bot-id")
+        return 2
+
+    config = {}
+    if args.profile:
+        try:
+            get_profile(args.profile)
+        except ValueError as e:
+            print(e)
+            return 2
+        config["profile"] = args.profile
+
+    if args.parallel > TRAINING_MAX_CONCURRENT:
+        print(f"[WARN] --parallel {args.parallel} exceeds TRAINING_MAX_CONCURRENT={TRAINING_MAX_CONCURRENT}; "
+              f"extra workers will wait for a training slot")
+
+    state = _load_state(args.state_file) if args.resume else {"finished": {}, "jobs": {}}
+    state["options"] = {"profile": args.profile, "parallel": args.parallel}
+
+    db = SessionLocal()
+    try:
+        bot_ids = _select_bots(db, args)
+        # Only bots that completed are skipped on resume; failed ones are retried
+        pending = [bot_id for bot_id in bot_ids if state["finished"].get(str(bot_id)) != "completed"]
+        skipped = len(bot_ids) - len(pending)
+
+        print(f"Retraining {len(pending)} bot(s) with {args.parallel} worker(s)"
+              + (f", {skipped} already completed in a previous run" if skipped else ""))
+
+        # Jobs left pending/running by an interrupted run have no process any more
+        _stop_jobs(db, [state["jobs"][str(bot_id)] for bot_id in pending if str(bot_id) in state["jobs"]])
+
+        db_url = get_database_url()
+        started = time.monotonic()
+        done = 0
+        failed = 0
+        total = len(pending)
+        queue = iter(pending)
+        futures = {}
+        pool = ProcessPoolExecutor(max_workers=args.parallel)
+
+        def submit_next() -> bool:
+            """Create the next bot's job and submit it; False once no bot is left"""
+            nonlocal total
+            for bot_id in queue:
+                job = create_training_job(db, bot_id, config)
+                if not job:
+                    print(f"  bot {bot_id}: skipped, a training job is already active")
+                    total -= 1
+                    continue
+                state["jobs"][str(bot_id)] = job.id
+                _save_state(args.state_file, state)
+                futures[pool.submit(run_rasa_training, job.id, bot_id, db_url)] = (bot_id, job.id)
+                return True
+            return False
+
+        try:
+            # Jobs are created only as workers free up, so queued bots keep no active job
+            while len(futures) < args.parallel and submit_next():
+                pass
+
+            while futures:
+                finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    bot_id, job_id = futures.pop(future)
+                    try:
+                        future.result()
+                        status = _job_status(db, job_id)
+                    except Exception as e:
+                        status = f"error: {e}"
+
+                    done += 1
+                    if status != "completed":
+                        failed += 1
+                    state["finished"][str(bot_id)] = status
+                    _save_state(args.state_file, state)
+
+                    elapsed = time.monotonic() - started
+                    throughput = done / elapsed * 60 if elapsed else 0.0
+                    eta = (total - done) * elapsed / done
+                    print(f"[{done}/{total}] bot {bot_id} (job {job_id}): {status} | "
+                          f"{throughput:.2f} bots/min | elapsed {_format_duration(elapsed)} | "
+                          f"ETA {_format_duration(eta)}")
+                    submit_next()
+        except BaseException:
+            # Workers see the same Ctrl-C; don't wait for them or start anything queued
+            pool.shutdown(wait=False, cancel_futures=True)
+            _stop_jobs(db, [job_id for _, job_id in futures.values()])
+            raise
+        pool.shutdown()
+    except KeyboardInterrupt:
+        print(f"\nInterrupted - resume with: python -m app.cli retrain --resume --state-file {args.state_file} ...")
+        return 130
+    finally:
+        db.close()
+
+    print(f"Done: {done - failed} completed, {failed} failed")
+    if failed == 0 and not args.keep_state and os.path.exists(args.state_file):
+        os.remove(args.state_file)
+    return 1 if failed else 0
+
+
+def cmd_warmup(args) -> int:
+    """Load a bot's model into the Rasa server and run one parse so the first chat is fast"""
+    db = SessionLocal()
+    try:
+        query = "SELECT id, model_path FROM bots WHERE model_path IS NOT NULL AND deleted_at IS NULL"
+        params = {}
+        if args.bot_id:
+            query += " AND id = :bot_id"
+            params["bot_id"] = args.bot_id
+        else:
+            query += " ORDER BY updated_at DESC NULLS LAST, id DESC"
+        bot = db.execute(text(query + " LIMIT 1"), params).fetchone()
+    finally:
+        db.close()
+
+    if not bot:
+        print("No trained bot found")
+        return 1
+
+    rasa_service = RasaService()
+    started = time.monotonic()
+    result = rasa_service.load_model(bot.id, bot.model_path)
+    if result["status"] != "success":
+        print(f"Failed to load model for bot {bot.id}: {result.get('error_message')}")
+        return 1
+    loaded = time.monotonic()
+
+    rasa_service.chat(bot.id, args.message, sender_id="warmup")
+    print(f"Bot {bot.id} warm: model load {loaded - started:.2f}s, "
+          f"first message {time.monotonic() - loaded:.2f}s")
+    return 0
+
+
+def cmd_prune_models(args) -> int:
+    """Remove stale model archives and directories of deleted bots"""
+    db = SessionLocal()
+    try:
+        bots = {row.id: row.model_path for row in db.execute(text("SELECT id, model_path FROM bots")).fetchall()}
+    finally:
+        db.close()
+
+    removed_files = 0
+    freed_bytes = 0
+
+    def remove(path: str):
+        nonlocal removed_files, freed_bytes
+        size = os.path.getsize(path) if os.path.isfile(path) else sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _dirs, files in os.walk(path) for name in files
+        )
+        print(f"  {'would remove' if args.dry_run else 'removing'} {path} ({size / 1024 / 1024:.1f} MB)")
+        if not args.dry_run:
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.remove(path)
+        removed_files += 1
+        freed_bytes += size
+
+    for name in sorted(os.listdir(MODELS_DIR)):
+        bot_dir = os.path.join(MODELS_DIR, name)
+        if not name.startswith("bot_") or not os.path.isdir(bot_dir):
+            continue
+        try:
+            bot_id = int(name[len("bot_"):])
+        except ValueError:
+            continue
+
+        if bot_id not in bots:
+            remove(bot_dir)
+            continue
+
+        archives = []
+        for folder in (bot_dir, os.path.join(bot_dir, "models")):
+            if os.path.isdir(folder):
+                archives.extend(
+                    os.path.join(folder, f) for f in os.listdir(folder) if f.endswith(".tar.gz")
+                )
+        archives.sort(key=os.path.getmtime, reverse=True)
+
+        current = bots[bot_id]
+        keep = set(archives[:args.keep])
+        for archive in archives:
+            if archive not in keep and archive != current:
+                remove(archive)
+
+    print(f"{'Would free' if args.dry_run else 'Freed'} {freed_bytes / 1024 / 1024:.1f} MB "
+          f"in {removed_files} item(s)")
+
+    if args.evict_cache and not args.dry_run:
+        eviction = TrainingCache().evict(blocking=True)
+        print(f"Training cache: evicted {eviction['evicted']} entries ({eviction['freed_mb']} MB)")
+    return 0
+
+
+def cmd_partitions(args) -> int:
+    """Create upcoming conversation_messages partitions and apply the retention policy"""
+    result = run_message_partition_maintenance()
+    print(f"Created {result['created']} partition(s)")
+    for name in result["removed"]:
+        print(f"  {RETENTION_MODE} {name}")
+    return 0
+
+
+def cmd_purge_bots(args) -> int:
+    """Run bot purge jobs left pending or interrupted (and failed ones with --retry-failed)"""
+    statuses = ("pending", "running", "failed") if args.retry_failed else ("pending", "running")
+    job_ids = resume_purge_jobs(get_database_url(), statuses)
+    if not job_ids:
+        print("No purge jobs to run")
+        return 0
+
+    db = SessionLocal()
+    try:
+        rows = db.execute(
+            text("SELECT id, bot_id, status, rows_deleted, error_message FROM bot_purge_jobs WHERE id = ANY(:ids) ORDER BY id"),
+            {"ids": job_ids}
+        ).fetchall()
+    finally:
+        db.close()
+
+    failed = 0
+    for row in rows:
+        print(f"  job {row.id} (bot {row.bot_id}): {row.status}, {row.rows_deleted} rows deleted"
+              + (f" - {row.error_message}" if row.error_message else ""))
+        failed += row.status != "completed"
+    return 1 if failed else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Chatbot platform maintenance")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    retrain = subparsers.add_parser("retrain", help="Retrain bots through the training job pipeline")
+    retrain.add_argument("--all", action="store_true", help="Retrain every bot that has training data")
+    retrain.add_argument("--bot-id", type=int, action="append", default=[], help="Bot to retrain (repeatable)")
+    retrain.add_argument("--user-id", type=int, help="Only bots of this user")
+    retrain.add_argument("--parallel", type=int, default=1, help="Number of worker processes")
+    retrain.add_argument("--profile", help="Training profile (fast, balanced, thorough)")
+    retrain.add_argument("--resume", action="store_true", help="Skip bots completed by an interrupted run")
+    retrain.add_argument("--state-file", default=DEFAULT_STATE_FILE, help="Progress file used by --resume")
+    retrain.add_argument("--keep-state", action="store_true", help="Keep the state file after a clean run")
+    retrain.set_defaults(func=cmd_retrain)
+
+    warmup = subparsers.add_parser("warmup", help="Load a model into Rasa and send a first message")
+    warmup.add_argument("--bot-id", type=int, help="Bot to warm up (default: most recently updated)")
+    warmup.add_argument("--message", default="xin chào", help="Message sent to warm the pipeline")
+    warmup.set_defaults(func=cmd_warmup)
+
+    prune = subparsers.add_parser("prune-models", help="Delete old model archives and orphaned bot folders")
+    prune.add_argument("--keep", type=int, default=1, help="Newest archives to keep per bot")
+    prune.add_argument("--dry-run", action="store_true", help="Only print what would be removed")
+    prune.add_argument("--evict-cache", action="store_true", help="Also trim the shared training cache")
+    prune.set_defaults(func=cmd_prune_models)
+
+    partitions = subparsers.add_parser("partitions", help="Create monthly message partitions and apply retention")
+    partitions.set_defaults(func=cmd_partitions)
+
+    purge = subparsers.add_parser("purge-bots", help="Run purge jobs of deleted bots left behind by a restart")
+    purge.add_argument("--retry-failed", action="store_true", help="Also rerun failed purge jobs")
+    purge.set_defaults(func=cmd_purge_bots)
+
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if getattr(args, "parallel", 1) < 1:
+        print("--parallel must be at least 1")
+        return 2
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,20 @@
 """
 FastAPI main application
 """
+import os
+import asyncio
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from app.database import engine, Base
-from app.api import auth, bots, training, chat, conversations, training_jobs
+from app.services.bot_purge import resume_purge_jobs
+from app.services.message_partitions import run_partition_maintenance
+from app.api import auth, bots, training, chat, conversations, training_jobs, import_jobs, intent_rules
+
+# Responses smaller than this are sent uncompressed
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", "1024"))
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
@@ -12,9 +22,13 @@ Base.metadata.create_all(bind=engine)
 app = FastAPI(
     title="Chatbot Management Platform API",
     description="API for managing chatbots and training data",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
+# Compress large responses (listings, exports) for clients sending Accept-Encoding: gzip
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -22,6 +36,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include routers
@@ -29,11 +44,24 @@ app.add_middleware(
 # (more specific /bots/{bot_id}/train must come before generic /bots/{bot_id})
 app.include_router(auth.router, prefix="/api")
 app.include_router(training_jobs.router, prefix="/api")
+app.include_router(import_jobs.router, prefix="/api")
 app.include_router(bots.router, prefix="/api")
 app.include_router(training.router, prefix="/api")
+app.include_router(intent_rules.router, prefix="/api")
 app.include_router(chat.router, prefix="/api")
 app.include_router(conversations.router, prefix="/api")
 
+@app.on_event("startup")
+async def start_partition_maintenance():
+    # Monthly conversation_messages partitions and retention
+    app.state.partition_maintenance = asyncio.create_task(run_partition_maintenance())
+
+@app.on_event("startup")
+async def resume_bot_purges():
+    # Purge jobs interrupted by a restart lost their background task
+    if engine.dialect.name == "postgresql":
+        app.state.bot_purges = asyncio.create_task(run_in_threadpool(resume_purge_jobs, training_jobs.get_database_url()))
+
 @app.get("/")
 def root():
     return {
@@ -1,11 +1,20 @@
 """
 Database models
 """
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Float, Boolean, DateTime, ForeignKey, JSON, Computed
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from app.database import Base
 
+# Normalized form used to spot duplicate training examples (see migration 005)
+TRAINING_TEXT_HASH_SQL = (
+    "md5("
+    "btrim(regexp_replace(lower(normalize(user_message, NFC)), '\\s+', ' ', 'g'))"
+    " || chr(31) || "
+    "btrim(regexp_replace(lower(normalize(bot_response, NFC)), '\\s+', ' ', 'g'))"
+    ")"
+)
+
 class User(Base):
     __tablename__ = "users"
     
@@ -17,14 +26,14 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
-    bots = relationship("Bot", back_populates="user", cascade="all, delete-orphan")
+    bots = relationship("Bot", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class Bot(Base):
     __tablename__ = "bots"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     name = Column(String(255), nullable=False)
     description = Column(Text)
     language = Column(String(10), default='vi')
@@ -32,11 +41,13 @@ class Bot(Base):
     model_path = Column(String(500))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    deleted_at = Column(DateTime(timezone=True))  # set on delete; data removed by a BotPurgeJob
     
+    # Children are removed by the database (ON DELETE CASCADE) or a purge job, never loaded to be deleted
     user = relationship("User", back_populates="bots")
-    training_data = relationship("TrainingData", back_populates="bot", cascade="all, delete-orphan")
-    conversations = relationship("Conversation", back_populates="bot", cascade="all, delete-orphan")
-    training_sessions = relationship("TrainingSession", back_populates="bot", cascade="all, delete-orphan")
+    training_data = relationship("TrainingData", back_populates="bot", cascade="all, delete-orphan", passive_deletes=True)
+    conversations = relationship("Conversation", back_populates="bot", cascade="all, delete-orphan", passive_deletes=True)
+    training_sessions = relationship("TrainingSession", back_populates="bot", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class TrainingData(Base):
@@ -47,6 +58,11 @@ class TrainingData(Base):
     user_message = Column(Text, nullable=False)
     bot_response = Column(Text, nullable=False)
     intent = Column(String(100))
+    # md5 of the NFC, lowercased, whitespace-collapsed Q&A pair; unique per (bot_id, intent)
+    text_hash = Column(String(32), Computed(TRAINING_TEXT_HASH_SQL, persisted=True))
+    # Lowercased, unaccented copies for trigram search (see migration 007); not loaded by default
+    user_message_search = deferred(Column(Text, Computed("lower(f_unaccent(user_message))", persisted=True)))
+    bot_response_search = deferred(Column(Text, Computed("lower(f_unaccent(bot_response))", persisted=True)))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     bot = relationship("Bot", back_populates="training_data")
@@ -61,12 +77,16 @@ class Conversation(Base):
     message_count = Column(Integer, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     ended_at = Column(DateTime(timezone=True))
+    # Maintained by the conversation_messages insert trigger (see migration 010)
+    first_user_message = Column(Text)
+    last_message_at = Column(DateTime(timezone=True))
     
     bot = relationship("Bot", back_populates="conversations")
-    messages = relationship("ConversationMessage", back_populates="conversation", cascade="all, delete-orphan")
+    messages = relationship("ConversationMessage", back_populates="conversation", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class ConversationMessage(Base):
+    # Partitioned by month on timestamp; the table's primary key is (id, timestamp) (see migration 012)
     __tablename__ = "conversation_messages"
     
     id = Column(Integer, primary_key=True, index=True)
@@ -75,7 +95,7 @@ class ConversationMessage(Base):
     message = Column(Text, nullable=False)
     intent = Column(String(100))
     confidence = Column(Float)
-    timestamp = Column(DateTime(timezone=True), server_default=func.now())
+    timestamp = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     extra_data = Column(JSON)  # Changed from 'metadata' to 'extra_data'
     
     conversation = relationship("Conversation", back_populates="messages")
@@ -113,7 +133,7 @@ class TrainingJob(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     bot = relationship("Bot")
-    logs = relationship("TrainingLog", back_populates="training_job", cascade="all, delete-orphan")
+    logs = relationship("TrainingLog", back_populates="training_job", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class TrainingLog(Base):
@@ -127,3 +147,92 @@ class TrainingLog(Base):
     source = Column(String(50))  # stdout, stderr, rasa, custom
     
     training_job = relationship("TrainingJob", back_populates="logs")
+
+
+class ImportJob(Base):
+    __tablename__ = "import_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    bot_id = Column(Integer, ForeignKey("bots.id", ondelete="CASCADE"), nullable=False)
+    status = Column(String(20), default='pending')  # pending, running, completed, failed, cancelled
+    progress = Column(Integer, default=0)  # 0-100, share of the file read
+    filename = Column(String(255))
+    file_path = Column(String(500))  # spooled upload, removed when the job ends
+    file_size = Column(BigInteger)
+    options = Column(JSON)  # import options (use_intelligent_classification)
+    rows_parsed = Column(Integer, nullable=False, default=0)
+    rows_classified = Column(Integer, nullable=False, default=0)
+    rows_inserted = Column(Integer, nullable=False, default=0)
+    rows_skipped = Column(Integer, nullable=False, default=0)  # duplicates of stored rows
+    error_count = Column(Integer, nullable=False, default=0)
+    errors = Column(JSON)  # first per-line parse errors
+    error_message = Column(Text)
+    started_at = Column(DateTime(timezone=True))
+    completed_at = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    bot = relationship("Bot")
+
+
+class BotPurgeJob(Base):
+    __tablename__ = "bot_purge_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    bot_id = Column(Integer, nullable=False)  # no foreign key: the bot row is deleted last
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    status = Column(String(20), nullable=False, default='pending')  # pending, running, completed, failed
+    progress = Column(Integer, nullable=False, default=0)  # 0-100, share of rows_total deleted
+    current_table = Column(String(50))
+    rows_total = Column(BigInteger, nullable=False, default=0)
+    rows_deleted = Column(BigInteger, nullable=False, default=0)
+    error_message = Column(Text)
+    started_at = Column(DateTime(timezone=True))
+    completed_at = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
+class IntentRule(Base):
+    __tablename__ = "intent_rules"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    bot_id = Column(Integer, ForeignKey("bots.id", ondelete="CASCADE"), nullable=False)
+    pattern = Column(Text, nullable=False)  # case-insensitive regex or a|b|c keywords
+    intent = Column(String(100), nullable=False)
+    priority = Column(Integer, nullable=False, default=0)  # lower is checked first
+    is_active = Column(Boolean, nullable=False, default=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    bot = relationship("Bot")
+
+
+class BotDatasetStats(Base):
+    __tablename__ = "bot_dataset_stats"
+    
+    # Maintained by the training_data statement triggers (see migration 008)
+    bot_id = Column(Integer, ForeignKey("bots.id", ondelete="CASCADE"), primary_key=True)
+    example_count = Column(BigInteger, nullable=False, default=0)
+    intent_count = Column(Integer, nullable=False, default=0)  # labeled intents only
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class BotIntentCount(Base):
+    __tablename__ = "bot_intent_counts"
+    
+    # Maintained by the training_data statement triggers (see migration 008)
+    bot_id = Column(Integer, ForeignKey("bots.id", ondelete="CASCADE"), primary_key=True)
+    intent = Column(String(100), primary_key=True)  # '' for examples without intent
+    example_count = Column(BigInteger, nullable=False, default=0)
+
+
+class BotVersion(Base):
+    __tablename__ = "bot_versions"
+    
+    # Change counters bumped by triggers on each write (see migration 009), used for ETags
+    bot_id = Column(Integer, ForeignKey("bots.id", ondelete="CASCADE"), primary_key=True)
+    bot_version = Column(BigInteger, nullable=False, default=0)  # the bot row itself
+    data_version = Column(BigInteger, nullable=False, default=0)  # training_data
+    conversation_version = Column(BigInteger, nullable=False, default=0)  # conversations and messages
+    job_version = Column(BigInteger, nullable=False, default=0)  # training/import jobs and logs
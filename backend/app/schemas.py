@@ -1,8 +1,8 @@
 """
 Pydantic schemas for request/response validation
 """
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, EmailStr
+from typing import Optional, List, Literal
 from datetime import datetime
 
 # User schemas
@@ -22,8 +22,7 @@ class User(UserBase):
     plan: str
     created_at: datetime
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class Token(BaseModel):
     access_token: str
@@ -51,8 +50,7 @@ class Bot(BotBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True, protected_namespaces=())
 
 # Training data schemas
 class TrainingDataItem(BaseModel):
@@ -68,13 +66,41 @@ class TrainingDataBulkCreate(BaseModel):
     """Schema for bulk creating training data items"""
     data: List[TrainingDataItem]
 
+class TrainingDataFilter(BaseModel):
+    """Same filters as the training data listing"""
+    user_message: Optional[str] = None
+    bot_response: Optional[str] = None
+    intent: Optional[str] = None
+
+class TrainingDataBulkDelete(BaseModel):
+    """Rows to delete: the given ids, the rows matching filters, or both"""
+    ids: Optional[List[int]] = None
+    filters: Optional[TrainingDataFilter] = None
+
+class TrainingDataRelabel(BaseModel):
+    """Move every example of from_intents (None = unlabeled) to to_intent"""
+    from_intents: List[Optional[str]]
+    to_intent: Optional[str] = None
+    ids: Optional[List[int]] = None  # only these rows
+
+class TrainingDataReplace(BaseModel):
+    """Replace text (case-sensitive) in one field of matching rows"""
+    find: str
+    replace: str
+    field: Literal['bot_response', 'user_message'] = 'bot_response'
+    intent: Optional[str] = None
+    ids: Optional[List[int]] = None  # only these rows
+
 class TrainingData(TrainingDataItem):
     id: int
     bot_id: int
     created_at: datetime
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+class TrainingDataSearchResult(TrainingData):
+    """Training data item with its search relevance (0-1)"""
+    score: float
 
 # Chat schemas
 class ChatMessage(BaseModel):
@@ -98,8 +124,7 @@ class TrainingSession(BaseModel):
     started_at: datetime
     completed_at: Optional[datetime] = None
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Conversation schemas
 class ConversationMessageBase(BaseModel):
@@ -114,8 +139,7 @@ class ConversationMessage(ConversationMessageBase):
     timestamp: datetime
     extra_data: Optional[dict] = None
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class ConversationBase(BaseModel):
     session_id: str
@@ -130,14 +154,13 @@ class Conversation(ConversationBase):
     created_at: datetime
     ended_at: Optional[datetime] = None
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class ConversationWithMessages(Conversation):
-    messages: List[ConversationMessage] = []
+    messages: List[ConversationMessage] = []  # latest page, oldest first
+    next_cursor: Optional[str] = None  # older messages: GET /conversations/{id}/messages?order=desc&cursor=
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class ConversationHistory(BaseModel):
     conversation_id: int
@@ -146,6 +169,7 @@ class ConversationHistory(BaseModel):
     started_at: datetime
     ended_at: Optional[datetime] = None
     preview: Optional[str] = None  # First user message
+    last_message_at: Optional[datetime] = None
 
 # Training job schemas
 class TrainingJobBase(BaseModel):
@@ -158,6 +182,8 @@ class TrainingJobCreate(TrainingJobBase):
 
 
 class TrainingJobUpdate(BaseModel):
+    model_config = ConfigDict(protected_namespaces=())
+    
     status: Optional[str] = None
     progress: Optional[int] = None
     model_path: Optional[str] = None
@@ -179,8 +205,7 @@ class TrainingJobResponse(TrainingJobBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True, protected_namespaces=())
 
 
 # Training log schemas
@@ -200,13 +225,96 @@ class TrainingLogResponse(TrainingLogBase):
     training_job_id: int
     timestamp: datetime
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class TrainingJobWithLogs(TrainingJobResponse):
     """Schema for training job including logs"""
     logs: List[TrainingLogResponse] = []
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Import job schemas
+class ImportJobResponse(BaseModel):
+    """Schema for background training-data import job"""
+    id: int
+    bot_id: int
+    status: str  # pending, running, completed, failed, cancelled
+    progress: int  # 0-100, share of the file read
+    filename: Optional[str] = None
+    file_size: Optional[int] = None
+    options: Optional[dict] = None
+    rows_parsed: int
+    rows_classified: int
+    rows_inserted: int
+    rows_skipped: int  # duplicates of rows already stored
+    error_count: int
+    errors: Optional[List[dict]] = None
+    error_message: Optional[str] = None
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BotPurgeJobResponse(BaseModel):
+    """Schema for background removal of a deleted bot's data"""
+    id: int
+    bot_id: int
+    status: str  # pending, running, completed, failed
+    progress: int  # 0-100, share of rows_total deleted
+    current_table: Optional[str] = None
+    rows_total: int
+    rows_deleted: int
+    error_message: Optional[str] = None
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    
+    model_config = ConfigDict(from_attributes=True)
+
+# Intent rule schemas
+class IntentRuleBase(BaseModel):
+    pattern: str
+    intent: str
+    priority: int = 0
+    is_active: bool = True
+
+class IntentRuleCreate(IntentRuleBase):
+    pass
+
+class IntentRuleUpdate(BaseModel):
+    pattern: Optional[str] = None
+    intent: Optional[str] = None
+    priority: Optional[int] = None
+    is_active: Optional[bool] = None
+
+class IntentRule(IntentRuleBase):
+    id: int
+    bot_id: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    
+    model_config = ConfigDict(from_attributes=True)
+
+class IntentClassifyRequest(BaseModel):
+    """Messages to run through the bot's rules (custom rules, then built-in)"""
+    messages: List[str]
+
+# Training data stats schemas
+class IntentCount(BaseModel):
+    intent: str
+    count: int
+
+class TrainingDataStats(BaseModel):
+    """Per-bot totals kept up to date by database triggers"""
+    bot_id: int
+    example_count: int
+    intent_count: int  # labeled intents only
+    unlabeled_count: int  # examples without intent
+    intents: List[IntentCount]  # most examples first
+    updated_at: Optional[datetime] = None
@@ -0,0 +1,226 @@
+"""
+Background purge of deleted bots
+
+Deleting a bot only sets bots.deleted_at (the API and CLI ignore such bots) and
+queues a bot_purge_jobs row. The job deletes the bot's rows table by table in
+batches of PURGE_BATCH_SIZE, one short transaction per batch, recording
+progress on the job. Then it removes the bot's model directory and finally the
+bot row itself, which cascades to the per-bot counters.
+
+Jobs resume where they stopped: a batch only selects rows that still exist, so
+a job interrupted by a restart can simply run again (see resume_purge_jobs).
+"""
+import os
+import shutil
+from typing import Callable, Dict, Iterator, List
+
+MODELS_DIR = os.getenv("MODELS_DIR", "/app/models")
+PURGE_BATCH_SIZE = int(os.getenv("PURGE_BATCH_SIZE", "5000"))
+
+# (table, SQL selecting the keys of the bot's rows, key columns); children before parents
+PURGE_STEPS = [
+    ("conversation_messages",
+     "SELECT m.id, m.timestamp FROM conversation_messages m "
+     "JOIN conversations c ON c.id = m.conversation_id WHERE c.bot_id = %(bot_id)s",
+     "id, timestamp"),
+    ("conversations", "SELECT id FROM conversations WHERE bot_id = %(bot_id)s", "id"),
+    ("training_logs",
+     "SELECT l.id FROM training_logs l "
+     "JOIN training_jobs j ON j.id = l.training_job_id WHERE j.bot_id = %(bot_id)s",
+     "id"),
+    ("training_jobs", "SELECT id FROM training_jobs WHERE bot_id = %(bot_id)s", "id"),
+    ("import_jobs", "SELECT id FROM import_jobs WHERE bot_id = %(bot_id)s", "id"),
+    ("training_data", "SELECT id FROM training_data WHERE bot_id = %(bot_id)s", "id"),
+    ("training_sessions", "SELECT id FROM training_sessions WHERE bot_id = %(bot_id)s", "id"),
+    ("intent_rules", "SELECT id FROM intent_rules WHERE bot_id = %(bot_id)s", "id"),
+]
+
+
+# Keys of one conversation's messages (deleted before the conversation row, see delete_in_batches)
+CONVERSATION_MESSAGE_KEYS = (
+    "SELECT id, timestamp FROM conversation_messages WHERE conversation_id = %(conversation_id)s"
+)
+
+
+def delete_in_batches(
+    execute: Callable[[str, Dict], int],
+    commit: Callable[[], None],
+    table: str,
+    select_keys: str,
+    key_columns: str,
+    params: Dict
+) -> Iterator[int]:
+    """
+    Delete the rows selected by select_keys, PURGE_BATCH_SIZE per transaction
+
+    execute runs a statement with pyformat params and returns its rowcount.
+    Yields the rows deleted by each batch before committing it, so the caller
+    can record progress in the same transaction.
+    """
+    while True:
+        deleted = execute(
+            f"DELETE FROM {table} WHERE ({key_columns}) IN ({select_keys} LIMIT %(batch)s)",
+            {**params, "batch": PURGE_BATCH_SIZE}
+        )
+        yield deleted
+        commit()
+        if deleted < PURGE_BATCH_SIZE:
+            break
+
+
+def _count_rows(cursor, bot_id: int) -> int:
+    """Rows left to delete; messages and examples come from their counters instead of a scan"""
+    cursor.execute(
+        """
+        SELECT
+            (SELECT COALESCE(sum(message_count), 0) FROM conversations WHERE bot_id = %(bot_id)s)
+          + (SELECT count(*) FROM conversations WHERE bot_id = %(bot_id)s)
+          + (SELECT count(*) FROM training_logs l JOIN training_jobs j ON j.id = l.training_job_id
+             WHERE j.bot_id = %(bot_id)s)
+          + (SELECT count(*) FROM training_jobs WHERE bot_id = %(bot_id)s)
+          + (SELECT count(*) FROM import_jobs WHERE bot_id = %(bot_id)s)
+          + (SELECT COALESCE(max(example_count), 0) FROM bot_dataset_stats WHERE bot_id = %(bot_id)s)
+          + (SELECT count(*) FROM training_sessions WHERE bot_id = %(bot_id)s)
+          + (SELECT count(*) FROM intent_rules WHERE bot_id = %(bot_id)s)
+        """,
+        {"bot_id": bot_id}
+    )
+    return cursor.fetchone()[0]
+
+
+def run_bot_purge(job_id: int, db_connection_string: str):
+    """
+    Background task deleting a soft-deleted bot's data in batches
+
+    Takes a session advisory lock on the job, so a job resumed by a second
+    worker while it is still running is skipped.
+    """
+    conn = None
+    try:
+        # Import psycopg2 for direct DB connection in background task
+        import psycopg2
+
+        conn = psycopg2.connect(db_connection_string)
+        cursor = conn.cursor()
+
+        def execute(sql: str, params: Dict) -> int:
+            cursor.execute(sql, params)
+            return cursor.rowcount
+
+        cursor.execute("SELECT pg_try_advisory_lock(hashtext('bot_purge_jobs'), %s)", (job_id,))
+        if not cursor.fetchone()[0]:
+            conn.commit()
+            return
+
+        cursor.execute(
+            """
+            SELECT j.status, j.bot_id, j.rows_deleted, b.deleted_at IS NOT NULL OR b.id IS NULL
+            FROM bot_purge_jobs j
+            LEFT JOIN bots b ON b.id = j.bot_id
+            WHERE j.id = %s
+            """,
+            (job_id,)
+        )
+        job = cursor.fetchone()
+        if not job or job[0] not in ('pending', 'running') or not job[3]:
+            conn.commit()
+            return
+        bot_id, rows_deleted = job[1], job[2]
+
+        rows_total = rows_deleted + _count_rows(cursor, bot_id)
+        cursor.execute(
+            """
+            UPDATE bot_purge_jobs
+            SET status = 'running', rows_total = %s, started_at = COALESCE(started_at, NOW())
+            WHERE id = %s
+            """,
+            (rows_total, job_id)
+        )
+        conn.commit()
+
+        for table, select_keys, key_columns in PURGE_STEPS:
+            cursor.execute("UPDATE bot_purge_jobs SET current_table = %s WHERE id = %s", (table, job_id))
+            conn.commit()
+
+            batches = delete_in_batches(
+                execute, conn.commit, table, select_keys, key_columns, {"bot_id": bot_id}
+            )
+            for deleted in batches:
+                rows_deleted += deleted
+                progress = min(99, int(rows_deleted * 100 / rows_total)) if rows_total else 99
+                cursor.execute(
+                    "UPDATE bot_purge_jobs SET rows_deleted = %s, progress = %s WHERE id = %s",
+                    (rows_deleted, progress, job_id)
+                )
+
+        cursor.execute("UPDATE bot_purge_jobs SET current_table = 'model_dir' WHERE id = %s", (job_id,))
+        conn.commit()
+        shutil.rmtree(os.path.join(MODELS_DIR, f"bot_{bot_id}"), ignore_errors=True)
+
+        # Remaining per-bot rows (versions, dataset stats) go with the bot through ON DELETE CASCADE
+        cursor.execute("DELETE FROM bots WHERE id = %s AND deleted_at IS NOT NULL", (bot_id,))
+        cursor.execute(
+            """
+            UPDATE bot_purge_jobs
+            SET status = 'completed', progress = 100, current_table = NULL, completed_at = NOW()
+            WHERE id = %s
+            """,
+            (job_id,)
+        )
+        conn.commit()
+        print(f"[INFO] Purge job {job_id}: bot {bot_id} removed ({rows_deleted} rows)")
+
+    except Exception as e:
+        print(f"[ERROR] Purge job {job_id} failed: {e}")
+        if conn:
+            try:
+                conn.rollback()
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    UPDATE bot_purge_jobs
+                    SET status = 'failed', error_message = %s, completed_at = NOW()
+                    WHERE id = %s
+                    """,
+                    (str(e), job_id)
+                )
+                conn.commit()
+            except Exception:
+                pass
+    finally:
+        if conn:
+            conn.close()
+
+
+def resume_purge_jobs(db_connection_string: str, statuses=("pending", "running")) -> List[int]:
+    """
+    Run purge jobs left behind by a restart (or failed ones, when asked)
+
+    Returns:
+        ids of the jobs that were run
+    """
+    import psycopg2
+
+    conn = psycopg2.connect(db_connection_string)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT id FROM bot_purge_jobs WHERE status = ANY(%s) ORDER BY id",
+            (list(statuses),)
+        )
+        job_ids = [row[0] for row in cursor.fetchall()]
+        if "failed" in statuses and job_ids:
+            cursor.execute(
+                """
+                UPDATE bot_purge_jobs SET status = 'pending', error_message = NULL, completed_at = NULL
+                WHERE id = ANY(%s) AND status = 'failed'
+                """,
+                (job_ids,)
+            )
+        conn.commit()
+    finally:
+        conn.close()
+
+    for job_id in job_ids:
+        run_bot_purge(job_id, db_connection_string)
+    return job_ids
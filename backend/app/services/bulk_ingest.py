@@ -0,0 +1,144 @@
+"""
+Bulk ingestion of training data - loads rows into training_data with
+PostgreSQL COPY in batches instead of one ORM object per row
+
+Rows are COPYed into a temporary staging table and moved over with
+INSERT ... ON CONFLICT DO NOTHING, so rows already stored for the bot
+(same intent and normalized text, see training_data.text_hash) are skipped.
+"""
+import io
+import os
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models import TrainingData
+
+BULK_INGEST_BATCH_SIZE = int(os.getenv("BULK_INGEST_BATCH_SIZE", "5000"))
+
+STAGING_TABLE = "training_data_staging"
+
+CREATE_STAGING_SQL = f"""
+    CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (
+        bot_id INTEGER,
+        user_message TEXT,
+        bot_response TEXT,
+        intent VARCHAR(100)
+    ) ON COMMIT DELETE ROWS
+"""
+
+COPY_SQL = (
+    f"COPY {STAGING_TABLE} (bot_id, user_message, bot_response, intent) "
+    "FROM STDIN WITH (FORMAT csv)"
+)
+
+MERGE_SQL = f"""
+    INSERT INTO training_data (bot_id, user_message, bot_response, intent)
+    SELECT bot_id, user_message, bot_response, intent FROM {STAGING_TABLE}
+    ON CONFLICT DO NOTHING
+"""
+
+
+def _batches(rows: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _csv_field(value) -> str:
+    """
+    Encode one COPY csv field
+
+    NULL is an unquoted empty field, so every string is quoted to keep
+    empty strings distinct from NULL.
+    """
+    if value is None:
+        return ""
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _copy_batch(cursor, bot_id: int, batch: List[Dict]) -> int:
+    """COPY one batch into the staging table and merge it, returning rows inserted"""
+    buffer = io.StringIO()
+    for row in batch:
+        buffer.write(
+            f"{int(bot_id)},{_csv_field(row['user_message'])},"
+            f"{_csv_field(row['bot_response'])},{_csv_field(row.get('intent'))}\n"
+        )
+    buffer.seek(0)
+    cursor.copy_expert(COPY_SQL, buffer)
+    cursor.execute(MERGE_SQL)
+    inserted = cursor.rowcount
+    cursor.execute(f"TRUNCATE {STAGING_TABLE}")
+    return inserted
+
+
+def bulk_insert_training_data(
+    db: Session,
+    bot_id: int,
+    rows: Iterable[Dict],
+    batch_size: int = BULK_INGEST_BATCH_SIZE
+) -> Tuple[int, int]:
+    """
+    Insert training data rows in batches, skipping duplicates
+
+    Runs inside the session's transaction; the caller commits or rolls back.
+
+    Args:
+        db: Database session
+        bot_id: Bot the rows belong to
+        rows: Dicts with user_message, bot_response and optional intent
+        batch_size: Rows sent per COPY
+
+    Returns:
+        (inserted, skipped) row counts
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        # COPY is PostgreSQL only - plain multi-row insert elsewhere (e.g. SQLite in dev)
+        count = 0
+        for batch in _batches(rows, batch_size):
+            db.execute(insert(TrainingData), [
+                {
+                    "bot_id": bot_id,
+                    "user_message": row["user_message"],
+                    "bot_response": row["bot_response"],
+                    "intent": row.get("intent")
+                }
+                for row in batch
+            ])
+            count += len(batch)
+        return count, 0
+
+    # Raw psycopg2 cursor on the session's own connection and transaction
+    cursor = db.connection().connection.cursor()
+    try:
+        return copy_training_data(cursor, bot_id, rows, batch_size)
+    finally:
+        cursor.close()
+
+
+def copy_training_data(
+    cursor,
+    bot_id: int,
+    rows: Iterable[Dict],
+    batch_size: int = BULK_INGEST_BATCH_SIZE
+) -> Tuple[int, int]:
+    """
+    COPY rows through a psycopg2 cursor (background tasks without a Session)
+
+    Returns:
+        (inserted, skipped) row counts
+    """
+    cursor.execute(CREATE_STAGING_SQL)
+    inserted = skipped = 0
+    for batch in _batches(rows, batch_size):
+        batch_inserted = _copy_batch(cursor, bot_id, batch)
+        inserted += batch_inserted
+        skipped += len(batch) - batch_inserted
+    return inserted, skipped
@@ -0,0 +1,78 @@
+"""
+ETags and conditional GET for bot resources
+
+Every bot has change counters in bot_versions (bumped by triggers on writes,
+see migrations 009 and 014). An ETag is derived from the counter that covers a
+resource plus the request path and query string, so a matching If-None-Match
+can be answered with 304 after a primary-key lookup, before the endpoint
+runs its query or serializes anything.
+"""
+import hashlib
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models import Bot, BotVersion, Conversation, TrainingLog
+
+# Resource kind -> bot_versions column
+VERSION_COLUMNS = {
+    "bot": BotVersion.bot_version,
+    "data": BotVersion.data_version,
+    "conversations": BotVersion.conversation_version,
+    "jobs": BotVersion.job_version,
+}
+
+
+def get_bot_version(db: Session, bot_id: int, kind: str) -> int:
+    """Current counter of one resource kind of a bot (0 before its first write)"""
+    version = db.query(VERSION_COLUMNS[kind]).filter(BotVersion.bot_id == bot_id).scalar()
+    return version or 0
+
+
+def get_user_bots_version(db: Session, user_id: int) -> str:
+    """Fingerprint of a user's bot list: ids and bot row counters"""
+    rows = db.query(Bot.id, BotVersion.bot_version).outerjoin(
+        BotVersion, BotVersion.bot_id == Bot.id
+    ).filter(Bot.user_id == user_id, Bot.deleted_at.is_(None)).order_by(Bot.id).all()
+    return ",".join(f"{row.id}:{row.bot_version or 0}" for row in rows)
+
+
+def get_conversations_activity(db: Session, bot_id: int) -> str:
+    """
+    Latest message time over a bot's conversations
+
+    Message inserts only touch their conversation row (no bot version bump,
+    see migration 014), so conversation ETags add this to the version.
+    """
+    return str(db.query(func.max(Conversation.last_message_at)).filter(Conversation.bot_id == bot_id).scalar())
+
+
+def get_job_logs_version(db: Session, job_id: int) -> int:
+    """Id of a training job's latest log line (log inserts do not bump job_version)"""
+    return db.query(func.max(TrainingLog.id)).filter(TrainingLog.training_job_id == job_id).scalar() or 0
+
+
+def make_etag(request: Request, *parts: Any) -> str:
+    """Strong ETag for this URL (path and query) at the given versions"""
+    key = "|".join([request.url.path, str(request.url.query), *(str(part) for part in parts)])
+    return '"' + hashlib.md5(key.encode("utf-8")).hexdigest() + '"'
+
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    """Headers for a response carrying an ETag; browsers revalidate it on every use"""
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """304 response if If-None-Match matches etag, otherwise None"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    # If-None-Match uses weak comparison: W/"x" matches "x"
+    candidates = {value.strip().removeprefix("W/") for value in header.split(",")}
+    if "*" in candidates or etag in candidates:
+        return Response(status_code=304, headers=etag_headers(etag))
+    return None
@@ -0,0 +1,79 @@
+"""
+Monthly partitions of conversation_messages
+
+conversation_messages is range-partitioned by timestamp, one partition per UTC
+month (see migration 012). Maintenance creates the coming months ahead of time
+and applies the retention policy by dropping (or detaching, for archiving)
+whole months, so old history never goes through DELETE.
+
+It runs when the API starts and then every
+CONVERSATION_PARTITION_MAINTENANCE_INTERVAL seconds; the SQL functions take an
+advisory lock, so several workers may run it. For cron:
+
+    python -m app.cli partitions
+"""
+import os
+import asyncio
+from typing import Dict
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, engine
+
+# Months created ahead of the current one
+PARTITION_MONTHS_AHEAD = int(os.getenv("CONVERSATION_PARTITION_MONTHS_AHEAD", "3"))
+# Full months of messages kept besides the current one (0 = keep forever)
+RETENTION_MONTHS = int(os.getenv("CONVERSATION_RETENTION_MONTHS", "0"))
+# "drop" removes expired months, "detach" keeps them as standalone tables to archive
+RETENTION_MODE = os.getenv("CONVERSATION_RETENTION_MODE", "drop")
+MAINTENANCE_INTERVAL = int(os.getenv("CONVERSATION_PARTITION_MAINTENANCE_INTERVAL", "86400"))
+
+
+def maintain_message_partitions(db: Session) -> Dict:
+    """
+    Create upcoming partitions and remove expired ones
+    
+    Returns:
+        {"created": number of partitions created, "removed": names of partitions dropped or detached}
+    """
+    created = db.execute(
+        text("SELECT create_conversation_message_partitions(:months_ahead)"),
+        {"months_ahead": PARTITION_MONTHS_AHEAD}
+    ).scalar()
+    
+    removed = []
+    if RETENTION_MONTHS > 0:
+        removed = db.execute(
+            text("SELECT * FROM drop_conversation_message_partitions(:keep_months, :detach_only)"),
+            {"keep_months": RETENTION_MONTHS, "detach_only": RETENTION_MODE == "detach"}
+        ).scalars().all()
+    
+    db.commit()
+    return {"created": created, "removed": removed}
+
+
+def run_message_partition_maintenance() -> Dict:
+    """maintain_message_partitions() on its own session"""
+    db = SessionLocal()
+    try:
+        return maintain_message_partitions(db)
+    finally:
+        db.close()
+
+
+async def run_partition_maintenance():
+    """Background loop started with the app"""
+    if engine.dialect.name != "postgresql":
+        return
+    while True:
+        try:
+            result = await run_in_threadpool(run_message_partition_maintenance)
+            if result["created"] or result["removed"]:
+                print(f"[INFO] Message partitions: created {result['created']}, "
+                      f"{RETENTION_MODE} {', '.join(result['removed']) or 'none'}")
+        except Exception as e:
+            print(f"[WARN] Message partition maintenance failed: {str(e)}")
+        await asyncio.sleep(MAINTENANCE_INTERVAL)
+
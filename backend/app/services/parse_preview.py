@@ -0,0 +1,211 @@
+"""
+Upload previews - streaming stats and a bounded sample of parsed rows
+
+Rows past the sample are cached as NDJSON on disk so the UI can page through
+them with a token instead of receiving the whole dataset at once.
+"""
+import os
+import re
+import json
+import time
+import uuid
+import hashlib
+import unicodedata
+from collections import Counter
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from app.utils.data_parsers import TrainingDataParser
+
+PREVIEW_SAMPLE_SIZE = int(os.getenv("PREVIEW_SAMPLE_SIZE", "100"))
+PREVIEW_MAX_PAGE_SIZE = int(os.getenv("PREVIEW_MAX_PAGE_SIZE", "1000"))
+# Shared volume, like import uploads, so any API worker can serve the next page
+PREVIEW_CACHE_DIR = os.getenv("PREVIEW_CACHE_DIR", "/app/models/.previews")
+PREVIEW_CACHE_TTL = int(os.getenv("PREVIEW_CACHE_TTL", "3600"))  # seconds
+# Distinct rows counted exactly; past this a fixed-size filter approximates duplicates
+PREVIEW_DUPLICATE_EXACT_ROWS = int(os.getenv("PREVIEW_DUPLICATE_EXACT_ROWS", "100000"))
+PREVIEW_DUPLICATE_FILTER_MB = int(os.getenv("PREVIEW_DUPLICATE_FILTER_MB", "8"))
+
+UNKNOWN_INTENTS = (None, '', 'unknown')
+
+_CACHE_ID = re.compile(r'^[0-9a-f]{32}$')
+
+
+def _normalize(text) -> str:
+    """Same normalization as training_data.text_hash: NFC, lowercase, collapsed whitespace"""
+    return " ".join(unicodedata.normalize("NFC", str(text)).lower().split())
+
+
+def _row_key(item: Dict) -> bytes:
+    return hashlib.md5(
+        f"{item.get('intent') or ''}\x1f{_normalize(item['user'])}\x1f{_normalize(item['bot'])}".encode("utf-8")
+    ).digest()
+
+
+class _DuplicateCounter:
+    """
+    Counts rows whose key was already seen
+
+    Keys are kept in a set up to PREVIEW_DUPLICATE_EXACT_ROWS distinct rows,
+    then moved to a Bloom filter of PREVIEW_DUPLICATE_FILTER_MB, so memory
+    stays bounded whatever the upload size. From then on the count is
+    approximate (filter collisions can only over-count).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.exact = True
+        self._seen = set()
+        self._bits = None
+
+    def add(self, key: bytes) -> None:
+        if self._bits is not None:
+            if self._set_bits(key):
+                self.count += 1
+            return
+
+        if key in self._seen:
+            self.count += 1
+            return
+        self._seen.add(key)
+
+        if len(self._seen) > PREVIEW_DUPLICATE_EXACT_ROWS:
+            self._bits = bytearray(max(PREVIEW_DUPLICATE_FILTER_MB, 1) * 1024 * 1024)
+            for seen_key in self._seen:
+                self._set_bits(seen_key)
+            self._seen = None
+            self.exact = False
+
+    def _set_bits(self, key: bytes) -> bool:
+        """Set the key's three bits (32-bit slices of the md5 digest); True if all were set"""
+        size = len(self._bits) * 8
+        present = True
+        for offset in (0, 4, 8):
+            bit = int.from_bytes(key[offset:offset + 4], "little") % size
+            mask = 1 << (bit & 7)
+            if not self._bits[bit >> 3] & mask:
+                self._bits[bit >> 3] |= mask
+                present = False
+        return present
+
+
+def _cache_path(bot_id: int, cache_id: str) -> str:
+    return os.path.join(PREVIEW_CACHE_DIR, f"{int(bot_id)}_{cache_id}.ndjson")
+
+
+def _remove_expired() -> None:
+    """Delete cached previews older than PREVIEW_CACHE_TTL"""
+    if not os.path.isdir(PREVIEW_CACHE_DIR):
+        return
+    expired_before = time.time() - PREVIEW_CACHE_TTL
+    for entry in os.scandir(PREVIEW_CACHE_DIR):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < expired_before:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def build_preview(
+    bot_id: int,
+    filename: str,
+    fileobj: BinaryIO,
+    errors: Optional[List[Dict]] = None,
+    sample_size: int = PREVIEW_SAMPLE_SIZE
+) -> Dict:
+    """
+    Parse an upload in streaming mode and summarize it
+
+    Args:
+        bot_id: Bot the preview belongs to (scopes the page token)
+        filename: Uploaded file name, used for format detection
+        fileobj: Binary upload stream
+        errors: Collects per-line parse errors
+        sample_size: Rows returned inline
+
+    Returns:
+        Dict with count, stats, data (the sample) and next_token (None when
+        the sample holds every row). stats.duplicate_count is approximate
+        when stats.duplicate_count_exact is false (large uploads).
+    """
+    _remove_expired()
+
+    count = 0
+    intents = Counter()
+    missing_intent_count = 0
+    duplicates = _DuplicateCounter()
+    sample = []
+    cache_id = None
+    cache = None
+
+    try:
+        for chunk in TrainingDataParser.iter_parse(filename, fileobj, errors=errors):
+            for item in chunk:
+                count += 1
+                intent = item.get('intent')
+                if intent in UNKNOWN_INTENTS:
+                    missing_intent_count += 1
+                else:
+                    intents[intent] += 1
+
+                duplicates.add(_row_key(item))
+
+                if len(sample) < sample_size:
+                    sample.append(item)
+                    continue
+
+                if cache is None:
+                    os.makedirs(PREVIEW_CACHE_DIR, exist_ok=True)
+                    cache_id = uuid.uuid4().hex
+                    cache = open(_cache_path(bot_id, cache_id), "w", encoding="utf-8")
+                cache.write(json.dumps(item, ensure_ascii=False))
+                cache.write("\n")
+    except Exception:
+        if cache is not None:
+            cache.close()
+            os.remove(_cache_path(bot_id, cache_id))
+        raise
+    finally:
+        if cache is not None and not cache.closed:
+            cache.close()
+
+    return {
+        "count": count,
+        "stats": {
+            "intents": dict(intents.most_common()),
+            "missing_intent_count": missing_intent_count,
+            "duplicate_count": duplicates.count,
+            "duplicate_count_exact": duplicates.exact
+        },
+        "data": sample,
+        "next_token": f"{cache_id}.0" if cache_id else None
+    }
+
+
+def read_preview_page(bot_id: int, token: str, limit: int = PREVIEW_SAMPLE_SIZE) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Read the rows following a page token
+
+    Returns:
+        (rows, next_token) - next_token is None after the last row
+
+    Raises:
+        ValueError: If the token is malformed
+        FileNotFoundError: If the cached preview expired
+    """
+    cache_id, _, offset = token.partition(".")
+    if not _CACHE_ID.match(cache_id) or not offset.isdigit():
+        raise ValueError("Invalid preview token")
+
+    limit = max(1, min(limit, PREVIEW_MAX_PAGE_SIZE))
+    rows = []
+    with open(_cache_path(bot_id, cache_id), "rb") as f:
+        f.seek(int(offset))
+        while len(rows) < limit:
+            line = f.readline()
+            if not line:
+                return rows, None
+            rows.append(json.loads(line))
+        next_offset = f.tell()
+        has_more = bool(f.read(1))
+
+    return rows, f"{cache_id}.{next_offset}" if has_more else None
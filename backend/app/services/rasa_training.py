@@ -8,6 +8,8 @@ from typing import List, Dict
 from pathlib import Path
 from datetime import datetime
 
+from app.services.training_profiles import apply_profile
+
 
 class RasaTrainingService:
     """Service to convert training data to Rasa format and train models"""
@@ -22,8 +24,14 @@ class RasaTrainingService:
         bot_folder.mkdir(parents=True, exist_ok=True)
         return bot_folder
     
-    def generate_config_yml(self, bot_id: int, language: str = "vi") -> str:
-        """Generate config.yml for Rasa"""
+    def generate_config_yml(
+        self,
+        bot_id: int,
+        language: str = "vi",
+        training_data: List[Dict] = None,
+        profile: str = None
+    ) -> str:
+        """Generate config.yml for Rasa, sized to the dataset by a training profile"""
         config = {
             "recipe": "default.v1",
             "language": language,
@@ -64,6 +72,16 @@ class RasaTrainingService:
             "assistant_id": f"bot_{bot_id}"
         }
         
+        # Only rules are generated for these bots, so dialogue policies are never needed
+        training_data = training_data or []
+        config = apply_profile(
+            config,
+            profile,
+            len(training_data),
+            {item.get('intent') or 'general' for item in training_data},
+            rule_only=True
+        )
+        
         bot_folder = self.get_bot_folder(bot_id)
         config_file = bot_folder / "config.yml"
         
@@ -285,7 +303,14 @@ class RasaTrainingService:
                 "error_message": str(e)
             }
     
-    def prepare_and_train(self, bot_id: int, training_data: List[Dict], language: str = "vi", use_finetune: bool = True) -> Dict:
+    def prepare_and_train(
+        self,
+        bot_id: int,
+        training_data: List[Dict],
+        language: str = "vi",
+        use_finetune: bool = True,
+        profile: str = None
+    ) -> Dict:
         """
         Full pipeline: generate all files and train model
         
@@ -294,13 +319,14 @@ class RasaTrainingService:
             training_data: List of dicts with keys: user_message, bot_response, intent
             language: Language code (default: vi)
             use_finetune: If True, use incremental training when possible (default: True)
+            profile: Training profile name (default: TRAINING_PROFILE env or balanced)
         
         Returns:
             Dict with training results
         """
         try:
             # 1. Generate config.yml
-            self.generate_config_yml(bot_id, language)
+            self.generate_config_yml(bot_id, language, training_data, profile)
             
             # 2. Generate nlu.yml
             self.generate_nlu_yml(bot_id, training_data)
@@ -0,0 +1,216 @@
+"""
+Shared Rasa training cache - one persistent, size-bounded cache directory
+reused by every bot and job on the node, with LRU eviction
+"""
+import os
+import re
+import json
+import time
+import shutil
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows dev setups: no cross-process locking
+    fcntl = None
+
+TRAINING_CACHE_DIR = os.getenv("TRAINING_CACHE_DIR", "/app/models/.rasa_cache")
+TRAINING_CACHE_MAX_MB = int(os.getenv("TRAINING_CACHE_MAX_MB", "5000"))
+
+# Eviction frees space down to this fraction of the limit to avoid evicting on every job
+EVICTION_TARGET_RATIO = 0.8
+
+RASA_CACHE_DB = "cache.db"
+LOCK_FILENAME = ".lock"
+TIMINGS_FILENAME = "component_timings.json"
+
+RESTORED_PATTERN = re.compile(r"Restored component '([^']+)' from cache")
+STARTED_PATTERN = re.compile(r"Starting to train component '([^']+)'")
+FINISHED_PATTERN = re.compile(r"Finished training component '([^']+)'")
+
+
+class CacheUsage:
+    """Collect cache hits/misses and component train times from `rasa train` output"""
+
+    def __init__(self):
+        self.restored: List[str] = []
+        self.trained: Dict[str, float] = {}
+        self._started: Dict[str, float] = {}
+
+    def feed(self, line: str) -> None:
+        match = RESTORED_PATTERN.search(line)
+        if match:
+            self.restored.append(match.group(1))
+            return
+
+        match = STARTED_PATTERN.search(line)
+        if match:
+            self._started[match.group(1)] = time.monotonic()
+            return
+
+        match = FINISHED_PATTERN.search(line)
+        if match:
+            name = match.group(1)
+            started = self._started.pop(name, None)
+            if started is not None:
+                self.trained[name] = self.trained.get(name, 0.0) + time.monotonic() - started
+
+    def summary(self, timings: Dict[str, float]) -> Dict:
+        """Hit rate and time saved, estimated from previous train times of restored components"""
+        hits = len(self.restored)
+        misses = len(self.trained)
+        total = hits + misses
+        time_saved = sum(timings.get(name, 0.0) for name in self.restored)
+
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 3) if total else None,
+            "time_saved_seconds": round(time_saved, 1),
+            "restored_components": self.restored,
+        }
+
+
+class TrainingCache:
+    """
+    Persistent Rasa training cache shared by all jobs
+
+    Jobs hold a shared flock() on the cache while `rasa train` runs; eviction
+    takes the exclusive lock so entries are never removed under a running job.
+    Rasa's own sqlite index (cache.db) handles concurrent writers.
+    """
+
+    def __init__(self, path: str = TRAINING_CACHE_DIR, max_size_mb: int = TRAINING_CACHE_MAX_MB):
+        self.path = path
+        self.max_size_mb = max_size_mb
+        os.makedirs(self.path, exist_ok=True)
+
+    def env(self) -> Dict[str, str]:
+        """Environment variables pointing `rasa train` at the shared cache"""
+        return {
+            "RASA_CACHE_DIRECTORY": self.path,
+            "RASA_MAX_CACHE_SIZE": str(self.max_size_mb),
+        }
+
+    @contextmanager
+    def _lock(self, mode: int, blocking: bool = True):
+        if fcntl is None:
+            yield True
+            return
+
+        with open(os.path.join(self.path, LOCK_FILENAME), "w") as lock_file:
+            try:
+                fcntl.flock(lock_file, mode if blocking else mode | fcntl.LOCK_NB)
+            except OSError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @contextmanager
+    def shared(self):
+        """Hold the cache for the duration of a training run"""
+        with self._lock(fcntl.LOCK_SH if fcntl else 0) as acquired:
+            yield acquired
+
+    def size_bytes(self) -> int:
+        total = 0
+        for root, _dirs, files in os.walk(self.path):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        return total
+
+    def _entries_lru(self) -> List[Dict]:
+        """Cache entries, least recently used first"""
+        db_path = os.path.join(self.path, RASA_CACHE_DB)
+        if os.path.exists(db_path):
+            try:
+                with sqlite3.connect(db_path, timeout=30) as db:
+                    rows = db.execute(
+                        "SELECT id, result_location FROM cached_result ORDER BY last_used ASC"
+                    ).fetchall()
+                return [{"id": row[0], "location": row[1]} for row in rows]
+            except sqlite3.Error:
+                pass
+
+        # Unknown Rasa cache layout - fall back to directory access times
+        entries = []
+        for name in os.listdir(self.path):
+            location = os.path.join(self.path, name)
+            if os.path.isdir(location):
+                entries.append({"id": None, "location": location, "atime": os.path.getatime(location)})
+        return sorted(entries, key=lambda entry: entry["atime"])
+
+    def _remove_entry(self, entry: Dict) -> None:
+        location = entry["location"]
+        if location and os.path.realpath(location).startswith(os.path.realpath(self.path) + os.sep):
+            shutil.rmtree(location, ignore_errors=True)
+
+        if entry["id"] is not None:
+            with sqlite3.connect(os.path.join(self.path, RASA_CACHE_DB), timeout=30) as db:
+                db.execute("DELETE FROM cached_result WHERE id = ?", (entry["id"],))
+
+    def evict(self, blocking: bool = False) -> Optional[Dict]:
+        """
+        Evict least recently used entries until the cache fits its size limit
+
+        Returns:
+            Dict with evicted entry count and freed MB, or None if the cache is
+            in use by a running job and blocking is False
+        """
+        with self._lock(fcntl.LOCK_EX if fcntl else 0, blocking=blocking) as acquired:
+            if not acquired:
+                return None
+
+            limit = self.max_size_mb * 1024 * 1024
+            size = self.size_bytes()
+            if size <= limit:
+                return {"evicted": 0, "freed_mb": 0}
+
+            target = limit * EVICTION_TARGET_RATIO
+            start_size = size
+            evicted = 0
+            for entry in self._entries_lru():
+                if size <= target:
+                    break
+                self._remove_entry(entry)
+                evicted += 1
+                size = self.size_bytes()
+
+            return {"evicted": evicted, "freed_mb": round((start_size - size) / 1024 / 1024, 1)}
+
+    def load_timings(self) -> Dict[str, float]:
+        """Last measured train time per component, used to estimate time saved"""
+        try:
+            with open(os.path.join(self.path, TIMINGS_FILENAME), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def record_timings(self, usage: CacheUsage) -> None:
+        if not usage.trained:
+            return
+
+        timings = self.load_timings()
+        timings.update({name: round(seconds, 2) for name, seconds in usage.trained.items()})
+
+        timings_file = os.path.join(self.path, TIMINGS_FILENAME)
+        tmp_file = f"{timings_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(timings, f, indent=2)
+        os.replace(tmp_file, timings_file)
+
+    def stats(self) -> Dict:
+        return {
+            "path": self.path,
+            "size_mb": round(self.size_bytes() / 1024 / 1024, 1),
+            "max_size_mb": self.max_size_mb,
+            "entries": len(self._entries_lru()),
+        }
@@ -0,0 +1,130 @@
+"""
+Training manifest - remembers what the current model of a bot was trained on
+so the job pipeline can choose between incremental finetuning and full training
+"""
+import os
+import json
+import hashlib
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+MANIFEST_FILENAME = "training_manifest.json"
+
+# Fraction of the configured epochs used when finetuning an existing model
+FINETUNE_EPOCH_FRACTION = float(os.getenv("TRAINING_FINETUNE_EPOCH_FRACTION", "0.5"))
+
+
+def _hash_items(items) -> str:
+    """Stable hash of an iterable of strings (order independent)"""
+    digest = hashlib.sha256()
+    for item in sorted(items):
+        digest.update(item.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def build_manifest(training_data: List[Dict], config_fingerprint: str) -> Dict:
+    """
+    Build a manifest describing a dataset
+
+    Args:
+        training_data: Rows with user_message, bot_response, intent
+        config_fingerprint: Fingerprint of the Rasa config used for training
+
+    Returns:
+        Dict with intents, hashes of responses/examples and config
+    """
+    intents = set()
+    responses = set()
+    examples = set()
+
+    for item in training_data:
+        intent = item['intent'] or 'unknown'
+        intents.add(intent)
+        if item['bot_response']:
+            responses.add(f"{intent}\x1f{item['bot_response']}")
+        examples.add(f"{intent}\x1f{item['user_message']}")
+
+    return {
+        "intents": sorted(intents),
+        "responses_hash": _hash_items(responses),
+        "examples_hash": _hash_items(examples),
+        "example_count": len(training_data),
+        "config_hash": config_fingerprint,
+    }
+
+
+def load_manifest(bot_dir: str) -> Optional[Dict]:
+    """Load the manifest of the current model, if any"""
+    manifest_file = os.path.join(bot_dir, MANIFEST_FILENAME)
+    if not os.path.exists(manifest_file):
+        return None
+
+    try:
+        with open(manifest_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_manifest(bot_dir: str, manifest: Dict) -> None:
+    """Persist manifest atomically next to the model"""
+    manifest_file = os.path.join(bot_dir, MANIFEST_FILENAME)
+    tmp_file = f"{manifest_file}.tmp"
+    manifest = dict(manifest, trained_at=datetime.now(timezone.utc).isoformat())
+
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_file, manifest_file)
+
+
+def diff_manifests(previous: Dict, current: Dict) -> Dict:
+    """Describe what changed between two manifests"""
+    previous_intents = set(previous.get("intents", []))
+    current_intents = set(current["intents"])
+
+    return {
+        "added_intents": sorted(current_intents - previous_intents),
+        "removed_intents": sorted(previous_intents - current_intents),
+        "responses_changed": previous.get("responses_hash") != current["responses_hash"],
+        "examples_changed": previous.get("examples_hash") != current["examples_hash"],
+        "config_changed": previous.get("config_hash") != current["config_hash"],
+        "example_count_delta": current["example_count"] - previous.get("example_count", 0),
+    }
+
+
+def select_training_mode(
+    previous: Optional[Dict],
+    current: Dict,
+    existing_model: Optional[str]
+) -> Tuple[str, str, Dict]:
+    """
+    Decide between incremental finetuning and full training
+
+    Finetuning is only safe when the label set (intents and responses) and
+    the pipeline config are unchanged, i.e. only NLU examples changed.
+
+    Returns:
+        Tuple of (mode, reason, changes) where mode is 'finetune' or 'full'
+    """
+    if not previous:
+        return "full", "No manifest for the current model", {}
+
+    if not existing_model or not os.path.exists(existing_model):
+        return "full", "No existing model to finetune", {}
+
+    if previous.get("model_path") != existing_model:
+        return "full", "Current model was not produced by the job pipeline", {}
+
+    changes = diff_manifests(previous, current)
+
+    if changes["config_changed"]:
+        return "full", "Training config changed", changes
+    if changes["added_intents"] or changes["removed_intents"]:
+        return "full", "Intent set changed", changes
+    if changes["responses_changed"]:
+        return "full", "Responses changed", changes
+
+    if changes["examples_changed"]:
+        return "finetune", "Only training examples changed", changes
+    return "finetune", "Dataset unchanged", changes
@@ -0,0 +1,154 @@
+"""
+Training profiles - size epochs and pipeline components to the dataset
+"""
+import os
+import copy
+import hashlib
+import yaml
+from typing import Dict, List, Iterable
+
+DEFAULT_PROFILE = os.getenv("TRAINING_PROFILE", "balanced")
+
+# Epochs grow linearly from min_epochs to max_epochs until the dataset
+# reaches reference_examples. Datasets with at least min_holdout_examples
+# keep holdout_fraction of their examples aside for validation; the best
+# checkpoint on that split is kept (Rasa's equivalent of early stopping).
+TRAINING_PROFILES = {
+    "fast": {
+        "description": "Few epochs, no validation split - quick iterations on small bots",
+        "min_epochs": 20,
+        "max_epochs": 50,
+        "reference_examples": 2000,
+        "holdout_fraction": 0.0,
+        "min_holdout_examples": 0,
+        "evaluate_every_epochs": 0,
+    },
+    "balanced": {
+        "description": "Default - epochs scaled to dataset size with early stopping",
+        "min_epochs": 40,
+        "max_epochs": 100,
+        "reference_examples": 1000,
+        "holdout_fraction": 0.1,
+        "min_holdout_examples": 100,
+        "evaluate_every_epochs": 5,
+    },
+    "thorough": {
+        "description": "Long training for large datasets, keeps the best validation checkpoint",
+        "min_epochs": 100,
+        "max_epochs": 200,
+        "reference_examples": 5000,
+        "holdout_fraction": 0.15,
+        "min_holdout_examples": 50,
+        "evaluate_every_epochs": 5,
+    },
+}
+
+# Components whose epochs are sized by the profile
+EPOCH_COMPONENTS = {"DIETClassifier", "ResponseSelector", "TEDPolicy", "UnexpecTEDIntentPolicy"}
+
+# Components that only help with retrieval intents or multi-turn stories
+RETRIEVAL_COMPONENTS = {"ResponseSelector"}
+DIALOGUE_POLICIES = {"MemoizationPolicy", "TEDPolicy", "UnexpecTEDIntentPolicy"}
+
+# Keys that change with dataset size but do not change the model architecture
+SIZE_DEPENDENT_KEYS = ("epochs", "evaluate_on_number_of_examples")
+
+MAX_HOLDOUT_EXAMPLES = 1000
+
+
+def get_profile(name: str = None) -> Dict:
+    """Get profile settings by name (raises ValueError if unknown)"""
+    name = name or DEFAULT_PROFILE
+    if name not in TRAINING_PROFILES:
+        raise ValueError(
+            f"Unknown training profile '{name}'. "
+            f"Available: {', '.join(TRAINING_PROFILES)}"
+        )
+    return TRAINING_PROFILES[name]
+
+
+def scale_epochs(profile: Dict, example_count: int) -> int:
+    """Scale epochs linearly with dataset size between the profile bounds"""
+    ratio = min(example_count / profile["reference_examples"], 1.0)
+    span = profile["max_epochs"] - profile["min_epochs"]
+    return profile["min_epochs"] + int(round(span * ratio))
+
+
+def holdout_size(profile: Dict, example_count: int) -> int:
+    """Number of examples kept aside for validation (0 disables early stopping)"""
+    if not profile["holdout_fraction"] or example_count < profile["min_holdout_examples"]:
+        return 0
+    return min(int(example_count * profile["holdout_fraction"]), MAX_HOLDOUT_EXAMPLES)
+
+
+def has_retrieval_intents(intents: Iterable[str]) -> bool:
+    """Retrieval intents (faq/ask_price) are the only reason to run ResponseSelector"""
+    return any("/" in intent for intent in intents)
+
+
+def apply_profile(
+    config: Dict,
+    profile_name: str,
+    example_count: int,
+    intents: List[str],
+    rule_only: bool = True
+) -> Dict:
+    """
+    Size a Rasa config to the dataset
+
+    Args:
+        config: Base config with pipeline and policies
+        profile_name: fast, balanced or thorough
+        example_count: Number of NLU examples
+        intents: Intent names in the dataset
+        rule_only: True when every dialogue is a one-step intent -> utter mapping
+
+    Returns:
+        New config dict
+    """
+    profile = get_profile(profile_name)
+    epochs = scale_epochs(profile, example_count)
+    holdout = holdout_size(profile, example_count)
+    retrieval = has_retrieval_intents(intents)
+
+    config = copy.deepcopy(config)
+
+    pipeline = []
+    for component in config.get("pipeline", []):
+        if component["name"] in RETRIEVAL_COMPONENTS and not retrieval:
+            continue
+        if component["name"] in EPOCH_COMPONENTS:
+            component["epochs"] = epochs
+            if holdout:
+                component["evaluate_on_number_of_examples"] = holdout
+                component["evaluate_every_number_of_epochs"] = profile["evaluate_every_epochs"]
+                component["checkpoint_model"] = True
+        pipeline.append(component)
+    config["pipeline"] = pipeline
+
+    policies = []
+    for policy in config.get("policies", []):
+        if policy["name"] in DIALOGUE_POLICIES and rule_only:
+            continue
+        if policy["name"] in EPOCH_COMPONENTS:
+            policy["epochs"] = epochs
+        policies.append(policy)
+    config["policies"] = policies
+
+    return config
+
+
+def config_fingerprint(config: Dict) -> str:
+    """
+    Hash of a config ignoring size-dependent settings
+
+    Rasa can only finetune a model whose config is unchanged apart from epochs.
+    """
+    config = copy.deepcopy(config)
+    for section in ("pipeline", "policies"):
+        for component in config.get(section, []):
+            for key in SIZE_DEPENDENT_KEYS:
+                component.pop(key, None)
+
+    content = yaml.dump(config, allow_unicode=True, sort_keys=True)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
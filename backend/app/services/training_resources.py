@@ -0,0 +1,345 @@
+"""
+Resource isolation for `rasa train` subprocesses - thread caps, CPU/IO priority,
+memory ceiling, CPU affinity and a per-node limit on concurrent trainings
+"""
+import os
+import time
+import shutil
+import threading
+import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Set
+
+try:
+    import fcntl
+except ImportError:  # Windows dev setups: fall back to a per-process limit
+    fcntl = None
+
+# Defaults for every training job (per-job config may only tighten them)
+TRAINING_CPU_THREADS = int(os.getenv("TRAINING_CPU_THREADS", "2"))
+TRAINING_NICE = int(os.getenv("TRAINING_NICE", "10"))
+TRAINING_IONICE_CLASS = os.getenv("TRAINING_IONICE_CLASS", "idle")  # idle, best-effort, none
+TRAINING_MEMORY_LIMIT_MB = int(os.getenv("TRAINING_MEMORY_LIMIT_MB", "0"))  # 0 = no limit
+TRAINING_CPU_AFFINITY = os.getenv("TRAINING_CPU_AFFINITY", "")  # e.g. "2-3" or "4,6"
+TRAINING_MAX_CONCURRENT = int(os.getenv("TRAINING_MAX_CONCURRENT", "1"))
+TRAINING_SLOTS_DIR = os.getenv("TRAINING_SLOTS_DIR", "/app/models/.training_slots")
+
+# Environment variables honoured by TensorFlow and the BLAS/OpenMP runtimes
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "TF_NUM_INTRAOP_THREADS",
+)
+
+MEMORY_CHECK_INTERVAL = 2.0
+SLOT_POLL_INTERVAL = 2.0
+
+
+def parse_cpu_set(value: str) -> Set[int]:
+    """Parse a CPU list such as "0-3,6" into a set of CPU ids"""
+    cpus = set()
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            cpus.update(range(int(start), int(end) + 1))
+        else:
+            cpus.add(int(part))
+    return cpus
+
+
+def get_resource_limits(overrides: Optional[Dict] = None) -> Dict:
+    """
+    Resolve resource limits for a job
+
+    Args:
+        overrides: Optional per-job settings (cpu_threads, nice, memory_limit_mb, cpu_affinity)
+
+    Returns:
+        Dict of effective limits. Overrides can only make a job more restricted
+        than the node defaults.
+    """
+    limits = {
+        "cpu_threads": TRAINING_CPU_THREADS,
+        "nice": TRAINING_NICE,
+        "ionice_class": TRAINING_IONICE_CLASS,
+        "memory_limit_mb": TRAINING_MEMORY_LIMIT_MB,
+        "cpu_affinity": sorted(parse_cpu_set(TRAINING_CPU_AFFINITY)),
+    }
+    overrides = overrides or {}
+
+    if overrides.get("cpu_threads"):
+        limits["cpu_threads"] = max(1, min(int(overrides["cpu_threads"]), limits["cpu_threads"]))
+
+    if overrides.get("nice") is not None:
+        limits["nice"] = min(max(int(overrides["nice"]), limits["nice"]), 19)
+
+    if overrides.get("memory_limit_mb"):
+        requested = int(overrides["memory_limit_mb"])
+        if limits["memory_limit_mb"]:
+            requested = min(requested, limits["memory_limit_mb"])
+        limits["memory_limit_mb"] = requested
+
+    if overrides.get("cpu_affinity"):
+        requested = parse_cpu_set(str(overrides["cpu_affinity"]))
+        if limits["cpu_affinity"]:
+            requested &= set(limits["cpu_affinity"])
+        if requested:
+            limits["cpu_affinity"] = sorted(requested)
+
+    return limits
+
+
+def build_training_env(limits: Dict) -> Dict[str, str]:
+    """Environment for the training subprocess with thread pools capped"""
+    env = os.environ.copy()
+    threads = str(limits["cpu_threads"])
+    for var in THREAD_ENV_VARS:
+        env[var] = threads
+    # Inter-op parallelism only needs a couple of threads
+    env["TF_NUM_INTEROP_THREADS"] = str(min(limits["cpu_threads"], 2))
+    return env
+
+
+def build_training_command(cmd: List[str], limits: Dict) -> List[str]:
+    """Prefix the command with ionice when the tool is available"""
+    ionice = shutil.which("ionice")
+    if not ionice or limits["ionice_class"] == "none":
+        return cmd
+
+    if limits["ionice_class"] == "idle":
+        return [ionice, "-c", "3"] + cmd
+    return [ionice, "-c", "2", "-n", "7"] + cmd
+
+
+def apply_process_limits(pid: int, limits: Dict) -> None:
+    """
+    Lower priority and pin CPUs of a freshly started process
+
+    Done from the parent right after spawn (TensorFlow threads are created
+    later and inherit both settings), which avoids preexec_fn in a
+    multi-threaded server.
+    """
+    if limits["nice"] and hasattr(os, "setpriority"):
+        try:
+            os.setpriority(os.PRIO_PROCESS, pid, limits["nice"])
+        except OSError:
+            pass
+
+    if limits["cpu_affinity"] and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(pid, limits["cpu_affinity"])
+        except OSError:
+            pass
+
+
+def _process_tree_rss_kb(pid: int) -> int:
+    """Resident memory of a process and its direct children (Linux /proc)"""
+    pids = [pid]
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            pids.extend(int(child) for child in f.read().split())
+    except OSError:
+        pass
+
+    total = 0
+    for child_pid in pids:
+        try:
+            with open(f"/proc/{child_pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+                        break
+        except (OSError, ValueError):
+            continue
+    return total
+
+
+class MemoryWatchdog(threading.Thread):
+    """Kill a training process whose resident memory exceeds the ceiling"""
+
+    def __init__(self, process: subprocess.Popen, limit_mb: int):
+        super().__init__(daemon=True)
+        self.process = process
+        self.limit_kb = limit_mb * 1024
+        self.exceeded = False
+        self.peak_mb = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(MEMORY_CHECK_INTERVAL):
+            if self.process.poll() is not None:
+                return
+            rss_kb = _process_tree_rss_kb(self.process.pid)
+            self.peak_mb = max(self.peak_mb, rss_kb // 1024)
+            if self.limit_kb and rss_kb > self.limit_kb:
+                self.exceeded = True
+                self.process.kill()
+                return
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class TrainingSlot:
+    """
+    One of TRAINING_MAX_CONCURRENT training slots on this node
+
+    Slots are exclusive flock()s on files in TRAINING_SLOTS_DIR, so the limit
+    holds across uvicorn workers and CLI processes sharing the models volume.
+    Locks are released by the kernel if the holder dies.
+    """
+
+    _local_semaphore = threading.BoundedSemaphore(max(TRAINING_MAX_CONCURRENT, 1))
+
+    def __init__(self):
+        self._file = None
+        self._local = False
+        self.index = None
+
+    def try_acquire(self) -> bool:
+        if fcntl is None:
+            self._local = self._local_semaphore.acquire(blocking=False)
+            return self._local
+
+        os.makedirs(TRAINING_SLOTS_DIR, exist_ok=True)
+        for index in range(max(TRAINING_MAX_CONCURRENT, 1)):
+            slot_file = open(os.path.join(TRAINING_SLOTS_DIR, f"slot_{index}.lock"), "w")
+            try:
+                fcntl.flock(slot_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                slot_file.close()
+                continue
+            self._file = slot_file
+            self.index = index
+            return True
+        return False
+
+    def release(self):
+        if self._file:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        if self._local:
+            self._local_semaphore.release()
+            self._local = False
+
+
+def acquire_training_slot(
+    should_abort: Callable[[], bool],
+    on_wait: Optional[Callable[[], None]] = None
+) -> Optional[TrainingSlot]:
+    """
+    Block until a training slot is free
+
+    Args:
+        should_abort: Polled while waiting; return True to give up (e.g. job cancelled)
+        on_wait: Called once if the job has to wait
+
+    Returns:
+        Acquired slot, or None if aborted
+    """
+    slot = TrainingSlot()
+    waited = False
+    while not slot.try_acquire():
+        if not waited and on_wait:
+            on_wait()
+        waited = True
+        if should_abort():
+            return None
+        time.sleep(SLOT_POLL_INTERVAL)
+    return slot
+
+
+class TrainingDispatcher:
+    """
+    Starts queued training jobs as this node's training slots free up
+
+    Waiting jobs are polled in FIFO order by one daemon thread, so no request
+    threadpool thread is held while a job waits. A job that gets a slot runs
+    on a dedicated executor with one thread per slot.
+    """
+
+    def __init__(self):
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(TRAINING_MAX_CONCURRENT, 1),
+            thread_name_prefix="training"
+        )
+
+    def submit(
+        self,
+        run: Callable[[TrainingSlot], None],
+        should_abort: Callable[[], bool],
+        on_wait: Optional[Callable[[], None]] = None
+    ):
+        """
+        Queue a job; run(slot) is called on the executor once a slot is acquired
+
+        Args:
+            run: Runs the job holding the slot (the slot is released when it returns)
+            should_abort: Polled while waiting; return True to drop the job (e.g. cancelled)
+            on_wait: Called once if the job has to wait
+        """
+        with self._lock:
+            self._queue.append({"run": run, "should_abort": should_abort, "on_wait": on_wait, "waited": False})
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._dispatch, name="training-dispatcher", daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def _dispatch(self):
+        while True:
+            self._wakeup.clear()
+            with self._lock:
+                if not self._queue:
+                    self._thread = None
+                    return
+                waiting = list(self._queue)
+
+            # Slots go to jobs in FIFO order; jobs behind a waiting one are only polled
+            slots_free = True
+            for entry in waiting:
+                try:
+                    if entry["should_abort"]():
+                        self._remove(entry)
+                        continue
+                    if slots_free:
+                        slot = TrainingSlot()
+                        if slot.try_acquire():
+                            self._remove(entry)
+                            self._executor.submit(self._run, entry["run"], slot)
+                            continue
+                        slots_free = False
+                    if not entry["waited"]:
+                        entry["waited"] = True
+                        if entry["on_wait"]:
+                            entry["on_wait"]()
+                except Exception as e:
+                    print(f"[ERROR] Training dispatcher: {e}")
+                    slots_free = False
+
+            self._wakeup.wait(SLOT_POLL_INTERVAL)
+
+    def _remove(self, entry: Dict):
+        with self._lock:
+            self._queue.remove(entry)
+
+    def _run(self, run: Callable[[TrainingSlot], None], slot: TrainingSlot):
+        try:
+            run(slot)
+        except Exception as e:
+            print(f"[ERROR] Training job failed outside its handler: {e}")
+        finally:
+            slot.release()
+            self._wakeup.set()
+
+
+training_dispatcher = TrainingDispatcher()
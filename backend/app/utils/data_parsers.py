@@ -1,40 +1,154 @@
 """
 Training data parsers for different file formats
 """
+import io
 import json
 import yaml
 import csv
 import re
-from typing import List, Dict, Optional
+import zipfile
+import openpyxl
+from openpyxl.utils.exceptions import InvalidFileException
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, TextIO
 from io import StringIO
 
+from .rule_classifier import parser_classifier
+
+# Rows per chunk yielded by iter_parse
+DEFAULT_CHUNK_SIZE = 1000
+
+# Characters read at a time by the streaming JSON parser
+JSON_READ_SIZE = 64 * 1024
+
+# Largest flow-style YAML document (e.g. `nlu: [{...}]`), which is loaded in one piece
+YAML_FLOW_MAX_SIZE = 10 * 1024 * 1024
+
 
 class TrainingDataParser:
     """Parse training data from various formats"""
     
+    @staticmethod
+    def _simple_item(item) -> Optional[Dict]:
+        """Convert a {"user", "bot", "intent"} record, None if incomplete"""
+        if isinstance(item, dict) and "user" in item and "bot" in item:
+            return {
+                "user": item["user"],
+                "bot": item["bot"],
+                "intent": item.get("intent", "unknown")
+            }
+        return None
+    
     @staticmethod
     def parse_json(content: str) -> List[Dict]:
         """
         Parse JSON format
         Expected: [{"user": "...", "bot": "...", "intent": "..."}]
         """
-        try:
-            data = json.loads(content)
-            if not isinstance(data, list):
-                raise ValueError("JSON must be an array")
+        return list(TrainingDataParser._iter_json(StringIO(content)))
+    
+    @staticmethod
+    def _iter_json(stream: TextIO) -> Iterator[Dict]:
+        """
+        Stream items of a JSON array one at a time
+        
+        Only the current item and a read buffer are held in memory.
+        """
+        decoder = json.JSONDecoder()
+        buffer = ""
+        pos = 0
+        
+        def read_more() -> bool:
+            nonlocal buffer, pos
+            data = stream.read(JSON_READ_SIZE)
+            buffer, pos = buffer[pos:] + data, 0
+            return bool(data)
+        
+        def peek() -> str:
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                    pos += 1
+                if pos < len(buffer):
+                    return buffer[pos]
+                if not read_more():
+                    return ""
+        
+        if peek() != "[":
+            raise ValueError("JSON must be an array")
+        pos += 1
+        
+        if peek() == "]":
+            pos += 1
+        else:
+            while True:
+                peek()
+                while True:
+                    try:
+                        value, end = decoder.raw_decode(buffer, pos)
+                    except json.JSONDecodeError as e:
+                        # Item may continue past the buffer - read more, fail at EOF
+                        if read_more():
+                            continue
+                        raise ValueError(f"Invalid JSON: {str(e)}")
+                    # A value ending exactly at the buffer end may be truncated (e.g. a number)
+                    if end == len(buffer) and read_more():
+                        continue
+                    break
+                pos = end
+                
+                item = TrainingDataParser._simple_item(value)
+                if item:
+                    yield item
+                
+                char = peek()
+                if char == ",":
+                    pos += 1
+                elif char == "]":
+                    pos += 1
+                    break
+                else:
+                    raise ValueError("Invalid JSON: expected ',' or ']' after array item")
+        
+        if peek():
+            raise ValueError("Invalid JSON: extra data after array")
+    
+    @staticmethod
+    def parse_jsonl(content: str, errors: Optional[List[Dict]] = None) -> List[Dict]:
+        """
+        Parse JSON Lines format (.jsonl / .ndjson)
+        Expected: one {"user": "...", "bot": "...", "intent": "..."} object per line
+        """
+        return list(TrainingDataParser._iter_jsonl(StringIO(content), errors))
+    
+    @staticmethod
+    def _iter_jsonl(stream: TextIO, errors: Optional[List[Dict]] = None) -> Iterator[Dict]:
+        """
+        Stream JSON Lines one record at a time
+        
+        Args:
+            stream: Text stream
+            errors: If given, invalid lines are recorded here as {"line", "error"}
+                    and skipped; otherwise the first invalid line raises ValueError
+        """
+        for line_number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
             
-            result = []
-            for item in data:
-                if "user" in item and "bot" in item:
-                    result.append({
-                        "user": item["user"],
-                        "bot": item["bot"],
-                        "intent": item.get("intent", "unknown")
-                    })
+            try:
+                value = json.loads(line)
+            except json.JSONDecodeError as e:
+                error = f"Invalid JSON: {e.msg} (column {e.colno})"
+            else:
+                item = TrainingDataParser._simple_item(value)
+                if item:
+                    yield item
+                    continue
+                error = "Expected an object with 'user' and 'bot'"
             
-            return result
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON: {str(e)}")
+            if errors is None:
+                raise ValueError(f"Line {line_number}: {error}")
+            errors.append({"line": line_number, "error": error})
     
     @staticmethod
     def parse_yaml(content: str) -> List[Dict]:
@@ -52,58 +166,153 @@ class TrainingDataParser:
         - user: hi
           bot: Hello!
           intent: greeting
+        
+        Either format may also be written in flow style, e.g.
+        nlu: [{intent: greeting, examples: "- hi\n- hello\n"}]
         """
-        try:
-            data = yaml.safe_load(content)
+        return list(TrainingDataParser._iter_yaml(StringIO(content)))
+    
+    @staticmethod
+    def _iter_yaml_blocks(lines: Iterable[str]) -> Iterator[tuple]:
+        """
+        Split a YAML document into its top-level list items
+        
+        Yields (section, text) per item, where section is 'nlu' for entries of
+        the Rasa NLU list and None for items of a top-level simple list. Other
+        top-level keys (version, responses, ...) are skipped.
+        """
+        section = None
+        list_indent = None
+        block = []
+        
+        def dedent(line: str) -> str:
+            return line[list_indent:] if not line[:list_indent].strip() else line.lstrip(' ')
+        
+        for line in lines:
+            line = line.rstrip('\r\n')
+            stripped = line.strip()
+            
+            if not stripped or stripped.startswith('#'):
+                if block:
+                    block.append(line)
+                continue
             
-            # Check if Rasa NLU format
-            if isinstance(data, dict) and "nlu" in data:
-                return TrainingDataParser._parse_rasa_nlu(data)
+            indent = len(line) - len(line.lstrip(' '))
+            is_item = stripped == '-' or stripped[:2] in ('- ', '-\t')
             
-            # Simple YAML list format
-            elif isinstance(data, list):
-                result = []
-                for item in data:
-                    if "user" in item and "bot" in item:
-                        result.append({
-                            "user": item["user"],
-                            "bot": item["bot"],
-                            "intent": item.get("intent", "unknown")
-                        })
-                return result
+            # New top-level key (or document marker) ends the current list item
+            if indent == 0 and not is_item:
+                if block:
+                    yield section, '\n'.join(dedent(l) for l in block)
+                    block = []
+                section = None if stripped in ('---', '...') else stripped.split(':', 1)[0].strip()
+                list_indent = None
+                continue
+            
+            if section not in (None, 'nlu'):
+                continue
             
+            if is_item and (list_indent is None or indent == list_indent):
+                if block:
+                    yield section, '\n'.join(dedent(l) for l in block)
+                block = [line]
+                list_indent = indent
+            elif block:
+                block.append(line)
             else:
                 raise ValueError("Unsupported YAML format")
-                
+        
+        if block:
+            yield section, '\n'.join(dedent(l) for l in block)
+    
+    @staticmethod
+    def _iter_yaml(stream: TextIO) -> Iterator[Dict]:
+        """
+        Stream items of a Rasa NLU or simple-list YAML file, one list entry at a time
+        
+        Files without block-style list items (flow style) are loaded whole,
+        up to YAML_FLOW_MAX_SIZE characters.
+        """
+        found = False
+        # Text read before the first block item, None once over the flow-style limit
+        head = []
+        head_size = 0
+        
+        def lines() -> Iterator[str]:
+            nonlocal head, head_size
+            for line in stream:
+                if not found and head is not None:
+                    head_size += len(line)
+                    if head_size > YAML_FLOW_MAX_SIZE:
+                        head = None
+                    else:
+                        head.append(line)
+                yield line
+        
+        try:
+            for section, text in TrainingDataParser._iter_yaml_blocks(lines()):
+                found = True
+                yield from TrainingDataParser._iter_yaml_entries(section, TrainingDataParser._load_yaml(text))
+        except ValueError:
+            if found:
+                raise
+        
+        if found:
+            return
+        
+        if head is None:
+            raise ValueError(f"Flow-style YAML is limited to {YAML_FLOW_MAX_SIZE} characters")
+        text = ''.join(head) + stream.read(YAML_FLOW_MAX_SIZE - head_size + 1)
+        if len(text) > YAML_FLOW_MAX_SIZE:
+            raise ValueError(f"Flow-style YAML is limited to {YAML_FLOW_MAX_SIZE} characters")
+        
+        document = TrainingDataParser._load_yaml(text)
+        if isinstance(document, dict) and isinstance(document.get('nlu'), list):
+            yield from TrainingDataParser._iter_yaml_entries('nlu', document['nlu'])
+        elif isinstance(document, list):
+            yield from TrainingDataParser._iter_yaml_entries(None, document)
+        else:
+            raise ValueError("Unsupported YAML format")
+    
+    @staticmethod
+    def _load_yaml(text: str):
+        try:
+            return yaml.safe_load(text)
         except yaml.YAMLError as e:
             raise ValueError(f"Invalid YAML: {str(e)}")
     
     @staticmethod
-    def _parse_rasa_nlu(data: dict) -> List[Dict]:
-        """Parse Rasa NLU YAML format"""
-        result = []
-        
-        for item in data.get("nlu", []):
-            if "intent" in item and "examples" in item:
-                intent = item["intent"]
-                examples = item["examples"]
-                
-                # Parse examples (format: "- example text")
-                lines = examples.strip().split('\n')
-                for line in lines:
-                    line = line.strip()
-                    if line.startswith('-'):
-                        user_text = line[1:].strip()
-                        # Remove entity annotations [text](entity)
-                        user_text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', user_text)
-                        
-                        result.append({
-                            "user": user_text,
-                            "bot": f"Response for {intent}",  # Placeholder
-                            "intent": intent
-                        })
-        
-        return result
+    def _iter_yaml_entries(section: Optional[str], entries) -> Iterator[Dict]:
+        """Items of a list of Rasa NLU ('nlu' section) or simple entries"""
+        for entry in entries or []:
+            if section == 'nlu':
+                yield from TrainingDataParser._iter_rasa_nlu_entry(entry)
+            else:
+                item = TrainingDataParser._simple_item(entry)
+                if item:
+                    yield item
+    
+    @staticmethod
+    def _iter_rasa_nlu_entry(item) -> Iterator[Dict]:
+        """Examples of one `- intent: ... examples: |` entry"""
+        if isinstance(item, dict) and "intent" in item and "examples" in item:
+            intent = item["intent"]
+            examples = item["examples"]
+            
+            # Parse examples (format: "- example text")
+            lines = examples.strip().split('\n')
+            for line in lines:
+                line = line.strip()
+                if line.startswith('-'):
+                    user_text = line[1:].strip()
+                    # Remove entity annotations [text](entity)
+                    user_text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', user_text)
+                    
+                    yield {
+                        "user": user_text,
+                        "bot": f"Response for {intent}",  # Placeholder
+                        "intent": intent
+                    }
     
     @staticmethod
     def parse_csv(content: str) -> List[Dict]:
@@ -111,37 +320,85 @@ class TrainingDataParser:
         Parse CSV format
         Expected columns: user, bot, intent (or variations)
         """
+        return list(TrainingDataParser._iter_csv(StringIO(content)))
+    
+    @staticmethod
+    def _iter_csv(stream: TextIO) -> Iterator[Dict]:
+        """Stream CSV rows one at a time"""
         try:
-            csv_file = StringIO(content)
-            reader = csv.DictReader(csv_file)
+            reader = csv.DictReader(stream)
             
-            result = []
             for row in reader:
-                # Try different column names
-                user_text = (row.get("user") or row.get("User") or 
-                           row.get("question") or row.get("Question") or
-                           row.get("user_message") or "").strip()
-                
-                bot_text = (row.get("bot") or row.get("Bot") or
-                          row.get("answer") or row.get("Answer") or
-                          row.get("bot_response") or "").strip()
-                
-                intent = (row.get("intent") or row.get("Intent") or
-                         row.get("category") or row.get("Category") or
-                         "unknown").strip()
-                
-                if user_text and bot_text:
-                    result.append({
-                        "user": user_text,
-                        "bot": bot_text,
-                        "intent": intent
-                    })
-            
-            return result
+                item = TrainingDataParser._map_columns(row)
+                if item:
+                    yield item
             
+        except UnicodeDecodeError:
+            raise
         except Exception as e:
             raise ValueError(f"Invalid CSV: {str(e)}")
     
+    @staticmethod
+    def _map_columns(row: Dict) -> Optional[Dict]:
+        """Map a tabular row (CSV/Excel) to an item, trying different column names"""
+        user_text = (row.get("user") or row.get("User") or 
+                   row.get("question") or row.get("Question") or
+                   row.get("user_message") or "").strip()
+        
+        bot_text = (row.get("bot") or row.get("Bot") or
+                  row.get("answer") or row.get("Answer") or
+                  row.get("bot_response") or "").strip()
+        
+        intent = (row.get("intent") or row.get("Intent") or
+                 row.get("category") or row.get("Category") or
+                 "unknown").strip()
+        
+        if user_text and bot_text:
+            return {
+                "user": user_text,
+                "bot": bot_text,
+                "intent": intent
+            }
+        return None
+    
+    @staticmethod
+    def parse_xlsx(content: bytes) -> List[Dict]:
+        """
+        Parse Excel workbook (.xlsx)
+        Every sheet is read; the first non-empty row of a sheet is its header,
+        with the same column names as CSV
+        """
+        return list(TrainingDataParser._iter_xlsx(io.BytesIO(content)))
+    
+    @staticmethod
+    def _iter_xlsx(fileobj: BinaryIO) -> Iterator[Dict]:
+        """
+        Stream rows of all sheets with openpyxl's read-only mode
+        
+        Read-only workbooks load cells lazily from the zipped XML, so memory
+        stays flat for sheets with hundreds of thousands of rows.
+        """
+        try:
+            workbook = openpyxl.load_workbook(fileobj, read_only=True, data_only=True)
+        except (InvalidFileException, zipfile.BadZipFile, KeyError) as e:
+            raise ValueError(f"Invalid Excel file: {str(e)}")
+        
+        try:
+            for sheet in workbook.worksheets:
+                header = None
+                for values in sheet.iter_rows(values_only=True):
+                    cells = ["" if value is None else str(value) for value in values]
+                    if header is None:
+                        if any(cell.strip() for cell in cells):
+                            header = [cell.strip() for cell in cells]
+                        continue
+                    
+                    item = TrainingDataParser._map_columns(dict(zip(header, cells)))
+                    if item:
+                        yield item
+        finally:
+            workbook.close()
+    
     @staticmethod
     def parse_txt(content: str) -> List[Dict]:
         """
@@ -160,9 +417,11 @@ class TrainingDataParser:
            answer
            ---
         """
-        result = []
-        lines = content.strip().split('\n')
-        
+        return list(TrainingDataParser._iter_txt(StringIO(content)))
+    
+    @staticmethod
+    def _iter_txt(lines: Iterable[str]) -> Iterator[Dict]:
+        """Stream text blocks one item at a time"""
         current_item = {}
         
         for line in lines:
@@ -175,7 +434,7 @@ class TrainingDataParser:
                         current_item['intent'] = TrainingDataParser._auto_detect_intent(
                             current_item['user']
                         )
-                    result.append(current_item)
+                    yield current_item
                 current_item = {}
                 continue
             
@@ -203,40 +462,12 @@ class TrainingDataParser:
                 current_item['intent'] = TrainingDataParser._auto_detect_intent(
                     current_item['user']
                 )
-            result.append(current_item)
-        
-        return result
+            yield current_item
     
     @staticmethod
     def _auto_detect_intent(text: str) -> str:
         """Auto-detect intent from user message"""
-        text_lower = text.lower()
-        
-        # Greeting
-        if re.search(r'^(xin )?chào|^hi$|^hello', text_lower):
-            return 'chao_hoi'
-        
-        # Pricing
-        if re.search(r'giá|bao nhiêu|tiền|chi phí', text_lower):
-            return 'hoi_gia'
-        
-        # Contact
-        if re.search(r'liên hệ|số điện thoại|email|địa chỉ', text_lower):
-            return 'lien_he'
-        
-        # Features
-        if re.search(r'tính năng|chức năng|làm gì', text_lower):
-            return 'tinh_nang'
-        
-        # Thanks
-        if re.search(r'cảm ơn|thanks', text_lower):
-            return 'cam_on'
-        
-        # Goodbye
-        if re.search(r'tạm biệt|bye', text_lower):
-            return 'tam_biet'
-        
-        return 'unknown'
+        return parser_classifier.classify(text)
     
     @staticmethod
     def parse_markdown(content: str) -> List[Dict]:
@@ -248,11 +479,13 @@ class TrainingDataParser:
         - hello
         - hey
         """
-        result = []
+        return list(TrainingDataParser._iter_markdown(StringIO(content)))
+    
+    @staticmethod
+    def _iter_markdown(lines: Iterable[str]) -> Iterator[Dict]:
+        """Stream Markdown examples one at a time"""
         current_intent = None
         
-        lines = content.strip().split('\n')
-        
         for line in lines:
             line = line.strip()
             
@@ -268,13 +501,11 @@ class TrainingDataParser:
                 # Remove entity annotations
                 user_text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', user_text)
                 
-                result.append({
+                yield {
                     "user": user_text,
                     "bot": f"Response for {current_intent}",
                     "intent": current_intent
-                })
-        
-        return result
+                }
     
     @staticmethod
     def detect_format(filename: str, content: str) -> str:
@@ -283,20 +514,31 @@ class TrainingDataParser:
         
         if extension == 'json':
             return 'json'
+        elif extension in ['jsonl', 'ndjson']:
+            return 'jsonl'
         elif extension in ['yml', 'yaml']:
             return 'yaml'
         elif extension == 'csv':
             return 'csv'
+        elif extension in ['xlsx', 'xlsm']:
+            return 'xlsx'
         elif extension in ['txt', 'text']:
             return 'txt'
         elif extension in ['md', 'markdown']:
             return 'markdown'
         
         # Try to detect from content
+        if content.startswith('PK\x03\x04'):
+            # Zip container - the only one we accept is an Excel workbook
+            return 'xlsx'
+        
         content_sample = content[:200].strip()
         
-        if content_sample.startswith('[') or content_sample.startswith('{'):
+        if content_sample.startswith('['):
             return 'json'
+        elif content_sample.startswith('{'):
+            # Top-level objects are only valid as one record per line
+            return 'jsonl'
         elif content_sample.startswith('nlu:') or 'intent:' in content_sample:
             return 'yaml'
         elif '##' in content_sample and 'intent:' in content_sample:
@@ -306,8 +548,45 @@ class TrainingDataParser:
         
         return 'txt'
     
+    # Streaming item parser per format
+    _STREAM_PARSERS = {
+        'json': '_iter_json',
+        'jsonl': '_iter_jsonl',
+        'ndjson': '_iter_jsonl',
+        'yaml': '_iter_yaml',
+        'yml': '_iter_yaml',
+        'csv': '_iter_csv',
+        'xlsx': '_iter_xlsx',
+        'txt': '_iter_txt',
+        'text': '_iter_txt',
+        'markdown': '_iter_markdown',
+        'md': '_iter_markdown'
+    }
+    
+    # Formats that can skip invalid records and report them per line
+    _LINE_ERROR_FORMATS = {'jsonl', 'ndjson'}
+    
+    # Formats read from the binary file rather than decoded text
+    _BINARY_FORMATS = {'xlsx'}
+    
     @staticmethod
-    def parse(filename: str, content: str, format_hint: str = None) -> List[Dict]:
+    def _iter_items(format_type: str, stream, errors: Optional[List[Dict]] = None) -> Iterator[Dict]:
+        name = TrainingDataParser._STREAM_PARSERS.get(format_type)
+        if not name:
+            raise ValueError(f"Unsupported format: {format_type}")
+        parser = getattr(TrainingDataParser, name)
+        
+        if format_type in TrainingDataParser._LINE_ERROR_FORMATS:
+            return parser(stream, errors)
+        return parser(stream)
+    
+    @staticmethod
+    def parse(
+        filename: str,
+        content: str,
+        format_hint: str = None,
+        errors: Optional[List[Dict]] = None
+    ) -> List[Dict]:
         """
         Parse training data from any supported format
         
@@ -315,34 +594,96 @@ class TrainingDataParser:
             filename: Original filename
             content: File content as string
             format_hint: Optional format override
+            errors: Collects per-line errors for line-based formats (JSONL)
         
         Returns:
             List of training data dicts
         """
         format_type = format_hint or TrainingDataParser.detect_format(filename, content)
+        if format_type in TrainingDataParser._BINARY_FORMATS:
+            raise ValueError(f"{format_type} files must be parsed from the binary file (use iter_parse)")
         
-        parsers = {
-            'json': TrainingDataParser.parse_json,
-            'yaml': TrainingDataParser.parse_yaml,
-            'yml': TrainingDataParser.parse_yaml,
-            'csv': TrainingDataParser.parse_csv,
-            'txt': TrainingDataParser.parse_txt,
-            'text': TrainingDataParser.parse_txt,
-            'markdown': TrainingDataParser.parse_markdown,
-            'md': TrainingDataParser.parse_markdown
-        }
-        
-        parser = parsers.get(format_type)
-        if not parser:
-            raise ValueError(f"Unsupported format: {format_type}")
+        return list(TrainingDataParser._iter_items(format_type, StringIO(content), errors))
+    
+    @staticmethod
+    def iter_parse(
+        filename: str,
+        fileobj: BinaryIO,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        format_hint: str = None,
+        errors: Optional[List[Dict]] = None,
+        workers: Optional[int] = None
+    ) -> Iterator[List[Dict]]:
+        """
+        Parse a binary file object incrementally
+        
+        The file is decoded as UTF-8 while it is read, so memory stays bounded
+        by the chunk size (plus the largest single record) whatever the file size.
+        Large CSV/TXT files are parsed by a process pool (see parallel_parser).
+        
+        Args:
+            filename: Original filename
+            fileobj: Seekable binary file (e.g. UploadFile.file)
+            chunk_size: Rows per yielded chunk
+            format_hint: Optional format override
+            errors: Collects per-line errors for line-based formats (JSONL)
+            workers: Parse processes for CSV/TXT; None picks by file size, 1 disables
         
-        return parser(content)
+        Yields:
+            Lists of up to chunk_size training data dicts
+        
+        Raises:
+            ValueError: Unsupported or invalid content
+            UnicodeDecodeError: File is not UTF-8
+        """
+        if not format_hint:
+            start = fileobj.tell()
+            sample = fileobj.read(1024).decode('utf-8', errors='ignore')
+            fileobj.seek(start)
+            format_hint = TrainingDataParser.detect_format(filename, sample)
+        
+        if format_hint in TrainingDataParser._BINARY_FORMATS:
+            yield from TrainingDataParser._chunked(
+                TrainingDataParser._iter_items(format_hint, fileobj, errors), chunk_size
+            )
+            return
+        
+        from .parallel_parser import choose_workers, iter_parse_parallel
+        
+        if workers is None:
+            start = fileobj.tell()
+            size = fileobj.seek(0, io.SEEK_END) - start
+            fileobj.seek(start)
+            workers = choose_workers(size, format_hint)
+        
+        stream = io.TextIOWrapper(fileobj, encoding='utf-8', newline='')
+        try:
+            if workers > 1:
+                items = iter_parse_parallel(format_hint, stream, workers)
+            else:
+                items = TrainingDataParser._iter_items(format_hint, stream, errors)
+            yield from TrainingDataParser._chunked(items, chunk_size)
+        finally:
+            # Leave the underlying upload open for its owner
+            stream.detach()
+    
+    @staticmethod
+    def _chunked(items: Iterable[Dict], chunk_size: int) -> Iterator[List[Dict]]:
+        chunk = []
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
     
     @staticmethod
     def enhance_with_intelligent_classification(
         data: List[Dict],
         bot_id: int,
-        rasa_url: str = "http://localhost:5005"
+        rasa_url: str = "http://localhost:5005",
+        classifier=None
     ) -> List[Dict]:
         """
         Enhance training data with intelligent intent classification using Rasa
@@ -351,22 +692,22 @@ class TrainingDataParser:
             data: Parsed training data (may have 'unknown' intents)
             bot_id: Bot ID to use its trained model
             rasa_url: Rasa server URL
+            classifier: Initialized classifier to reuse across chunks
             
         Returns:
             Enhanced training data with classified intents
         """
         from .intent_classifier import HybridIntentClassifier
         
-        classifier = HybridIntentClassifier(rasa_url)
-        classifier.initialize(bot_id)
+        if classifier is None:
+            classifier = HybridIntentClassifier(rasa_url)
+            classifier.initialize(bot_id)
         
-        enhanced_data = []
-        for item in data:
-            # Only classify if intent is unknown or missing
-            if item.get('intent') in [None, '', 'unknown']:
-                detected_intent = classifier.classify(item['user'])
+        # Only classify if intent is unknown or missing - in one deduplicated batch
+        unknown_items = [item for item in data if item.get('intent') in [None, '', 'unknown']]
+        if unknown_items:
+            detected_intents = classifier.classify_batch([item['user'] for item in unknown_items])
+            for item, detected_intent in zip(unknown_items, detected_intents):
                 item['intent'] = detected_intent
-            
-            enhanced_data.append(item)
         
-        return enhanced_data
+        return data
@@ -1,18 +1,34 @@
 """
 Intelligent intent classification using Rasa NLU
 """
+import os
 import requests
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Optional, Tuple
 import logging
 
+from .rule_classifier import RuleClassifier, default_classifier
+
 logger = logging.getLogger(__name__)
 
+# Max parse requests in flight to Rasa during batch classification
+RASA_CLASSIFY_CONCURRENCY = int(os.getenv("RASA_CLASSIFY_CONCURRENCY", "8"))
+# Distinct messages remembered by HybridIntentClassifier before its cache is reset
+CLASSIFY_CACHE_SIZE = int(os.getenv("CLASSIFY_CACHE_SIZE", "100000"))
+
 
 class IntentClassifier:
     """Use Rasa NLU to classify intents intelligently"""
     
-    def __init__(self, rasa_url: str = "http://localhost:5005"):
+    def __init__(self, rasa_url: str = "http://localhost:5005", concurrency: int = RASA_CLASSIFY_CONCURRENCY):
         self.rasa_url = rasa_url
+        self.concurrency = max(1, concurrency)
+        # Keep-alive connections shared by all requests (and threads) of this classifier
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
     
     def classify_batch(
         self, 
@@ -29,15 +45,21 @@ class IntentClassifier:
             confidence_threshold: Minimum confidence (0-1) to accept classification
             
         Returns:
-            List of detected intents
+            List of detected intents, in the same order as messages
         """
-        results = []
-        
-        for message in messages:
-            intent = self.classify_single(message, model_name, confidence_threshold)
-            results.append(intent)
-        
-        return results
+        # Each distinct message is sent once, with at most `concurrency` requests in flight
+        unique = list(dict.fromkeys(messages))
+        if len(unique) <= 1 or self.concurrency == 1:
+            intents = [self.classify_single(message, model_name, confidence_threshold) for message in unique]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(unique))) as executor:
+                intents = list(executor.map(
+                    lambda message: self.classify_single(message, model_name, confidence_threshold),
+                    unique
+                ))
+        
+        detected = dict(zip(unique, intents))
+        return [detected[message] for message in messages]
     
     def classify_single(
         self, 
@@ -53,7 +75,7 @@ class IntentClassifier:
         """
         try:
             # Parse message using Rasa NLU
-            response = requests.post(
+            response = self.session.post(
                 f"{self.rasa_url}/model/parse",
                 json={
                     "text": message,
@@ -96,7 +118,7 @@ class IntentClassifier:
         """
         try:
             # Get model metadata
-            response = requests.get(
+            response = self.session.get(
                 f"{self.rasa_url}/model/metadata",
                 timeout=5
             )
@@ -120,7 +142,7 @@ class IntentClassifier:
     def is_rasa_available(self) -> bool:
         """Check if Rasa server is running"""
         try:
-            response = requests.get(f"{self.rasa_url}/status", timeout=2)
+            response = self.session.get(f"{self.rasa_url}/status", timeout=2)
             return response.status_code == 200
         except:
             return False
@@ -134,41 +156,35 @@ class HybridIntentClassifier:
     def __init__(self, rasa_url: str = "http://rasa:5005"):
         self.rasa_classifier = IntentClassifier(rasa_url)
         self.use_rasa = False
+        self.rules = default_classifier
+        # message -> intent, kept for the lifetime of this classifier (one import)
+        self._cache: Dict[str, str] = {}
     
-    def initialize(self, bot_id: int) -> bool:
+    def initialize(self, bot_id: int, custom_rules: Optional[List[Tuple[str, str]]] = None) -> bool:
         """
         Initialize classifier for a specific bot
         
         Args:
             bot_id: Bot ID to use its trained model
+            custom_rules: Bot's own (pattern, intent) rules, checked before the
+                built-in fallback rules
             
         Returns:
             True if Rasa is available and will be used
         """
-        # Check if Rasa is available
+        self._cache.clear()
+        self.rules = RuleClassifier(custom_rules) + default_classifier if custom_rules else default_classifier
+        
+        # Check if Rasa is available (one /status call)
         if not self.rasa_classifier.is_rasa_available():
             logger.warning("Rasa not available, will use regex fallback")
             self.use_rasa = False
             return False
         
-        # Check if bot has trained model
-        model_name = f"bot_{bot_id}"
-        try:
-            response = requests.get(
-                f"{self.rasa_classifier.rasa_url}/status",
-                timeout=2
-            )
-            if response.status_code == 200:
-                self.model_name = model_name
-                self.use_rasa = True
-                logger.info(f"Using Rasa NLU for intent classification (model: {model_name})")
-                return True
-        except:
-            pass
-        
-        logger.warning("Bot model not found, will use regex fallback")
-        self.use_rasa = False
-        return False
+        self.model_name = f"bot_{bot_id}"
+        self.use_rasa = True
+        logger.info(f"Using Rasa NLU for intent classification (model: {self.model_name})")
+        return True
     
     def classify(self, message: str) -> str:
         """
@@ -180,59 +196,37 @@ class HybridIntentClassifier:
         Returns:
             Detected intent
         """
-        if self.use_rasa:
-            return self.rasa_classifier.classify_single(
-                message, 
-                self.model_name,
-                confidence_threshold=0.5  # Lower threshold for auto-classification
-            )
-        else:
-            return self._regex_classify(message)
+        return self.classify_batch([message])[0]
     
-    def _regex_classify(self, text: str) -> str:
-        """Fallback regex-based classification"""
-        import re
-        
-        text_lower = text.lower()
-        
-        # Greeting
-        if re.search(r'^(xin )?chào|^hi$|^hello|^hey', text_lower):
-            return 'chao_hoi'
-        
-        # Pricing
-        if re.search(r'giá|bao nhiêu|tiền|chi phí|phí', text_lower):
-            return 'hoi_gia'
-        
-        # Contact
-        if re.search(r'liên hệ|số điện thoại|email|địa chỉ|hotline', text_lower):
-            return 'lien_he'
-        
-        # Features
-        if re.search(r'tính năng|chức năng|làm gì|hỗ trợ gì|có gì', text_lower):
-            return 'tinh_nang'
-        
-        # Shipping
-        if re.search(r'giao hàng|vận chuyển|ship|giao tận nơi', text_lower):
-            return 'giao_hang'
-        
-        # Payment
-        if re.search(r'thanh toán|trả tiền|payment|cod', text_lower):
-            return 'thanh_toan'
-        
-        # Warranty
-        if re.search(r'bảo hành|warranty|đổi trả', text_lower):
-            return 'bao_hanh'
-        
-        # Thanks
-        if re.search(r'cảm ơn|thanks|thank you', text_lower):
-            return 'cam_on'
-        
-        # Goodbye
-        if re.search(r'tạm biệt|bye|goodbye', text_lower):
-            return 'tam_biet'
+    def classify_batch(self, messages: List[str]) -> List[str]:
+        """
+        Classify many messages, reusing results already seen by this classifier
         
-        # Order status
-        if re.search(r'đơn hàng|order|kiểm tra đơn', text_lower):
-            return 'don_hang'
+        Args:
+            messages: User messages (duplicates are classified once)
+            
+        Returns:
+            Detected intents, in the same order as messages
+        """
+        detected = {message: self._cache[message] for message in messages if message in self._cache}
+        pending = [message for message in dict.fromkeys(messages) if message not in detected]
+        if pending:
+            if self.use_rasa:
+                intents = self.rasa_classifier.classify_batch(
+                    pending,
+                    self.model_name,
+                    confidence_threshold=0.5  # Lower threshold for auto-classification
+                )
+            else:
+                intents = self.rules.classify_many(pending)
+            detected.update(zip(pending, intents))
+            
+            if len(self._cache) + len(pending) > CLASSIFY_CACHE_SIZE:
+                self._cache.clear()
+            self._cache.update(zip(pending, intents))
         
-        return 'unknown'
+        return [detected[message] for message in messages]
+    
+    def _regex_classify(self, text: str) -> str:
+        """Fallback rule-based classification"""
+        return self.rules.classify(text)
@@ -0,0 +1,168 @@
+"""
+Parallel parsing of large CSV/TXT uploads
+
+The upload is cut into text chunks at record boundaries (CSV rows outside
+quoted fields, blank-line/`---` separated TXT blocks). A process pool parses
+and auto-tags the chunks, and results are yielded back in file order.
+"""
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import StringIO
+import multiprocessing
+from typing import Dict, Iterator, List, Optional, TextIO
+
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(min(os.cpu_count() or 1, 4))))
+PARSE_CHUNK_CHARS = int(os.getenv("PARSE_CHUNK_CHARS", str(4 * 1024 * 1024)))
+# Uploads smaller than this are parsed in-process (pool overhead is not worth it)
+PARALLEL_PARSE_MIN_BYTES = int(os.getenv("PARALLEL_PARSE_MIN_BYTES", str(16 * 1024 * 1024)))
+
+PARALLEL_FORMATS = {'csv', 'txt', 'text'}
+
+TXT_SEPARATORS = ('', '---')
+
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Shared pool per worker count, created on first use
+
+    Workers are spawned rather than forked: the API process is multi-threaded
+    and forking it could copy held locks into the children.
+    """
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            _pools[workers] = pool
+        return pool
+
+
+def _read_block(stream: TextIO, size: int) -> str:
+    """Read about size characters, extended to the end of the current line"""
+    block = stream.read(size)
+    if block.endswith('\r'):
+        # Don't split a \r\n pair
+        block += stream.read(1)
+    if block and not block.endswith(('\n', '\r')):
+        block += stream.readline()
+    return block
+
+
+def _last_line(block: str) -> str:
+    end = len(block)
+    if block.endswith('\r\n'):
+        end -= 2
+    elif block.endswith(('\n', '\r')):
+        end -= 1
+    start = max(block.rfind('\n', 0, end), block.rfind('\r', 0, end)) + 1
+    return block[start:end]
+
+
+def split_csv(stream: TextIO, chunk_chars: int = PARSE_CHUNK_CHARS) -> Iterator[tuple]:
+    """
+    Split CSV text into (header, body) chunks at row boundaries
+
+    A line break ends a row only when the quotes seen so far are balanced,
+    so quoted fields with embedded newlines are never cut.
+    """
+    header = ""
+    quotes = 0
+    while True:
+        line = stream.readline()
+        if not line:
+            return
+        header += line
+        quotes += line.count('"')
+        if quotes % 2 == 0:
+            break
+
+    while True:
+        block = _read_block(stream, chunk_chars)
+        if not block:
+            return
+        quotes = block.count('"')
+        while quotes % 2:
+            line = stream.readline()
+            if not line:
+                break
+            block += line
+            quotes += line.count('"')
+        yield header, block
+
+
+def split_txt(stream: TextIO, chunk_chars: int = PARSE_CHUNK_CHARS) -> Iterator[tuple]:
+    """Split TXT text into chunks that end on a blank or `---` separator line"""
+    while True:
+        block = _read_block(stream, chunk_chars)
+        if not block:
+            return
+        last = _last_line(block)
+        while last.strip() not in TXT_SEPARATORS:
+            line = stream.readline()
+            if not line:
+                break
+            block += line
+            last = line
+        yield "", block
+
+
+def _parse_chunk(format_type: str, header: str, text: str) -> List[Dict]:
+    """Worker entry point - parse one chunk with the regular in-process parser"""
+    from .data_parsers import TrainingDataParser
+
+    if format_type == 'csv':
+        return list(TrainingDataParser._iter_csv(StringIO(header + text)))
+    return list(TrainingDataParser._iter_txt(StringIO(text)))
+
+
+def iter_parse_parallel(
+    format_type: str,
+    stream: TextIO,
+    workers: int = PARSE_WORKERS,
+    chunk_chars: int = PARSE_CHUNK_CHARS
+) -> Iterator[Dict]:
+    """
+    Parse a CSV/TXT stream in a process pool, yielding items in file order
+
+    At most 2 chunks per worker are in flight, so memory stays bounded.
+    """
+    if format_type not in PARALLEL_FORMATS:
+        raise ValueError(f"Parallel parsing is not supported for {format_type}")
+
+    splitter = split_csv if format_type == 'csv' else split_txt
+    pool = _get_pool(workers)
+    pending = deque()
+
+    try:
+        for header, text in splitter(stream, chunk_chars):
+            pending.append(pool.submit(_parse_chunk, format_type, header, text))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM-killed) - don't hand the dead pool to the next upload
+        with _pools_lock:
+            if _pools.get(workers) is pool:
+                del _pools[workers]
+        raise
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def choose_workers(size_bytes: Optional[int], format_type: str) -> int:
+    """Number of parse workers for an upload of the given size (1 = in-process)"""
+    if format_type not in PARALLEL_FORMATS or PARSE_WORKERS <= 1:
+        return 1
+    if size_bytes is None or size_bytes < PARALLEL_PARSE_MIN_BYTES:
+        return 1
+    return PARSE_WORKERS
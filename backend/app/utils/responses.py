@@ -0,0 +1,38 @@
+"""
+Fast JSON responses for list endpoints
+
+Endpoints keep their response_model (for the OpenAPI schema) but return one
+of these responses, which FastAPI sends as-is instead of validating every
+item and running the result through jsonable_encoder:
+
+- rows_response: rows of a column projection, dumped straight to JSON by orjson
+- json_response: any dict/list of plain values (e.g. rows merged by hand)
+- model_response: ORM objects validated and dumped by a TypeAdapter built once
+  at import time (pydantic-core does both steps)
+"""
+from typing import Any, Iterable, Mapping, Optional
+
+import orjson
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def json_response(content: Any, headers: Optional[Mapping[str, str]] = None) -> Response:
+    """Serialize content with orjson (datetimes as ISO 8601)"""
+    return Response(orjson.dumps(content), media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+def rows_response(rows: Iterable[Any], headers: Optional[Mapping[str, str]] = None) -> Response:
+    """JSON array of SQLAlchemy rows (select of columns or text() results)"""
+    return json_response([row._asdict() for row in rows], headers=headers)
+
+
+def model_response(adapter: TypeAdapter, value: Any, headers: Optional[Mapping[str, str]] = None) -> Response:
+    """Validate ORM objects (from_attributes) with a precompiled TypeAdapter and dump them to JSON"""
+    return Response(
+        adapter.dump_json(adapter.validate_python(value, from_attributes=True)),
+        media_type=JSON_MEDIA_TYPE,
+        headers=headers
+    )
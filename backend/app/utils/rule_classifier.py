@@ -0,0 +1,97 @@
+"""
+Rule-based intent classification shared by the file parsers and the Rasa fallback
+"""
+import re
+from typing import Iterable, List, Sequence, Tuple
+
+# Fallback rules of HybridIntentClassifier when Rasa is unavailable, checked in order
+DEFAULT_RULES = [
+    (r'^(xin )?chào|^hi$|^hello|^hey', 'chao_hoi'),                  # Greeting
+    (r'giá|bao nhiêu|tiền|chi phí|phí', 'hoi_gia'),                   # Pricing
+    (r'liên hệ|số điện thoại|email|địa chỉ|hotline', 'lien_he'),     # Contact
+    (r'tính năng|chức năng|làm gì|hỗ trợ gì|có gì', 'tinh_nang'),    # Features
+    (r'giao hàng|vận chuyển|ship|giao tận nơi', 'giao_hang'),        # Shipping
+    (r'thanh toán|trả tiền|payment|cod', 'thanh_toan'),              # Payment
+    (r'bảo hành|warranty|đổi trả', 'bao_hanh'),                      # Warranty
+    (r'cảm ơn|thanks|thank you', 'cam_on'),                          # Thanks
+    (r'tạm biệt|bye|goodbye', 'tam_biet'),                           # Goodbye
+    (r'đơn hàng|order|kiểm tra đơn', 'don_hang'),                    # Order status
+]
+
+# Auto-detected intents for TXT items without one, checked in order
+PARSER_RULES = [
+    (r'^(xin )?chào|^hi$|^hello', 'chao_hoi'),          # Greeting
+    (r'giá|bao nhiêu|tiền|chi phí', 'hoi_gia'),          # Pricing
+    (r'liên hệ|số điện thoại|email|địa chỉ', 'lien_he'),  # Contact
+    (r'tính năng|chức năng|làm gì', 'tinh_nang'),        # Features
+    (r'cảm ơn|thanks', 'cam_on'),                        # Thanks
+    (r'tạm biệt|bye', 'tam_biet'),                       # Goodbye
+]
+
+# Patterns made only of literal alternatives are matched with substring checks
+_REGEX_SYNTAX = re.compile(r'[\\.^$*+?{}\[\]()]')
+
+
+def validate_pattern(pattern: str) -> None:
+    """
+    Check that a custom rule pattern compiles
+
+    Raises:
+        ValueError: If the pattern is not a valid regular expression
+    """
+    try:
+        re.compile(pattern)
+    except re.error as e:
+        raise ValueError(f"Invalid pattern: {e}")
+
+
+class RuleClassifier:
+    """
+    Classify messages with ordered (pattern, intent) rules; the first matching rule wins
+
+    Rules are compiled once. Rules that are plain keyword lists (`a|b|c`) skip
+    the regex engine and use substring checks; the rest use a precompiled
+    case-insensitive search.
+    """
+
+    def __init__(self, rules: Iterable[Tuple[str, str]], default: str = 'unknown'):
+        self.rules: List[Tuple[str, str]] = list(rules)
+        self.default = default
+        self._matchers = []
+        for pattern, intent in self.rules:
+            if _REGEX_SYNTAX.search(pattern):
+                self._matchers.append((None, re.compile(pattern, re.IGNORECASE).search, intent))
+            else:
+                self._matchers.append((tuple(pattern.lower().split('|')), None, intent))
+
+    def classify(self, text: str) -> str:
+        """Intent of the first rule matching text, or the default"""
+        text = text.lower()
+        for keywords, search, intent in self._matchers:
+            if keywords is None:
+                if search(text):
+                    return intent
+            else:
+                for keyword in keywords:
+                    if keyword in text:
+                        return intent
+        return self.default
+
+    def classify_many(self, messages: Sequence[str]) -> List[str]:
+        """Classify a list of messages; repeated messages are matched once"""
+        detected = {}
+        results = []
+        for message in messages:
+            intent = detected.get(message)
+            if intent is None:
+                intent = detected[message] = self.classify(message)
+            results.append(intent)
+        return results
+
+    def __add__(self, other: 'RuleClassifier') -> 'RuleClassifier':
+        """Rules of self checked before the rules of other"""
+        return RuleClassifier(self.rules + other.rules, default=other.default)
+
+
+default_classifier = RuleClassifier(DEFAULT_RULES)
+parser_classifier = RuleClassifier(PARSER_RULES)
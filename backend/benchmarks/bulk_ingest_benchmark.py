@@ -0,0 +1,88 @@
+"""
+Benchmark - training data ingestion: ORM loop vs COPY bulk path
+
+Creates a throwaway user and bot in the configured database (DATABASE_URL),
+inserts N synthetic rows with each method and prints rows/sec. Everything
+created is deleted afterwards.
+
+Usage (from backend/):
+    python -m benchmarks.bulk_ingest_benchmark
+    python -m benchmarks.bulk_ingest_benchmark --sizes 10000 100000 --skip-orm-above 100000
+"""
+import time
+import uuid
+import argparse
+
+from app.database import SessionLocal
+from app.models import User, Bot, TrainingData
+from app.services.bulk_ingest import bulk_insert_training_data
+
+
+def generate_rows(count: int):
+    for i in range(count):
+        yield {
+            "user_message": f"Câu hỏi mẫu số {i} về giá sản phẩm",
+            "bot_response": f"Câu trả lời mẫu số {i}, giá dao động từ 100k-500k",
+            "intent": f"intent_{i % 50}"
+        }
+
+
+def orm_loop(db, bot_id: int, count: int) -> None:
+    """Previous upload path: one ORM object per row, one flush at commit"""
+    for item in generate_rows(count):
+        db.add(TrainingData(bot_id=bot_id, **item))
+    db.commit()
+
+
+def bulk_copy(db, bot_id: int, count: int) -> None:
+    bulk_insert_training_data(db, bot_id, generate_rows(count))
+    db.commit()
+
+
+def measure(method, db, bot_id: int, count: int) -> float:
+    started = time.perf_counter()
+    method(db, bot_id, count)
+    elapsed = time.perf_counter() - started
+
+    db.query(TrainingData).filter(TrainingData.bot_id == bot_id).delete(synchronize_session=False)
+    db.commit()
+    db.expunge_all()
+    return count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--skip-orm-above", type=int, default=None,
+                        help="Skip the ORM loop for larger sizes (it can take very long at 1M rows)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    user = User(email=f"bench-{uuid.uuid4().hex[:8]}@example.com", password_hash="-", full_name="benchmark")
+    db.add(user)
+    db.flush()
+    bot = Bot(user_id=user.id, name="ingest benchmark")
+    db.add(bot)
+    db.commit()
+    user_id, bot_id = user.id, bot.id
+
+    try:
+        print(f"{'rows':>10} {'ORM rows/s':>12} {'COPY rows/s':>12} {'speedup':>8}")
+        for size in args.sizes:
+            orm_rate = None
+            if args.skip_orm_above is None or size <= args.skip_orm_above:
+                orm_rate = measure(orm_loop, db, bot_id, size)
+            copy_rate = measure(bulk_copy, db, bot_id, size)
+
+            orm_text = f"{orm_rate:>12,.0f}" if orm_rate else f"{'skipped':>12}"
+            speedup = f"{copy_rate / orm_rate:>7.1f}x" if orm_rate else f"{'-':>8}"
+            print(f"{size:>10,} {orm_text} {copy_rate:>12,.0f} {speedup}")
+    finally:
+        db.rollback()
+        db.delete(db.get(User, user_id))
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark - serial vs process-pool parsing of large CSV/TXT uploads
+
+Generates synthetic Q&A files, parses them through TrainingDataParser.iter_parse
+with 1 (in-process), 2, 4 and 8 workers and prints rows/sec. Every run is
+checked to produce exactly the serial result, in the same order.
+
+Usage (from backend/):
+    python -m benchmarks.parse_benchmark
+    python -m benchmarks.parse_benchmark --rows 2000000 --workers 1 4 8 --formats csv
+"""
+import os
+import time
+import hashlib
+import argparse
+import tempfile
+
+from app.utils.data_parsers import TrainingDataParser
+
+QUESTIONS = [
+    "Xin chào shop",
+    "Giá sản phẩm này bao nhiêu vậy?",
+    "Cho mình xin số điện thoại liên hệ",
+    "App có những tính năng gì?",
+    "Cảm ơn bạn nhiều",
+    "Tạm biệt nhé",
+    "Đơn hàng của tôi đang ở đâu?",
+]
+
+
+def write_csv(path: str, rows: int) -> None:
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("question,answer,category\n")
+        for i in range(rows):
+            question = QUESTIONS[i % len(QUESTIONS)]
+            if i % 10 == 0:
+                # Quoted field with an embedded newline and quotes
+                f.write(f'"{question} #{i}","Dòng 1\nDòng 2 ""trích dẫn"" {i}",intent_{i % 20}\n')
+            else:
+                f.write(f"{question} #{i},Câu trả lời số {i},intent_{i % 20}\n")
+
+
+def write_txt(path: str, rows: int) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(rows):
+            question = QUESTIONS[i % len(QUESTIONS)]
+            if i % 2:
+                f.write(f"User: {question} #{i}\nBot: Câu trả lời số {i}\n\n")
+            else:
+                f.write(f"Q: {question} #{i}\nA: Câu trả lời số {i}\n#intent_{i % 20}\n---\n")
+
+
+def parse_file(path: str, workers: int):
+    digest = hashlib.sha256()
+    count = 0
+    started = time.perf_counter()
+    with open(path, "rb") as f:
+        for chunk in TrainingDataParser.iter_parse(os.path.basename(path), f, workers=workers):
+            for item in chunk:
+                digest.update(f"{item['user']}\x1f{item['bot']}\x1f{item['intent']}\x1e".encode("utf-8"))
+            count += len(chunk)
+    return count, digest.hexdigest(), time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--formats", nargs="+", default=["csv", "txt"], choices=["csv", "txt"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for format_type in args.formats:
+            path = os.path.join(tmp_dir, f"benchmark.{format_type}")
+            (write_csv if format_type == "csv" else write_txt)(path, args.rows)
+            size_mb = os.path.getsize(path) / 1024 / 1024
+            print(f"\n{format_type.upper()}: {args.rows:,} rows, {size_mb:.0f} MB")
+            print(f"{'workers':>8} {'seconds':>9} {'rows/s':>12} {'speedup':>8}")
+
+            baseline = None
+            for workers in args.workers:
+                if workers > 1:
+                    # Warm the pool so process start-up is not measured
+                    parse_file(path, workers)
+                count, digest, elapsed = parse_file(path, workers)
+
+                if baseline is None:
+                    baseline = (digest, elapsed)
+                elif digest != baseline[0]:
+                    raise SystemExit(f"{workers} workers produced a different result than the first run")
+
+                print(f"{workers:>8} {elapsed:>9.2f} {count / elapsed:>12,.0f} {baseline[1] / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark - rule-based intent classification throughput
+
+Compares the former per-message chain of re.search calls (patterns looked up
+in the re cache on every call) with RuleClassifier.classify and
+RuleClassifier.classify_many on synthetic messages, and checks that all of
+them return the same intents.
+
+Usage (from backend/):
+    python -m benchmarks.rule_classifier_benchmark
+    python -m benchmarks.rule_classifier_benchmark --messages 500000 --distinct 20000
+"""
+import re
+import time
+import random
+import argparse
+
+from app.utils.rule_classifier import DEFAULT_RULES, default_classifier
+
+WORDS = (
+    "xin chào giá bao nhiêu ship cod cảm ơn tạm biệt đơn hàng hello "
+    "tôi muốn hỏi về sản phẩm này nhé bạn ơi khi nào mở cửa vậy shop có màu xanh không"
+).split()
+
+
+def legacy_classify(text: str) -> str:
+    """The previous fallback: one re.search per rule, compiled patterns looked up per call"""
+    text_lower = text.lower()
+    for pattern, intent in DEFAULT_RULES:
+        if re.search(pattern, text_lower):
+            return intent
+    return 'unknown'
+
+
+def make_messages(count: int, distinct: int, seed: int = 42):
+    rng = random.Random(seed)
+    pool = [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 20)))
+        for _ in range(distinct)
+    ]
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def timed(func, messages):
+    started = time.perf_counter()
+    result = func(messages)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200_000)
+    parser.add_argument("--distinct", type=int, default=50_000)
+    args = parser.parse_args()
+
+    messages = make_messages(args.messages, args.distinct)
+    print(f"{args.messages:,} messages, {args.distinct:,} distinct")
+    print(f"{'method':>24} {'seconds':>9} {'msgs/s':>12} {'speedup':>8}")
+
+    runs = [
+        ("legacy re.search chain", lambda batch: [legacy_classify(m) for m in batch]),
+        ("RuleClassifier.classify", lambda batch: [default_classifier.classify(m) for m in batch]),
+        ("classify_many", default_classifier.classify_many),
+    ]
+    baseline = None
+    for name, func in runs:
+        intents, elapsed = timed(func, messages)
+        if baseline is None:
+            baseline = (intents, elapsed)
+        elif intents != baseline[0]:
+            raise SystemExit(f"{name} returned different intents than the legacy chain")
+        print(f"{name:>24} {elapsed:>9.2f} {len(messages) / elapsed:>12,.0f} {baseline[1] / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark - serializing a training data listing
+
+Compares the former path (return ORM objects, FastAPI validates them against
+response_model=List[TrainingData] and renders with the standard JSON encoder)
+with model_response (precompiled TypeAdapter) and rows_response (column
+projection rows dumped by orjson). Checks that all of them produce the same
+JSON, then prints the gzip size of the body.
+
+Runs in-process on synthetic rows; no database is needed.
+
+Usage (from backend/):
+    python -m benchmarks.serialization_benchmark
+    python -m benchmarks.serialization_benchmark --rows 200000 --repeat 5
+"""
+import gzip
+import json
+import time
+import asyncio
+import argparse
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import TypeAdapter
+
+from app.models import TrainingData
+from app.schemas import TrainingData as TrainingDataSchema
+from app.utils.responses import model_response, rows_response
+
+# Same shape as a row of TRAINING_DATA_COLUMNS
+TrainingDataRow = namedtuple("TrainingDataRow", "id bot_id user_message bot_response intent created_at")
+
+
+def make_rows(count: int) -> List[TrainingDataRow]:
+    started = datetime(2026, 1, 1, tzinfo=timezone(timedelta(hours=7)))
+    return [
+        TrainingDataRow(
+            id=i,
+            bot_id=1,
+            user_message=f"Câu hỏi mẫu số {i} về giá sản phẩm",
+            bot_response=f"Câu trả lời mẫu số {i}, giá dao động từ 100k-500k",
+            intent=f"intent_{i % 50}" if i % 10 else None,
+            created_at=started + timedelta(seconds=i)
+        )
+        for i in range(count)
+    ]
+
+
+def response_model_body(objects) -> bytes:
+    """What FastAPI did with `return training_data` and response_model=List[TrainingData]"""
+    field = create_response_field(name="Response_get_training_data", type_=List[TrainingDataSchema])
+    content = asyncio.run(serialize_response(field=field, response_content=objects, is_coroutine=False))
+    return JSONResponse(content).body
+
+
+def timed(func, data, repeat: int):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = func(data)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return body, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3, help="Best of N runs is reported")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    objects = [TrainingData(**row._asdict()) for row in rows]
+    adapter = TypeAdapter(List[TrainingDataSchema])
+
+    runs = [
+        ("response_model (before)", response_model_body, objects),
+        ("TypeAdapter", lambda data: model_response(adapter, data).body, objects),
+        ("orjson rows", lambda data: rows_response(data).body, rows),
+    ]
+
+    print(f"{args.rows:,} rows, best of {args.repeat}")
+    print(f"{'method':>24} {'seconds':>9} {'rows/s':>12} {'speedup':>8}")
+    baseline = None
+    for name, func, data in runs:
+        body, elapsed = timed(func, data, args.repeat)
+        if baseline is None:
+            baseline = (json.loads(body), elapsed)
+        elif json.loads(body) != baseline[0]:
+            raise SystemExit(f"{name} produced different JSON than response_model")
+        print(f"{name:>24} {elapsed:>9.3f} {args.rows / elapsed:>12,.0f} {baseline[1] / elapsed:>7.1f}x")
+
+    started = time.perf_counter()
+    compressed = gzip.compress(body, compresslevel=9)
+    elapsed = time.perf_counter() - started
+    print(f"\nbody {len(body) / 1024:,.0f} KiB, gzip {len(compressed) / 1024:,.0f} KiB "
+          f"({len(compressed) / len(body):.0%}) in {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
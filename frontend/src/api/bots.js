@@ -25,9 +25,16 @@ export const botsAPI = {
     return response.data;
   },
 
-  // Delete bot
+  // Delete bot (returns the background purge job)
   deleteBot: async (botId) => {
-    await apiClient.delete(`/api/bots/${botId}`);
+    const response = await apiClient.delete(`/api/bots/${botId}`);
+    return response.data;
+  },
+
+  // Get purge job progress of a deleted bot
+  getPurgeJob: async (jobId) => {
+    const response = await apiClient.get(`/api/bots/purge-jobs/${jobId}`);
+    return response.data;
   },
 
   // Train bot
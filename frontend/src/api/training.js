@@ -1,8 +1,14 @@
 import apiClient from './axios';
 
 export const trainingAPI = {
-  // Get training data with optional filters and sorting
+  // Get the first page of training data with optional filters and sorting
   getTrainingData: async (botId, filters = {}) => {
+    const { data } = await trainingAPI.getTrainingDataPage(botId, filters);
+    return data;
+  },
+
+  // Get one page of training data; pass the returned nextCursor to get the next page
+  getTrainingDataPage: async (botId, filters = {}, cursor = null) => {
     const params = new URLSearchParams();
     if (filters.user_message) {
       params.append('user_message', filters.user_message);
@@ -20,9 +26,45 @@ export const trainingAPI = {
       params.append('sort_order', filters.sort_order);
     }
     
+    if (filters.limit) {
+      params.append('limit', filters.limit);
+    }
+    if (cursor) {
+      params.append('cursor', cursor);
+    }
+    
     const queryString = params.toString();
     const url = `/api/bots/${botId}/training/${queryString ? `?${queryString}` : ''}`;
     const response = await apiClient.get(url);
+    return {
+      data: response.data,
+      nextCursor: response.headers['x-next-cursor'] || null,
+    };
+  },
+
+  // Get every page of training data matching the filters
+  getAllTrainingData: async (botId, filters = {}) => {
+    let rows = [];
+    let cursor = null;
+    do {
+      const page = await trainingAPI.getTrainingDataPage(botId, { ...filters, limit: 1000 }, cursor);
+      rows = rows.concat(page.data);
+      cursor = page.nextCursor;
+    } while (cursor);
+    return rows;
+  },
+
+  // Example and per-intent counts, maintained by the database
+  getTrainingDataStats: async (botId) => {
+    const response = await apiClient.get(`/api/bots/${botId}/training/stats`);
+    return response.data;
+  },
+
+  // Ranked, accent-insensitive search over user messages and bot responses
+  searchTrainingData: async (botId, q, { intent, limit } = {}) => {
+    const response = await apiClient.get(`/api/bots/${botId}/training/search`, {
+      params: { q, intent: intent || undefined, limit },
+    });
     return response.data;
   },
 
@@ -72,8 +114,44 @@ export const trainingAPI = {
     return response.data;
   },
 
+  // Next rows of a parse preview (token from parseTrainingFile)
+  getParsePreviewPage: async (botId, token, limit = 100) => {
+    const response = await apiClient.get(`/api/bots/${botId}/training/parse/page`, {
+      params: { token, limit },
+    });
+    return response.data;
+  },
+
   // Delete training data
   deleteTrainingData: async (botId, dataId) => {
     await apiClient.delete(`/api/bots/${botId}/training/${dataId}`);
   },
+
+  // Delete by ids and/or listing filters ({ ids, filters: { user_message, bot_response, intent } })
+  bulkDeleteTrainingData: async (botId, { ids, filters } = {}) => {
+    const response = await apiClient.post(`/api/bots/${botId}/training/bulk-delete`, { ids, filters });
+    return response.data;
+  },
+
+  // Move examples of fromIntents to toIntent (merging duplicates)
+  relabelTrainingData: async (botId, fromIntents, toIntent, ids = null) => {
+    const response = await apiClient.post(`/api/bots/${botId}/training/relabel`, {
+      from_intents: fromIntents,
+      to_intent: toIntent,
+      ids,
+    });
+    return response.data;
+  },
+
+  // Find/replace text in bot responses (or user messages with field: 'user_message')
+  replaceTrainingDataText: async (botId, find, replace, { field, intent, ids } = {}) => {
+    const response = await apiClient.post(`/api/bots/${botId}/training/replace`, {
+      find,
+      replace,
+      field,
+      intent,
+      ids,
+    });
+    return response.data;
+  },
 };
@@ -53,12 +53,15 @@ const ChatPage = () => {
   const [conversations, setConversations] = useState([]);
   const [selectedConversationId, setSelectedConversationId] = useState(null);
   const [loadingConversations, setLoadingConversations] = useState(false);
+  const [olderMessagesCursor, setOlderMessagesCursor] = useState(null);
+  const [loadingOlderMessages, setLoadingOlderMessages] = useState(false);
   const [isSave, setIsSave] = useState(() => {
     const saved = localStorage.getItem('chatIsSave');
     return saved !== null ? JSON.parse(saved) : true;
   });
   const messagesEndRef = useRef(null);
   const streamingIntervalRef = useRef(null);
+  const skipScrollRef = useRef(false);
 
   // Create new session when bot changes
   useEffect(() => {
@@ -81,6 +84,11 @@ const ChatPage = () => {
   }, [urlBotId]);
 
   useEffect(() => {
+    // Older messages are prepended: keep the current scroll position
+    if (skipScrollRef.current) {
+      skipScrollRef.current = false;
+      return;
+    }
     scrollToBottom();
   }, [messages, streamingMessage]);
 
@@ -118,6 +126,7 @@ const ChatPage = () => {
     const newSessionId = `session_${selectedBotId}_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`;
     setSessionId(newSessionId);
     setMessages([]); // Clear messages for new session
+    setOlderMessagesCursor(null);
     setSelectedConversationId(null);
     console.log('[Session] Created new session:', newSessionId);
   };
@@ -145,6 +154,16 @@ const ChatPage = () => {
     }
   };
 
+  // Convert conversation messages to chat messages format
+  const toChatMessage = (msg) => ({
+    id: msg.id,
+    type: msg.sender,
+    content: msg.message,
+    intent: msg.intent,
+    confidence: msg.confidence,
+    timestamp: new Date(msg.timestamp).toLocaleTimeString(),
+  });
+
   const loadConversationMessages = async (conversationId) => {
     try {
       const response = await axios.get(`api/conversations/${conversationId}`);
@@ -154,23 +173,37 @@ const ChatPage = () => {
       setSessionId(conv.session_id);
       setSelectedConversationId(conversationId);
       
-      // Convert conversation messages to chat messages format
-      const chatMessages = conv.messages.map((msg) => ({
-        id: msg.id,
-        type: msg.sender,
-        content: msg.message,
-        intent: msg.intent,
-        confidence: msg.confidence,
-        timestamp: new Date(msg.timestamp).toLocaleTimeString(),
-      }));
-      
-      setMessages(chatMessages);
+      // Only the latest page of messages is returned; next_cursor points to older ones
+      setMessages(conv.messages.map(toChatMessage));
+      setOlderMessagesCursor(conv.next_cursor);
     } catch (err) {
       message.error('Failed to load conversation');
       console.error('Load conversation error:', err);
     }
   };
 
+  const loadOlderMessages = async () => {
+    if (!selectedConversationId || !olderMessagesCursor) return;
+    
+    setLoadingOlderMessages(true);
+    try {
+      const response = await axios.get(`api/conversations/${selectedConversationId}/messages`, {
+        params: { order: 'desc', cursor: olderMessagesCursor },
+      });
+      
+      // Page is newest first: reverse before prepending
+      const olderMessages = [...response.data].reverse().map(toChatMessage);
+      skipScrollRef.current = true;
+      setMessages((prev) => [...olderMessages, ...prev]);
+      setOlderMessagesCursor(response.headers['x-next-cursor'] || null);
+    } catch (err) {
+      message.error('Failed to load older messages');
+      console.error('Load older messages error:', err);
+    } finally {
+      setLoadingOlderMessages(false);
+    }
+  };
+
   const deleteConversation = async (conversationId, e) => {
     e.stopPropagation();
     
@@ -412,6 +445,13 @@ const ChatPage = () => {
               />
             ) : (
               <>
+                {olderMessagesCursor && (
+                  <div style={{ textAlign: 'center', marginBottom: 8 }}>
+                    <Button size="small" loading={loadingOlderMessages} onClick={loadOlderMessages}>
+                      Load older messages
+                    </Button>
+                  </div>
+                )}
                 <List
                   dataSource={messages}
                   renderItem={(item) => (
@@ -41,12 +41,16 @@ const TrainingDataPage = () => {
   const [bots, setBots] = useState([]);
   const [selectedBotId, setSelectedBotId] = useState(null);
   const [trainingData, setTrainingData] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null); // set while more pages are on the server
   const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [isModalVisible, setIsModalVisible] = useState(false);
   const [isExportModalVisible, setIsExportModalVisible] = useState(false);
   const [exportMode, setExportMode] = useState('export'); // 'export' or 'template'
   const [isPreviewModalVisible, setIsPreviewModalVisible] = useState(false);
   const [previewData, setPreviewData] = useState([]);
+  const [previewStats, setPreviewStats] = useState(null); // { count, intents, missing_intent_count, duplicate_count, duplicate_count_exact }
+  const [previewToken, setPreviewToken] = useState(null); // set while the preview holds only part of the file
   const [editingPreviewKey, setEditingPreviewKey] = useState(null);
   const [previewMode, setPreviewMode] = useState('upload'); // 'upload' or 'add'
   const [uploadFile, setUploadFile] = useState(null);
@@ -69,12 +73,15 @@ const TrainingDataPage = () => {
   const [trainingModalVisible, setTrainingModalVisible] = useState(false);
   const [refreshHistory, setRefreshHistory] = useState(0);
   const [activeTab, setActiveTab] = useState('data');
+  const [datasetStats, setDatasetStats] = useState(null); // { example_count, intent_count, intents: [{ intent, count }] }
 
-  // Get unique intents for filter
+  // Get unique intents for filter (all of the bot's intents, not just the loaded pages)
   const uniqueIntents = useMemo(() => {
-    const intents = [...new Set(trainingData.map(item => item.intent))].filter(Boolean);
+    const intents = datasetStats
+      ? datasetStats.intents.map(item => item.intent)
+      : [...new Set(trainingData.map(item => item.intent))].filter(Boolean);
     return intents.sort();
-  }, [trainingData]);
+  }, [trainingData, datasetStats]);
 
   useEffect(() => {
     loadBots();
@@ -117,21 +124,50 @@ const TrainingDataPage = () => {
   const loadTrainingData = async () => {
     setLoading(true);
     try {
-      const data = await trainingAPI.getTrainingData(selectedBotId, serverFilters);
-      setTrainingData(data);
+      const page = await trainingAPI.getTrainingDataPage(selectedBotId, serverFilters);
+      setTrainingData(page.data);
+      setNextCursor(page.nextCursor);
       setSelectedRowKeys([]); // Reset selection when loading new data
     } catch (error) {
       message.error('Failed to load training data');
     } finally {
       setLoading(false);
     }
+    loadDatasetStats();
+  };
+
+  const loadDatasetStats = async () => {
+    try {
+      setDatasetStats(await trainingAPI.getTrainingDataStats(selectedBotId));
+    } catch (error) {
+      setDatasetStats(null);
+    }
+  };
+
+  const loadMoreTrainingData = async () => {
+    try {
+      setLoadingMore(true);
+      const page = await trainingAPI.getTrainingDataPage(selectedBotId, serverFilters, nextCursor);
+      setTrainingData([...trainingData, ...page.data]);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      message.error('Failed to load training data');
+    } finally {
+      setLoadingMore(false);
+    }
   };
 
   const handleUpload = async (file) => {
     try {
       setLoading(true);
       const result = await trainingAPI.parseTrainingFile(selectedBotId, file);
+      if (result.error_count > 0) {
+        const first = result.errors[0];
+        message.warning(`Skipped ${result.error_count} invalid lines (line ${first.line}: ${first.error})`);
+      }
       setPreviewData(result.data);
+      setPreviewStats({ count: result.count, ...result.stats });
+      setPreviewToken(result.next_token);
       setUploadFile(file);
       setPreviewMode('upload');
       setIsPreviewModalVisible(true);
@@ -143,6 +179,19 @@ const TrainingDataPage = () => {
     return false; // Prevent default upload behavior
   };
 
+  const handleLoadMorePreview = async () => {
+    try {
+      setLoading(true);
+      const page = await trainingAPI.getParsePreviewPage(selectedBotId, previewToken);
+      setPreviewData([...previewData, ...page.data]);
+      setPreviewToken(page.next_token);
+    } catch (error) {
+      message.error(error.response?.data?.detail || 'Failed to load more rows');
+    } finally {
+      setLoading(false);
+    }
+  };
+
   const handleConfirmUpload = async () => {
     // Validate preview data
     const invalidRows = previewData.filter(
@@ -167,18 +216,30 @@ const TrainingDataPage = () => {
           });
         }
         message.success(`${previewData.length} items added successfully`);
+      } else if (previewToken) {
+        // Preview holds only a sample - upload the original file as is
+        const result = await trainingAPI.uploadTrainingFile(selectedBotId, uploadFile);
+        message.success(`Training data uploaded successfully (${result.count} items)`);
+        if (result.skipped_count > 0) {
+          message.info(`Skipped ${result.skipped_count} items already in the training data`);
+        }
       } else {
         // Upload from file
         const formData = new FormData();
         const jsonBlob = new Blob([JSON.stringify(previewData)], { type: 'application/json' });
         formData.append('file', jsonBlob, 'edited_data.json');
         
-        await trainingAPI.uploadTrainingFile(selectedBotId, jsonBlob);
-        message.success(`Training data uploaded successfully (${previewData.length} items)`);
+        const result = await trainingAPI.uploadTrainingFile(selectedBotId, jsonBlob);
+        message.success(`Training data uploaded successfully (${result.count} items)`);
+        if (result.skipped_count > 0) {
+          message.info(`Skipped ${result.skipped_count} items already in the training data`);
+        }
       }
       
       setIsPreviewModalVisible(false);
       setPreviewData([]);
+      setPreviewStats(null);
+      setPreviewToken(null);
       setUploadFile(null);
       setEditingPreviewKey(null);
       setPreviewMode('upload');
@@ -194,6 +255,8 @@ const TrainingDataPage = () => {
   const handleCancelUpload = () => {
     setIsPreviewModalVisible(false);
     setPreviewData([]);
+    setPreviewStats(null);
+    setPreviewToken(null);
     setUploadFile(null);
     setEditingPreviewKey(null);
     setPreviewMode('upload');
@@ -375,7 +438,7 @@ const TrainingDataPage = () => {
     return markdown;
   };
 
-  const handleExportWithFormat = (format) => {
+  const handleExportWithFormat = async (format) => {
     let content, mimeType, extension;
 
     if (exportMode === 'template') {
@@ -412,9 +475,18 @@ const TrainingDataPage = () => {
       message.success(`Template downloaded as ${format.toUpperCase()} successfully`);
     } else {
       // Export data
-      const dataToExport = selectedRowKeys.length > 0
-        ? trainingData.filter(item => selectedRowKeys.includes(item.id))
-        : trainingData;
+      let dataToExport = trainingData;
+      if (selectedRowKeys.length > 0) {
+        dataToExport = trainingData.filter(item => selectedRowKeys.includes(item.id));
+      } else if (nextCursor) {
+        // Only the first pages are loaded - fetch the rest before exporting
+        try {
+          dataToExport = await trainingAPI.getAllTrainingData(selectedBotId, serverFilters);
+        } catch (error) {
+          message.error('Failed to load training data for export');
+          return;
+        }
+      }
 
       switch (format) {
         case 'json':
@@ -441,7 +513,7 @@ const TrainingDataPage = () => {
       const a = document.createElement('a');
       a.href = url;
       const prefix = selectedRowKeys.length > 0 ? 'selected' : 'all';
-      const count = selectedRowKeys.length > 0 ? selectedRowKeys.length : trainingData.length;
+      const count = dataToExport.length;
       a.download = `training_data_${prefix}_${count}_items_${new Date().toISOString().split('T')[0]}.${extension}`;
       a.click();
       URL.revokeObjectURL(url);
@@ -515,11 +587,9 @@ const TrainingDataPage = () => {
     }
 
     try {
-      // Delete all selected items
-      await Promise.all(
-        selectedRowKeys.map(id => trainingAPI.deleteTrainingData(selectedBotId, id))
-      );
-      message.success(`Deleted ${selectedRowKeys.length} items successfully`);
+      // Delete all selected items in one request
+      const { deleted_count } = await trainingAPI.bulkDeleteTrainingData(selectedBotId, { ids: selectedRowKeys });
+      message.success(`Deleted ${deleted_count} items successfully`);
       setSelectedRowKeys([]);
       loadTrainingData();
     } catch (error) {
@@ -811,7 +881,7 @@ const TrainingDataPage = () => {
             <Space>
               <Upload 
                 beforeUpload={handleUpload} 
-                accept=".json,.csv,.txt,.yml,.yaml,.md,.markdown" 
+                accept=".json,.jsonl,.ndjson,.csv,.xlsx,.txt,.yml,.yaml,.md,.markdown" 
                 maxCount={1}
                 fileList={fileList}
                 onChange={({ fileList }) => setFileList(fileList)}
@@ -859,7 +929,7 @@ const TrainingDataPage = () => {
               ),
               children: (
                 <Card 
-                  title={`Training Data (${trainingData.length} items)`}
+                  title={`Training Data (${trainingData.length}${nextCursor ? '+' : ''} items${datasetStats ? ` of ${datasetStats.example_count}, ${datasetStats.intent_count} intents` : ''})`}
                   extra={
                     selectedRowKeys.length > 0 && (
                       <Space>
@@ -909,6 +979,13 @@ const TrainingDataPage = () => {
               bordered
             />
           )}
+          {!loading && nextCursor && (
+            <div style={{ textAlign: 'center', marginTop: 16 }}>
+              <Button onClick={loadMoreTrainingData} loading={loadingMore}>
+                Load More
+              </Button>
+            </div>
+          )}
         </Card>
               ),
             },
@@ -1015,7 +1092,7 @@ const TrainingDataPage = () => {
       <Modal
         title={
           previewMode === 'upload' 
-            ? `Preview Upload Data (${previewData.length} items)`
+            ? `Preview Upload Data (${previewStats?.count ?? previewData.length} items)`
             : `Add New Training Data (${previewData.length} items)`
         }
         open={isPreviewModalVisible}
@@ -1032,24 +1109,49 @@ const TrainingDataPage = () => {
               <>
                 <Tag color="blue">{uploadFile.name}</Tag>
                 <span style={{ color: '#666' }}>
-                  {previewData.length} items will be added
+                  {previewToken
+                    ? `Showing ${previewData.length} of ${previewStats?.count} items - the whole file will be uploaded`
+                    : `${previewData.length} items will be added`}
                 </span>
               </>
             )}
+            {previewMode === 'upload' && previewToken && (
+              <Button size="small" onClick={handleLoadMorePreview} loading={loading}>
+                Load More
+              </Button>
+            )}
             {previewMode === 'add' && (
               <span style={{ color: '#666' }}>
                 {previewData.length} items ready to save
               </span>
             )}
-            <Button 
-              type="primary" 
-              size="small" 
-              icon={<PlusOutlined />}
-              onClick={handleAddPreviewRow}
-            >
-              Add Row
-            </Button>
+            {!previewToken && (
+              <Button 
+                type="primary" 
+                size="small" 
+                icon={<PlusOutlined />}
+                onClick={handleAddPreviewRow}
+              >
+                Add Row
+              </Button>
+            )}
           </Space>
+          {previewMode === 'upload' && previewStats && (
+            <div style={{ marginTop: 8 }}>
+              <Space wrap>
+                <Tag>{Object.keys(previewStats.intents).length} intents</Tag>
+                {previewStats.missing_intent_count > 0 && (
+                  <Tag color="orange">{previewStats.missing_intent_count} without intent</Tag>
+                )}
+                {previewStats.duplicate_count > 0 && (
+                  <Tag color="gold">{previewStats.duplicate_count_exact === false ? '~' : ''}{previewStats.duplicate_count} duplicates</Tag>
+                )}
+                {Object.entries(previewStats.intents).slice(0, 10).map(([intent, count]) => (
+                  <Tag key={intent} color="geekblue">{intent}: {count}</Tag>
+                ))}
+              </Space>
+            </div>
+          )}
         </div>
         <Table
           columns={[
@@ -1220,7 +1322,9 @@ const TrainingDataPage = () => {
             ) : (
               selectedRowKeys.length > 0 
                 ? `📦 Exporting ${selectedRowKeys.length} selected ${selectedRowKeys.length === 1 ? 'item' : 'items'}`
-                : `📦 Exporting all ${trainingData.length} ${trainingData.length === 1 ? 'item' : 'items'}`
+                : nextCursor
+                  ? '📦 Exporting all items'
+                  : `📦 Exporting all ${trainingData.length} ${trainingData.length === 1 ? 'item' : 'items'}`
             )}
           </p>
         </div>